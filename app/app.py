@@ -16,11 +16,17 @@ from werkzeug.routing import Rule
 
 from app.models.pages.user import User
 from app.models.pages.setting import Setting
+from app.models.pages.crisp import create_crisp_total_triggers, ensure_crisp_rollups
+from app.models.pages.srs import create_srs_fts_index
 from app.models.base import db
 from app.routes.api_router import register_api_blueprints
 from app.routes.web.utils.template_renderer import handle_template_error
 from app.routes.web_router import register_web_blueprints
+from app.services.precompute import dashboard_scheduler
+from app.services.search.index import create_search_index, rebuild_search_index_command
+from app.services.search.trigram import ensure_trigram_index, rebuild_trigram_index_command
 from app.utils.app_logging import get_logger
+from app.utils.index_advisor import capture_queries, index_advisor_command
 from config import Config
 
 logger = get_logger()
@@ -85,6 +91,9 @@ def create_app(config_class: Type[Config] = Config) -> Flask:
     db.init_app(app)
     login_manager.init_app(app)
     migrate.init_app(app, db)
+    app.cli.add_command(index_advisor_command)
+    app.cli.add_command(rebuild_search_index_command)
+    app.cli.add_command(rebuild_trigram_index_command)
 
     login_manager.login_view = "auth_bp.login"
     login_manager.login_message = "Please log in to access this page."
@@ -206,6 +215,18 @@ def create_app(config_class: Type[Config] = Config) -> Flask:
         logger.info("Seeding settings and creating database tables.")
         Setting.seed()
         db.create_all()
+        # Databases created before the SRS full-text index existed need it added and populated
+        create_srs_fts_index(db.session.connection())
+        create_search_index(db.session.connection())
+        create_crisp_total_triggers(db.session.connection())
+        ensure_crisp_rollups(db.session.connection())
+        ensure_trigram_index(db.session.connection())
+        db.session.commit()
+
+        if app.config.get("CAPTURE_QUERIES_PATH"):
+            capture_queries(db.engine, app.config["CAPTURE_QUERIES_PATH"])
+
+    dashboard_scheduler.init_app(app)
 
     logger.info("Application initialization complete")
     return app
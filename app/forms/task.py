@@ -1,3 +1,4 @@
+from app.models.pages.task import TaskPriority, TaskStatus
 from .base import BaseModelForm
 from wtforms import StringField, TextAreaField, DateTimeField, SelectField, HiddenField
 from wtforms.validators import DataRequired, Optional, Length
@@ -7,19 +8,9 @@ class TaskForm(BaseModelForm):
     title = StringField("Title", validators=[DataRequired(), Length(max=100)])
     description = TextAreaField("Description")
     due_date = DateTimeField("Due Date", validators=[Optional()], format="%Y-%m-%d %H:%M:%S")
-    status = SelectField(
-        "Status",
-        choices=[
-            ("Pending", "Pending"),
-            ("In Progress", "In Progress"),
-            ("On Hold", "On Hold"),
-            ("Completed", "Completed"),
-            ("Cancelled", "Cancelled"),
-        ],
-        default="Pending",
-    )
+    status = SelectField("Status", choices=[(status.value, status.label) for status in TaskStatus], default=TaskStatus.PENDING.value)
     priority = SelectField(
-        "Priority", choices=[("Low", "Low"), ("Medium", "Medium"), ("High", "High"), ("Urgent", "Urgent")], default="Medium"
+        "Priority", choices=[(priority.value, priority.label) for priority in TaskPriority], default=TaskPriority.MEDIUM.value
     )
     assigned_to_id = SelectField("Assigned To", coerce=int, validators=[Optional()])
     notable_type = SelectField(
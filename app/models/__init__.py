@@ -11,10 +11,11 @@ from app.models.base import BaseModel, db
 from app.models.capability import Capability
 from app.models.capability_category import CapabilityCategory
 from app.models.company_capability import CompanyCapability
-from app.models.pages.crisp import Crisp
+from app.models.pages.crisp import Crisp, CrispRollup
 from app.models.mixins import ValidatorMixin
 from app.models.relationship import Relationship
 from app.models.table_config import TableConfig
+from app.models.trigram import trigram_documents, trigram_postings
 
 from app.models.pages.company import Company
 from app.models.pages.contact import Contact
@@ -36,6 +37,7 @@ __all__ = [
     "Company",
     "Contact",
     "Crisp",
+    "CrispRollup",
     "ValidatorMixin",
     "Note",
     "Opportunity",
@@ -108,3 +108,25 @@ class RelationshipMixin:
             return None
 
         return model_class.query.get(entity_id)
+
+
+class PrimedCollectionsMixin:
+    """Mixin letting batch loaders pre-populate computed collection properties.
+
+    Values are stored on the instance, so they live as long as the session's
+    identity map - i.e. for the current request.
+    """
+
+    _PRIMED_ATTR = "_primed_collections"
+
+    def set_primed(self, name: str, value) -> None:
+        """Cache a pre-loaded value for a computed property."""
+        self.__dict__.setdefault(self._PRIMED_ATTR, {})[name] = value
+
+    def get_primed(self, name: str):
+        """Return the cached value for a computed property, or None if not primed."""
+        return self.__dict__.get(self._PRIMED_ATTR, {}).get(name)
+
+    def clear_primed(self, name: str) -> None:
+        """Drop a cached value, e.g. after the underlying relationships change."""
+        self.__dict__.get(self._PRIMED_ATTR, {}).pop(name, None)
@@ -1,13 +1,14 @@
 # app/models/contact.py
 
 from app.models.base import BaseModel, db
+from app.models.mixins import PrimedCollectionsMixin
 from app.models.relationship import Relationship  # reuse the generic Relationship model
 from app.utils.app_logging import get_logger
 
 logger = get_logger()
 
 
-class Contact(BaseModel):
+class Contact(BaseModel, PrimedCollectionsMixin):
     __tablename__ = "contacts"
 
     # --- Contact Information ---
@@ -76,6 +77,14 @@ class Contact(BaseModel):
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
 
+    @property
+    def crisp_summary(self):
+        """Average CRISP score across this contact's assessed relationships, from the rollup table."""
+        from app.models.pages.crisp import CrispRollup
+
+        rollup = CrispRollup.lookup("contact", self.id)
+        return round(rollup.avg_total, 2) if rollup and rollup.count else None
+
     # Computed properties to resolve relationships via the generic Relationship model.
     @property
     def opportunities(self):
@@ -83,6 +92,10 @@ class Contact(BaseModel):
         Retrieve Opportunities linked to this Contact.
         Uses the Relationship model where this contact is linked to an opportunity.
         """
+        primed = self.get_primed("opportunities")
+        if primed is not None:
+            return primed
+
         from app.models.pages.opportunity import Opportunity
 
         opp_ids = []
@@ -101,6 +114,10 @@ class Contact(BaseModel):
         Looks for relationships where this contact is the target (entity2)
         and the relationship_type is 'manager'.
         """
+        primed = self.get_primed("managers")
+        if primed is not None:
+            return primed
+
         rels = Relationship.query.filter_by(entity2_type="contact", entity2_id=self.id, relationship_type="manager").all()
         managers = []
         for rel in rels:
@@ -121,6 +138,10 @@ class Contact(BaseModel):
         Looks for relationships where this contact is the source (entity1)
         and the relationship_type is 'manager'.
         """
+        primed = self.get_primed("direct_reports")
+        if primed is not None:
+            return primed
+
         rels = Relationship.query.filter_by(entity1_type="contact", entity1_id=self.id, relationship_type="manager").all()
         subs = []
         for rel in rels:
@@ -140,6 +161,7 @@ class Contact(BaseModel):
     @direct_reports.setter
     def direct_reports(self, direct_report_list):
         """Set direct reports for this Contact by creating appropriate relationships."""
+        self.clear_primed("direct_reports")
         # Ensure contact has ID
         if not self.id:
             db.session.add(self)
@@ -173,6 +195,7 @@ class Contact(BaseModel):
     @managers.setter
     def managers(self, manager_list):
         """Set managers for this Contact by creating appropriate relationships."""
+        self.clear_primed("managers")
         # Ensure contact has ID
         if not self.id:
             db.session.add(self)
@@ -206,6 +229,7 @@ class Contact(BaseModel):
     @opportunities.setter
     def opportunities(self, opportunity_list):
         """Set opportunities linked to this Contact by creating appropriate relationships."""
+        self.clear_primed("opportunities")
         # Ensure contact has ID
         if not self.id:
             db.session.add(self)
@@ -220,6 +244,8 @@ class Contact(BaseModel):
                 & (Relationship.entity1_type == "opportunity")
             )
         ).delete()
+        # The link collection may have been loaded (or primed) before the delete
+        db.session.expire(self, ["opportunity_relationships"])
 
         # Add new opportunity relationships
         if opportunity_list:
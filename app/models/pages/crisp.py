@@ -1,15 +1,27 @@
 # app/models/crisp.py
 
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, event, func, literal, select, text, tuple_, union_all
+from sqlalchemy.exc import OperationalError
+
 from app.models.base import BaseModel, db
+from app.models.relationship import Relationship
 from app.utils.app_logging import get_logger
 
 logger = get_logger()
 
+# Rollup scopes besides the related entity types ("contact", "user", ...)
+ROLLUP_ALL = "all"
+ROLLUP_RELATIONSHIP = "relationship"
+
 
 class Crisp(BaseModel):
     __tablename__ = "crisp"
 
-    relationship_id = db.Column(db.Integer, db.ForeignKey("relationships.id"), nullable=False)
+    # active_history loads the previous value on change, so moving a score to
+    # another relationship can recompute the old relationship's rollups
+    relationship_id = db.column_property(db.Column(db.Integer, db.ForeignKey("relationships.id"), nullable=False), active_history=True)
     relationship = db.relationship("Relationship", back_populates="crisp")
 
     credibility = db.Column(db.Integer, nullable=False)
@@ -18,7 +30,8 @@ class Crisp(BaseModel):
     self_orientation = db.Column(db.Integer, nullable=False)
 
     notes = db.Column(db.Text)
-    total_score = db.Column(db.Float)
+    # Maintained by database triggers (see CRISP_TOTAL_DDL); indexed for distribution queries
+    total_score = db.Column(db.Float, index=True)
 
     def __repr__(self) -> str:
         """Readable representation for debugging.
@@ -57,3 +70,257 @@ class Crisp(BaseModel):
         logger.info("Calculating CRISP total score before saving.")
         self.calculate_total()
         return super().save()
+
+
+def _total_sql(row: str) -> str:
+    summed = f"({row}.credibility + {row}.reliability + {row}.intimacy) * 1.0"
+    return f"CASE WHEN {row}.self_orientation = 0 THEN {summed} ELSE {summed} / {row}.self_orientation END"
+
+
+# SQLite triggers computing total_score whenever a row is written, whoever writes it.
+# recursive_triggers is off by default, so the inner UPDATE doesn't re-fire them.
+CRISP_TOTAL_DDL = (
+    "CREATE TRIGGER IF NOT EXISTS crisp_total_ai AFTER INSERT ON crisp BEGIN "
+    f"UPDATE crisp SET total_score = {_total_sql('new')} WHERE id = new.id; END",
+    "CREATE TRIGGER IF NOT EXISTS crisp_total_au "
+    "AFTER UPDATE OF credibility, reliability, intimacy, self_orientation, total_score ON crisp BEGIN "
+    f"UPDATE crisp SET total_score = {_total_sql('new')} WHERE id = new.id; END",
+)
+
+
+def create_crisp_total_triggers(connection, backfill: bool = True) -> bool:
+    """Create the total_score triggers and fill in any missing totals.
+
+    Args:
+        connection: SQLAlchemy connection to run the DDL on.
+        backfill: Compute total_score for rows where it is NULL.
+
+    Returns:
+        bool: True if the triggers are in place, False on non-SQLite databases.
+    """
+    if connection.dialect.name != "sqlite":
+        return False
+
+    try:
+        for statement in CRISP_TOTAL_DDL:
+            connection.execute(text(statement))
+        if backfill:
+            connection.execute(text(f"UPDATE crisp SET total_score = {_total_sql('crisp')} WHERE total_score IS NULL"))
+    except OperationalError as e:
+        logger.warning(f"CRISP total_score triggers unavailable: {e}")
+        return False
+
+    return True
+
+
+@event.listens_for(Crisp.__table__, "after_create")
+def _create_crisp_total_triggers_after_create(target, connection, **kw):
+    """Attach the total_score triggers whenever the crisp table is created by create_all()."""
+    create_crisp_total_triggers(connection, backfill=False)
+
+
+def crisp_total_expression(table):
+    """SQL form of Crisp.calculate_total for a table or alias with CRISP columns."""
+    summed = table.c.credibility + table.c.reliability + table.c.intimacy
+    return case((table.c.self_orientation == 0, summed * 1.0), else_=summed * 1.0 / table.c.self_orientation)
+
+
+class CrispRollup(BaseModel):
+    """Running CRISP aggregates for one scope.
+
+    Scopes are the whole table (``("all", 0)``), a relationship
+    (``("relationship", id)``) and each entity at either end of a scored
+    relationship (e.g. ``("contact", id)``). Rows are maintained by mapper
+    events on Crisp so summaries are a single indexed lookup.
+    """
+
+    __tablename__ = "crisp_rollups"
+    __table_args__ = (db.UniqueConstraint("scope_type", "scope_id", name="uq_crisp_rollups_scope"),)
+
+    scope_type = db.Column(db.String(50), nullable=False)
+    scope_id = db.Column(db.Integer, nullable=False)
+
+    count = db.Column(db.Integer, nullable=False, default=0)
+    sum_total = db.Column(db.Float, nullable=False, default=0.0)
+    min_total = db.Column(db.Float)
+    max_total = db.Column(db.Float)
+    sum_credibility = db.Column(db.Integer, nullable=False, default=0)
+    sum_reliability = db.Column(db.Integer, nullable=False, default=0)
+    sum_intimacy = db.Column(db.Integer, nullable=False, default=0)
+    sum_self_orientation = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<CrispRollup {self.scope_type}={self.scope_id} count={self.count} avg={self.avg_total}>"
+
+    @property
+    def avg_total(self) -> Optional[float]:
+        """Mean total score, or None when nothing has been assessed."""
+        return self.sum_total / self.count if self.count else None
+
+    @classmethod
+    def lookup(cls, scope_type: str, scope_id: int = 0) -> Optional["CrispRollup"]:
+        """Fetch the rollup for one scope.
+
+        Args:
+            scope_type (str): ROLLUP_ALL, ROLLUP_RELATIONSHIP or an entity type.
+            scope_id (int): ID within the scope (0 for ROLLUP_ALL).
+
+        Returns:
+            CrispRollup | None: The rollup row, if any scores exist for the scope.
+        """
+        return cls.query.filter_by(scope_type=scope_type, scope_id=scope_id).first()
+
+
+def _rollup_source():
+    """One row per (scope, assessment) for every scope an assessment counts towards."""
+    crisp = Crisp.__table__
+    rels = Relationship.__table__
+    total = func.coalesce(crisp.c.total_score, crisp_total_expression(crisp))
+    components = (
+        total.label("total"),
+        crisp.c.credibility,
+        crisp.c.reliability,
+        crisp.c.intimacy,
+        crisp.c.self_orientation,
+    )
+    joined = crisp.join(rels, rels.c.id == crisp.c.relationship_id)
+    return union_all(
+        select(literal(ROLLUP_ALL).label("scope_type"), literal(0).label("scope_id"), *components),
+        select(literal(ROLLUP_RELATIONSHIP), crisp.c.relationship_id, *components),
+        select(rels.c.entity1_type, rels.c.entity1_id, *components).select_from(joined),
+        select(rels.c.entity2_type, rels.c.entity2_id, *components)
+        .select_from(joined)
+        .where(~((rels.c.entity1_type == rels.c.entity2_type) & (rels.c.entity1_id == rels.c.entity2_id))),
+    ).subquery("crisp_rollup_source")
+
+
+def rebuild_crisp_rollups(connection, scopes: Optional[Iterable[Tuple[str, int]]] = None) -> None:
+    """Recompute rollups from the crisp table.
+
+    Args:
+        connection: SQLAlchemy connection to run on.
+        scopes: (scope_type, scope_id) pairs to recompute; all scopes when omitted.
+    """
+    table = CrispRollup.__table__
+    source = _rollup_source()
+
+    delete = table.delete()
+    aggregate = select(
+        source.c.scope_type,
+        source.c.scope_id,
+        func.count(),
+        func.sum(source.c.total),
+        func.min(source.c.total),
+        func.max(source.c.total),
+        func.sum(source.c.credibility),
+        func.sum(source.c.reliability),
+        func.sum(source.c.intimacy),
+        func.sum(source.c.self_orientation),
+        func.current_timestamp(),
+        func.current_timestamp(),
+    ).group_by(source.c.scope_type, source.c.scope_id)
+
+    if scopes is not None:
+        scopes = list(set(scopes))
+        if not scopes:
+            return
+        delete = delete.where(tuple_(table.c.scope_type, table.c.scope_id).in_(scopes))
+        aggregate = aggregate.where(tuple_(source.c.scope_type, source.c.scope_id).in_(scopes))
+
+    connection.execute(delete)
+    connection.execute(
+        table.insert().from_select(
+            [
+                "scope_type",
+                "scope_id",
+                "count",
+                "sum_total",
+                "min_total",
+                "max_total",
+                "sum_credibility",
+                "sum_reliability",
+                "sum_intimacy",
+                "sum_self_orientation",
+                "created_at",
+                "updated_at",
+            ],
+            aggregate,
+        )
+    )
+
+
+def ensure_crisp_rollups(connection) -> None:
+    """Populate the rollup table for databases that have scores but no rollups yet."""
+    has_rollups = connection.execute(select(CrispRollup.__table__.c.id).limit(1)).first()
+    has_scores = connection.execute(select(Crisp.__table__.c.id).limit(1)).first()
+    if has_scores and not has_rollups:
+        logger.info("Backfilling CRISP rollups")
+        rebuild_crisp_rollups(connection)
+
+
+def _rollup_scopes(connection, relationship_id: int) -> List[Tuple[str, int]]:
+    """Scopes an assessment of the given relationship counts towards."""
+    rels = Relationship.__table__
+    scopes = [(ROLLUP_ALL, 0), (ROLLUP_RELATIONSHIP, relationship_id)]
+    row = connection.execute(
+        select(rels.c.entity1_type, rels.c.entity1_id, rels.c.entity2_type, rels.c.entity2_id).where(rels.c.id == relationship_id)
+    ).first()
+    if row:
+        for scope in ((row.entity1_type, row.entity1_id), (row.entity2_type, row.entity2_id)):
+            if scope not in scopes:
+                scopes.append(scope)
+    return scopes
+
+
+@event.listens_for(Crisp, "before_insert")
+@event.listens_for(Crisp, "before_update")
+def _set_total_score(mapper, connection, target):
+    """Mirror the database triggers so the in-memory total matches what is stored."""
+    target.calculate_total()
+
+
+@event.listens_for(Crisp, "after_insert")
+def _add_to_rollups(mapper, connection, target):
+    """Fold a new assessment into the running aggregates of every scope it belongs to."""
+    table = CrispRollup.__table__
+    total = target.total_score
+    for scope_type, scope_id in _rollup_scopes(connection, target.relationship_id):
+        result = connection.execute(
+            table.update()
+            .where(table.c.scope_type == scope_type, table.c.scope_id == scope_id)
+            .values(
+                count=table.c.count + 1,
+                sum_total=table.c.sum_total + total,
+                min_total=case((table.c.min_total <= total, table.c.min_total), else_=total),
+                max_total=case((table.c.max_total >= total, table.c.max_total), else_=total),
+                sum_credibility=table.c.sum_credibility + target.credibility,
+                sum_reliability=table.c.sum_reliability + target.reliability,
+                sum_intimacy=table.c.sum_intimacy + target.intimacy,
+                sum_self_orientation=table.c.sum_self_orientation + target.self_orientation,
+            )
+        )
+        if result.rowcount == 0:
+            connection.execute(
+                table.insert().values(
+                    scope_type=scope_type,
+                    scope_id=scope_id,
+                    count=1,
+                    sum_total=total,
+                    min_total=total,
+                    max_total=total,
+                    sum_credibility=target.credibility,
+                    sum_reliability=target.reliability,
+                    sum_intimacy=target.intimacy,
+                    sum_self_orientation=target.self_orientation,
+                )
+            )
+
+
+@event.listens_for(Crisp, "after_update")
+@event.listens_for(Crisp, "after_delete")
+def _recompute_rollups(mapper, connection, target):
+    """Running min/max can't be un-applied, so edited or removed scores trigger a recompute."""
+    history = db.inspect(target).attrs.relationship_id.history
+    relationship_ids = {target.relationship_id, *(history.deleted or ())}
+    scopes = [scope for rel_id in relationship_ids if rel_id is not None for scope in _rollup_scopes(connection, rel_id)]
+    rebuild_crisp_rollups(connection, scopes)
@@ -9,6 +9,7 @@ logger = get_logger()
 
 class Note(BaseModel, NotableMixin):
     __tablename__ = "notes"
+    __table_args__ = (db.Index("ix_notes_notable_type_notable_id_created_at", "notable_type", "notable_id", "created_at"),)
 
     content = db.Column(db.Text, nullable=False)
     processed_content = db.Column(db.Text)
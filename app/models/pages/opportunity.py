@@ -2,12 +2,13 @@
 
 from datetime import datetime
 from app.models.base import BaseModel, db
+from app.models.mixins import PrimedCollectionsMixin
 from app.utils.app_logging import get_logger
 
 logger = get_logger()
 
 
-class Opportunity(BaseModel):
+class Opportunity(BaseModel, PrimedCollectionsMixin):
     __tablename__ = "opportunities"
 
     name = db.Column(db.String(100), nullable=False)
@@ -49,6 +50,10 @@ class Opportunity(BaseModel):
         Retrieve Contacts linked to this Opportunity.
         Uses the Relationship model where this opportunity is linked to a contact.
         """
+        primed = self.get_primed("contacts")
+        if primed is not None:
+            return primed
+
         from app.models.pages.contact import Contact
 
         contact_ids = []
@@ -64,29 +69,29 @@ class Opportunity(BaseModel):
     def crisp_summary(self) -> float | None:
         """Compute average CRISP score for all related contacts.
 
+        Averages each linked contact's rolled-up CRISP score in a single query.
+
         Returns:
             float | None: Average CRISP score across all involved contacts.
         """
-        try:
-            contacts = set()
-
-            if hasattr(self.notes, "__iter__") and not isinstance(self.notes, str):
-                for note in self.notes:
-                    if hasattr(note, "author") and hasattr(note.author, "relationships"):
-                        for rel in note.author.relationships:
-                            if hasattr(rel, "contact"):
-                                contacts.add(rel.contact)
-            elif hasattr(self.notes, "author") and hasattr(self.notes.author, "relationships"):
-                for rel in self.notes.author.relationships:
-                    if hasattr(rel, "contact"):
-                        contacts.add(rel.contact)
+        from app.models.pages.crisp import CrispRollup
+        from app.models.relationship import Relationship
 
-            scores = [c.crisp_summary for c in contacts if hasattr(c, "crisp_summary") and c.crisp_summary is not None]
-
-            if not scores:
-                return None
-
-            return round(sum(scores) / len(scores), 2)
+        try:
+            contact_ids = db.union(
+                db.select(Relationship.entity2_id).where(
+                    Relationship.entity1_type == "opportunity", Relationship.entity1_id == self.id, Relationship.entity2_type == "contact"
+                ),
+                db.select(Relationship.entity1_id).where(
+                    Relationship.entity2_type == "opportunity", Relationship.entity2_id == self.id, Relationship.entity1_type == "contact"
+                ),
+            )
+            average = db.session.scalar(
+                db.select(db.func.avg(CrispRollup.sum_total / CrispRollup.count)).where(
+                    CrispRollup.scope_type == "contact", CrispRollup.count > 0, CrispRollup.scope_id.in_(contact_ids)
+                )
+            )
+            return round(average, 2) if average is not None else None
         except Exception as e:
             logger.error(f"Error calculating CRISP summary: {e!r}")
             return None
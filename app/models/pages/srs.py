@@ -1,8 +1,14 @@
 # app/models/srs.py
 
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import relationship
+
 from app.models.base import BaseModel, db
 from app.models.mixins import NotableMixin, TimezoneMixin
-from sqlalchemy.orm import relationship
+from app.utils.app_logging import get_logger
+
+logger = get_logger()
 
 
 class SRS(BaseModel, NotableMixin, TimezoneMixin):
@@ -15,6 +21,10 @@ class SRS(BaseModel, NotableMixin, TimezoneMixin):
     """
 
     __tablename__ = "srs"
+    __table_args__ = (
+        db.Index("ix_srs_next_review_at", "next_review_at"),
+        db.Index("ix_srs_notable_type_next_review_at", "notable_type", "next_review_at"),
+    )
 
     question = db.Column(db.Text, nullable=False)
     answer = db.Column(db.Text, nullable=False)
@@ -63,6 +73,7 @@ class ReviewHistory(BaseModel, TimezoneMixin):
     """
 
     __tablename__ = "review_history"
+    __table_args__ = (db.Index("ix_review_history_srs_item_id_created_at", "srs_item_id", "created_at"),)
 
     srs_item_id = db.Column(db.Integer, db.ForeignKey("srs.id"))
     rating = db.Column(db.Integer)
@@ -71,3 +82,57 @@ class ReviewHistory(BaseModel, TimezoneMixin):
 
     # Relationship to SRS item
     srs_item = relationship("SRS", back_populates="review_history")
+
+
+# --- Full-text search index -------------------------------------------------
+# External-content FTS5 table mirroring srs.question/srs.answer. The triggers
+# keep it in step with every INSERT/UPDATE/DELETE, including bulk statements
+# that bypass the ORM.
+
+SRS_FTS_TABLE = "srs_fts"
+
+SRS_FTS_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SRS_FTS_TABLE} USING fts5("
+    "question, answer, content='srs', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    f"CREATE TRIGGER IF NOT EXISTS {SRS_FTS_TABLE}_ai AFTER INSERT ON srs BEGIN "
+    f"INSERT INTO {SRS_FTS_TABLE}(rowid, question, answer) VALUES (new.id, new.question, new.answer); END",
+    f"CREATE TRIGGER IF NOT EXISTS {SRS_FTS_TABLE}_ad AFTER DELETE ON srs BEGIN "
+    f"INSERT INTO {SRS_FTS_TABLE}({SRS_FTS_TABLE}, rowid, question, answer) VALUES ('delete', old.id, old.question, old.answer); END",
+    f"CREATE TRIGGER IF NOT EXISTS {SRS_FTS_TABLE}_au AFTER UPDATE OF question, answer ON srs BEGIN "
+    f"INSERT INTO {SRS_FTS_TABLE}({SRS_FTS_TABLE}, rowid, question, answer) VALUES ('delete', old.id, old.question, old.answer); "
+    f"INSERT INTO {SRS_FTS_TABLE}(rowid, question, answer) VALUES (new.id, new.question, new.answer); END",
+)
+
+
+def create_srs_fts_index(connection, rebuild: bool = True) -> bool:
+    """Create the SRS FTS5 index and its sync triggers if the database supports them.
+
+    Args:
+        connection: SQLAlchemy connection to run the DDL on.
+        rebuild: Repopulate the index from the srs table after creating it.
+
+    Returns:
+        bool: True if the index is available, False if FTS5 is not supported.
+    """
+    if connection.dialect.name != "sqlite":
+        return False
+
+    try:
+        existed = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": SRS_FTS_TABLE}
+        ).first()
+        for statement in SRS_FTS_DDL:
+            connection.execute(text(statement))
+        if rebuild and not existed:
+            connection.execute(text(f"INSERT INTO {SRS_FTS_TABLE}({SRS_FTS_TABLE}) VALUES ('rebuild')"))
+    except OperationalError as e:
+        logger.warning(f"SRS full-text index unavailable, falling back to LIKE search: {e}")
+        return False
+
+    return True
+
+
+@event.listens_for(SRS.__table__, "after_create")
+def _create_srs_fts_after_create(target, connection, **kw):
+    """Attach the FTS index whenever the srs table is created by create_all()."""
+    create_srs_fts_index(connection, rebuild=False)
@@ -1,5 +1,12 @@
 # app/models/task.py
 
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from sqlalchemy import case, event
+from sqlalchemy.orm import validates
+
 from app.models.base import BaseModel, db
 from app.models.mixins import NotableMixin
 from app.utils.app_logging import get_logger
@@ -7,14 +14,75 @@ from app.utils.app_logging import get_logger
 logger = get_logger()
 
 
+class CanonicalValue(str, Enum):
+    """String enum whose values are the form stored in the database."""
+
+    def __str__(self) -> str:
+        return self.value
+
+    @property
+    def label(self) -> str:
+        """Human-readable form, e.g. "In Progress"."""
+        return self.value.replace("_", " ").title()
+
+    @classmethod
+    def coerce(cls, value) -> Optional["CanonicalValue"]:
+        """Map a label or legacy spelling ("In Progress", "Not Started") to its member.
+
+        Returns:
+            The member, or None if the value is None or not recognised.
+        """
+        if value is None or isinstance(value, cls):
+            return value
+        key = str(value).strip().lower().replace("-", "_").replace(" ", "_")
+        key = _ALIASES.get(cls.__name__, {}).get(key, key)
+        try:
+            return cls(key)
+        except ValueError:
+            return None
+
+
+class TaskStatus(CanonicalValue):
+    PENDING = "pending"
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+    DEFERRED = "deferred"
+    CANCELLED = "cancelled"
+
+
+class TaskPriority(CanonicalValue):
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+    URGENT = "urgent"
+
+    @property
+    def rank(self) -> int:
+        """Ordinal of the priority, higher is more urgent."""
+        return list(TaskPriority).index(self) + 1
+
+
+_ALIASES = {
+    "TaskStatus": {"not_started": "pending", "todo": "pending", "done": "completed", "canceled": "cancelled", "on_hold": "deferred"},
+    "TaskPriority": {"normal": "medium"},
+}
+
+# Statuses of tasks that still need doing; only these can be overdue
+OPEN_STATUSES = (TaskStatus.PENDING.value, TaskStatus.IN_PROGRESS.value, TaskStatus.DEFERRED.value)
+
+
 class Task(BaseModel, NotableMixin):
     __tablename__ = "tasks"
+    __table_args__ = (
+        db.Index("ix_tasks_status_due_date", "status", "due_date"),
+        db.Index("ix_tasks_completed_at", "completed_at"),
+    )
 
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
     due_date = db.Column(db.DateTime)
-    status = db.Column(db.String(20), default="Pending")
-    priority = db.Column(db.String(20), default="Medium")
+    status = db.Column(db.String(20), default=TaskStatus.PENDING.value, nullable=False)
+    priority = db.Column(db.String(20), default=TaskPriority.MEDIUM.value, nullable=False)
     assigned_to_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
     completed_at = db.Column(db.DateTime, nullable=True)
 
@@ -36,9 +104,38 @@ class Task(BaseModel, NotableMixin):
         Returns:
             bool: True if due date is in the past and task is not completed.
         """
-        from datetime import datetime
+        return self.due_date is not None and self.due_date < datetime.utcnow() and self.status in OPEN_STATUSES
+
+    @validates("status")
+    def validate_status(self, key, value):
+        """Store statuses in their canonical form."""
+        status = TaskStatus.coerce(value if value is not None else TaskStatus.PENDING)
+        if status is None:
+            raise ValueError(f"Unknown task status: {value!r}")
+        return status.value
+
+    @validates("priority")
+    def validate_priority(self, key, value):
+        """Store priorities in their canonical form."""
+        priority = TaskPriority.coerce(value if value is not None else TaskPriority.MEDIUM)
+        if priority is None:
+            raise ValueError(f"Unknown task priority: {value!r}")
+        return priority.value
+
+    @classmethod
+    def priority_rank(cls):
+        """SQL expression ranking priorities ordinally (urgent highest), 0 for unknown values."""
+        return case({priority.value: priority.rank for priority in TaskPriority}, value=cls.priority, else_=0)
 
-        return self.due_date is not None and self.due_date < datetime.utcnow() and self.status.lower() != "completed"
+    def sync_completed_at(self) -> None:
+        """Set completed_at when the task is completed and clear it when it is reopened."""
+        completed = self.status == TaskStatus.COMPLETED
+        # If status was changed to completed, set completed_at
+        if completed and not self.completed_at:
+            self.completed_at = datetime.utcnow()
+        # If status was changed from completed, clear completed_at
+        elif not completed and self.completed_at:
+            self.completed_at = None
 
     def save(self) -> "Task":
         """Persist task to the database with status tracking.
@@ -46,15 +143,7 @@ class Task(BaseModel, NotableMixin):
         Returns:
             Task: The saved task instance.
         """
-        from datetime import datetime
-
-        # If status was changed to completed, set completed_at
-        if self.status.lower() == "completed" and not self.completed_at:
-            self.completed_at = datetime.utcnow()
-        # If status was changed from completed, clear completed_at
-        elif self.status.lower() != "completed" and self.completed_at:
-            self.completed_at = None
-
+        self.sync_completed_at()
         return super().save()
 
     @classmethod
@@ -67,8 +156,6 @@ class Task(BaseModel, NotableMixin):
         Returns:
             Task: The created task instance
         """
-        from datetime import datetime
-
         if "notable_type" not in form_data or not form_data["notable_type"]:
             form_data["notable_type"] = "User"
 
@@ -86,8 +173,8 @@ class Task(BaseModel, NotableMixin):
         task = cls(
             title=form_data["title"],
             description=form_data.get("description", ""),
-            status=form_data.get("status", "Pending"),
-            priority=form_data.get("priority", "Medium"),
+            status=form_data.get("status") or TaskStatus.PENDING,
+            priority=form_data.get("priority") or TaskPriority.MEDIUM,
             notable_type=form_data["notable_type"],
             notable_id=int(form_data["notable_id"]),
         )
@@ -103,3 +190,10 @@ class Task(BaseModel, NotableMixin):
 
         task.save()
         return task
+
+
+@event.listens_for(Task, "before_insert")
+@event.listens_for(Task, "before_update")
+def _sync_completed_at(mapper, connection, target):
+    """Keep completed_at in step with status for updates that bypass save()."""
+    target.sync_completed_at()
@@ -1,6 +1,10 @@
 # app/models/user.py
 
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
 from flask_login import UserMixin
+from sqlalchemy.orm.attributes import set_committed_value
 from werkzeug.security import check_password_hash, generate_password_hash
 
 from app.models.base import BaseModel, db
@@ -50,35 +54,77 @@ class User(BaseModel, UserMixin):
         return check_password_hash(self.password_hash, password)
 
     def to_dict(self):
-        from app.services.relationship import RelationshipService
-
-        base_dict = super().to_dict()
-
-        entity1_relationships = Relationship.query.filter_by(entity1_type="user", entity1_id=self.id).all()
-        entity2_relationships = Relationship.query.filter_by(entity2_type="user", entity2_id=self.id).all()
-
-        related_users = []
-        related_companies = []
-
-        for rel in entity1_relationships + entity2_relationships:
-            if rel.entity1_type == "user" and rel.entity1_id == self.id:
-                related_type = rel.entity2_type
-                related_id = rel.entity2_id
-            else:
-                related_type = rel.entity1_type
-                related_id = rel.entity1_id
+        return User.to_dict_many([self])[0]
+
+    @classmethod
+    def to_dict_many(cls, users: Iterable["User"]) -> List[dict]:
+        """Serialize a page of users with their relationship summaries.
+
+        All relationships for the page are fetched in one query and the related
+        users and companies with one IN query per type.
+
+        Args:
+            users: Users to serialize.
+
+        Returns:
+            List[dict]: One dict per user, in the order given, including
+            ``related_users`` and ``related_companies`` summary strings.
+        """
+        from app.models.pages.company import Company
+
+        users = list(users)
+        user_ids = [user.id for user in users]
+        if not user_ids:
+            return []
+
+        relationships = (
+            Relationship.query.filter(
+                db.or_(
+                    db.and_(Relationship.entity1_type == "user", Relationship.entity1_id.in_(user_ids)),
+                    db.and_(Relationship.entity2_type == "user", Relationship.entity2_id.in_(user_ids)),
+                )
+            )
+            .order_by(Relationship.id)
+            .all()
+        )
+
+        # Pair each relationship with the user it belongs to and the entity on the
+        # other side; a user's outgoing relationships are listed before incoming ones
+        outgoing_pairs: Dict[int, list] = defaultdict(list)
+        incoming_pairs: Dict[int, list] = defaultdict(list)
+        outgoing: Dict[int, list] = defaultdict(list)
+        related_ids: Dict[str, set] = defaultdict(set)
+        for rel in relationships:
+            if rel.entity1_type == "user" and rel.entity1_id in user_ids:
+                outgoing[rel.entity1_id].append(rel)
+                outgoing_pairs[rel.entity1_id].append((rel, rel.entity2_type, rel.entity2_id))
+                related_ids[rel.entity2_type].add(rel.entity2_id)
+            if rel.entity2_type == "user" and rel.entity2_id in user_ids:
+                incoming_pairs[rel.entity2_id].append((rel, rel.entity1_type, rel.entity1_id))
+                related_ids[rel.entity1_type].add(rel.entity1_id)
+
+        names = {}
+        for related_type, model in (("user", cls), ("company", Company)):
+            if related_ids[related_type]:
+                rows = db.session.query(model.id, model.name).filter(model.id.in_(related_ids[related_type]))
+                names.update({(related_type, row_id): name for row_id, name in rows})
+
+        result = []
+        for user in users:
+            # Populate the relationships collection so BaseModel.to_dict doesn't lazy-load it
+            if "relationships" not in user.__dict__:
+                set_committed_value(user, "relationships", outgoing[user.id])
+            base_dict = super(User, user).to_dict()
+
+            related = {"user": [], "company": []}
+            for rel, related_type, related_id in outgoing_pairs[user.id] + incoming_pairs[user.id]:
+                name = names.get((related_type, related_id))
+                if name is not None:
+                    related[related_type].append(f"{name} ({rel.relationship_type})")
+
+            # Join lists into a comma-separated string.
+            base_dict["related_users"] = ", ".join(related["user"])
+            base_dict["related_companies"] = ", ".join(related["company"])
+            result.append(base_dict)
 
-            related_entity = RelationshipService.get_entity(related_type, related_id)
-            if not related_entity:
-                continue
-
-            if related_type == "user":
-                related_users.append(f"{related_entity.name} ({rel.relationship_type})")
-            elif related_type == "company":
-                related_companies.append(f"{related_entity.name} ({rel.relationship_type})")
-
-        # Join lists into a comma-separated string.
-        base_dict["related_users"] = ", ".join(related_users)
-        base_dict["related_companies"] = ", ".join(related_companies)
-
-        return base_dict
+        return result
@@ -42,6 +42,8 @@ class Relationship(BaseModel, RelationshipMixin):
         db.UniqueConstraint(
             "entity1_type", "entity1_id", "entity2_type", "entity2_id", "relationship_type", name="_entity_relationship_uc"
         ),
+        # Lookups from the entity1 side are served by the unique constraint's leading columns
+        db.Index("ix_relationships_entity2_type_entity2_id", "entity2_type", "entity2_id"),
     )
 
     def __repr__(self) -> str:
@@ -0,0 +1,26 @@
+# app/models/trigram.py
+
+from app.models.base import db
+
+# Inverted trigram index for fuzzy search, maintained by app/services/search/trigram.py.
+# Postings are clustered by source and trigram so a query reads only the posting
+# lists of its own trigrams.
+trigram_postings = db.Table(
+    "trigram_postings",
+    db.Column("entity_code", db.Integer, primary_key=True),
+    db.Column("trigram", db.String(3), primary_key=True),
+    db.Column("entity_id", db.Integer, primary_key=True),
+    sqlite_with_rowid=False,
+)
+
+# Per indexed document: its number of distinct trigrams (the denominator of its
+# similarity) and the trigrams themselves, concatenated, so its postings can be
+# deleted by primary key without a second index on the postings table.
+trigram_documents = db.Table(
+    "trigram_documents",
+    db.Column("entity_code", db.Integer, primary_key=True),
+    db.Column("entity_id", db.Integer, primary_key=True),
+    db.Column("trigram_count", db.Integer, nullable=False),
+    db.Column("trigrams", db.Text, nullable=False),
+    sqlite_with_rowid=False,
+)
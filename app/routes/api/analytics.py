@@ -0,0 +1,33 @@
+from flask import Blueprint
+
+from app.services.analytics_cache import analytics_cache
+from app.services.precompute import dashboard_scheduler
+from app.utils.app_logging import get_logger
+from .json_utils import json_endpoint
+
+logger = get_logger()
+
+analytics_api_bp = Blueprint("analytics_api", __name__, url_prefix="/api/analytics")
+
+
+@analytics_api_bp.route("/cache", methods=["GET"])
+@json_endpoint
+def cache_stats():
+    """Size and hit/miss/eviction/invalidation counters of the analytics result cache."""
+    return analytics_cache.stats()
+
+
+@analytics_api_bp.route("/cache", methods=["DELETE"])
+@json_endpoint
+def clear_cache():
+    """Drop every cached analytics result and reset the counters."""
+    analytics_cache.clear()
+    logger.info("Analytics cache cleared")
+    return {"cleared": True}
+
+
+@analytics_api_bp.route("/precompute", methods=["GET"])
+@json_endpoint
+def precompute_status():
+    """Whether the dashboard scheduler is running, plus the age and state of each job."""
+    return {"running": dashboard_scheduler.running, "jobs": dashboard_scheduler.status()}
@@ -39,17 +39,26 @@ class ListApiContext(ApiContext):
 
     def to_dict(self):
         """Format response with items and metadata."""
+        # Imported here: the contact services import this module
+        from app.services.contact.loader import ContactGraphLoader
+
         base_dict = super().to_dict()
 
-        # Convert items to dictionaries
-        items_data = []
-        for item in self.items:
-            if hasattr(item, "to_dict"):
-                items_data.append(item.to_dict())
-            elif isinstance(item, dict):
-                items_data.append(item)
-            else:
-                items_data.append(str(item))
+        # Convert items to dictionaries, in bulk where the model supports it
+        ContactGraphLoader.prime_list(self.items)
+        item_types = {type(item) for item in self.items}
+        to_dict_many = getattr(next(iter(item_types)), "to_dict_many", None) if len(item_types) == 1 else None
+        if to_dict_many:
+            items_data = to_dict_many(self.items)
+        else:
+            items_data = []
+            for item in self.items:
+                if hasattr(item, "to_dict"):
+                    items_data.append(item.to_dict())
+                elif isinstance(item, dict):
+                    items_data.append(item)
+                else:
+                    items_data.append(str(item))
 
         result = {
             "data": items_data,
@@ -0,0 +1,64 @@
+from flask import Blueprint, abort, request
+
+from app.services.crisp import CrispService
+from app.utils.app_logging import get_logger
+from .json_utils import json_endpoint
+
+logger = get_logger()
+
+crisp_api_bp = Blueprint("crisp_api", __name__, url_prefix="/api/crisp")
+
+crisp_service = CrispService()
+
+MAX_PAGE_SIZE = 100
+MAX_BINS = 100
+
+
+def _serialise_score(score):
+    """Flatten a Crisp score and its resolved relationship name for JSON."""
+    data = {column: getattr(score, column) for column in ("id", "relationship_id", "credibility", "reliability", "intimacy", "self_orientation", "total_score", "notes", "created_at")}
+    data["relationship_display_name"] = getattr(score, "relationship_display_name", None)
+    return data
+
+
+@crisp_api_bp.route("/scores", methods=["GET"])
+@json_endpoint
+def list_scores():
+    """
+    Keyset-paginated CRISP scores, newest first.
+
+    Query parameters:
+    - after: Cursor from the previous page's next_cursor
+    - limit: Page size (max 100)
+    """
+    limit = max(1, min(request.args.get("limit", 25, type=int), MAX_PAGE_SIZE))
+    scores, next_cursor = crisp_service.get_scores_page(after=request.args.get("after"), limit=limit)
+    return {"items": [_serialise_score(score) for score in scores], "next_cursor": next_cursor}
+
+
+@crisp_api_bp.route("/relationships/<int:relationship_id>/history", methods=["GET"])
+@json_endpoint
+def score_history(relationship_id):
+    """
+    Assessment history for one relationship, downsampled for charting.
+
+    Query parameters:
+    - points: Maximum number of points to return (default 200)
+    """
+    points = request.args.get("points", type=int)
+    return crisp_service.get_score_history(relationship_id, points)
+
+
+@crisp_api_bp.route("/distribution", methods=["GET"])
+@json_endpoint
+def score_distribution():
+    """
+    Histogram of CRISP total scores, bucketed in SQL.
+
+    Query parameters:
+    - bins: Number of equal-width bins (default 10, max 100)
+    """
+    bins = request.args.get("bins", 10, type=int)
+    if not 1 <= bins <= MAX_BINS:
+        abort(400, f"bins must be between 1 and {MAX_BINS}")
+    return crisp_service.get_score_distribution(bins)
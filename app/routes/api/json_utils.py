@@ -41,3 +41,26 @@ def json_endpoint(f):
             return jsonify({"success": False, "error": "Internal server error"}), 500
 
     return wrapped
+
+
+def precomputed_json(service, method, *args):
+    """
+    JSON response for a dashboard computation, served from the precompute store.
+
+    The ``Age`` header (and ``data_age_seconds`` for object payloads) says how
+    many seconds ago the data was computed.
+
+    Args:
+        service: Service instance the computation was registered for
+        method: Service method name
+        *args: Positional arguments the computation was registered with
+    """
+    # Imported here: the services package imports this module
+    from app.services.precompute import dashboard_scheduler
+
+    value, age = dashboard_scheduler.read(service, method, *args)
+    if isinstance(value, dict):
+        value = {**value, "data_age_seconds": round(age, 3)}
+    response = jsonify(value)
+    response.headers["Age"] = str(int(age))
+    return response
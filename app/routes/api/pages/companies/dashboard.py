@@ -3,6 +3,7 @@
 from flask import jsonify, request
 from app.services.company import CompanyService
 from app.routes.api.pages.companies import companies_api_bp
+from app.routes.api.json_utils import precomputed_json
 
 # Initialize specialized service
 company_service = CompanyService()
@@ -11,8 +12,7 @@ company_service = CompanyService()
 @companies_api_bp.route("/dashboard/stats", methods=["GET"])
 def get_dashboard_statistics():
     """Get statistics for the companies dashboard."""
-    stats = company_service.get_dashboard_statistics()
-    return jsonify(stats)
+    return precomputed_json(company_service, "get_dashboard_statistics")
 
 
 @companies_api_bp.route("/dashboard/top", methods=["GET"])
@@ -34,13 +34,11 @@ def get_top_companies():
 @companies_api_bp.route("/dashboard/segments", methods=["GET"])
 def get_engagement_segments():
     """Get company segments by engagement level."""
-    segments = company_service.get_engagement_segments()
-    return jsonify(segments)
+    return precomputed_json(company_service, "get_engagement_segments")
 
 
 @companies_api_bp.route("/dashboard/growth", methods=["GET"])
 def get_growth_data():
     """Get growth data for the chart."""
     months_back = request.args.get("months_back", 6, type=int)
-    growth_data = company_service.prepare_growth_data(months_back)
-    return jsonify(growth_data)
+    return precomputed_json(company_service, "prepare_growth_data", months_back)
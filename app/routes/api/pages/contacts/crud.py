@@ -2,6 +2,7 @@
 
 from flask import jsonify, request
 from app.models import Contact
+from app.services.contact.loader import ContactGraphLoader
 from app.services.crud_service import CRUDService
 from app.routes.api.pages.contacts import contacts_api_bp
 from app.routes.api.route_registration import ApiCrudRouteConfig
@@ -19,7 +20,7 @@ contact_api_crud_config = ApiCrudRouteConfig(blueprint=contacts_api_bp, entity_t
 @contacts_api_bp.route("/", methods=["GET"])
 def get_all():
     """Get all contacts."""
-    contacts = contact_service.get_all()
+    contacts = ContactGraphLoader.prime(contact_service.get_all())
     return jsonify([contact.to_dict() for contact in contacts])
 
 
@@ -3,6 +3,7 @@
 from flask import jsonify, request
 from app.services.contact import ContactService
 from app.routes.api.pages.contacts import contacts_api_bp
+from app.routes.api.json_utils import precomputed_json
 
 # Initialize specialized service
 contact_service = ContactService()
@@ -11,8 +12,7 @@ contact_service = ContactService()
 @contacts_api_bp.route("/dashboard/stats", methods=["GET"])
 def get_dashboard_statistics():
     """Get statistics for the contacts dashboard."""
-    stats = contact_service.get_dashboard_statistics()
-    return jsonify(stats)
+    return precomputed_json(contact_service, "get_dashboard_statistics")
 
 
 @contacts_api_bp.route("/dashboard/top", methods=["GET"])
@@ -42,5 +42,4 @@ def get_engagement_segments():
 def get_growth_data():
     """Get growth data for the chart."""
     months_back = request.args.get("months_back", 6, type=int)
-    growth_data = contact_service.prepare_growth_data(months_back)
-    return jsonify(growth_data)
+    return precomputed_json(contact_service, "prepare_growth_data", months_back)
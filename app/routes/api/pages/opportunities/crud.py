@@ -2,6 +2,7 @@
 
 from flask import jsonify, request
 from app.models import Opportunity
+from app.services.contact.loader import ContactGraphLoader
 from app.services.crud_service import CRUDService
 from app.routes.api.pages.opportunities import opportunities_api_bp
 from app.routes.api.route_registration import ApiCrudRouteConfig
@@ -21,7 +22,7 @@ opportunity_api_crud_config = ApiCrudRouteConfig(
 @opportunities_api_bp.route("/", methods=["GET"])
 def get_all():
     """Get all opportunities."""
-    opportunities = opportunity_service.get_all()
+    opportunities = ContactGraphLoader.prime_opportunities(opportunity_service.get_all())
     return jsonify([opportunity.to_dict() for opportunity in opportunities])
 
 
@@ -3,6 +3,7 @@
 from flask import jsonify, request
 from app.services.opportunity import OpportunityService
 from app.routes.api.pages.opportunities import opportunities_api_bp
+from app.routes.api.json_utils import precomputed_json
 
 # Initialize specialized service
 opportunity_service = OpportunityService()
@@ -11,8 +12,7 @@ opportunity_service = OpportunityService()
 @opportunities_api_bp.route("/dashboard/stats", methods=["GET"])
 def get_dashboard_statistics():
     """Get statistics for the opportunities dashboard."""
-    stats = opportunity_service.get_dashboard_statistics()
-    return jsonify(stats)
+    return precomputed_json(opportunity_service, "get_dashboard_statistics")
 
 
 @opportunities_api_bp.route("/dashboard/top", methods=["GET"])
@@ -38,9 +38,16 @@ def get_stage_segments():
     return jsonify(segments)
 
 
+@opportunities_api_bp.route("/dashboard/forecast", methods=["GET"])
+def get_forecast_data():
+    """Get the bookings forecast (P10/P50/P90) for the chart."""
+    months = min(max(request.args.get("months", 6, type=int), 1), 24)
+    forecast_data = opportunity_service.get_forecast(months)
+    return jsonify(forecast_data)
+
+
 @opportunities_api_bp.route("/dashboard/growth", methods=["GET"])
 def get_growth_data():
     """Get growth data for the chart."""
     months_back = request.args.get("months_back", 6, type=int)
-    growth_data = opportunity_service.prepare_growth_data(months_back)
-    return jsonify(growth_data)
+    return precomputed_json(opportunity_service, "prepare_growth_data", months_back)
@@ -3,6 +3,7 @@
 from flask import jsonify, request
 from app.services.srs import SRSService
 from app.routes.api.pages.srs import srs_api_bp
+from app.routes.api.json_utils import precomputed_json
 
 # Initialize service
 srs_service = SRSService()
@@ -11,7 +12,7 @@ srs_service = SRSService()
 @srs_api_bp.route("/stats", methods=["GET"])
 def get_srs_stats():
     """Get current SRS system statistics."""
-    return srs_service.get_stats()
+    return precomputed_json(srs_service, "get_stats")
 
 
 @srs_api_bp.route("/progress-data", methods=["GET"])
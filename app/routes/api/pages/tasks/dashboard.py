@@ -1,18 +1,22 @@
 # app/routes/api/pages/tasks/dashboard.py
 
+from datetime import date, datetime, timedelta
+
 from flask import jsonify, request
 from app.services.task import TaskService
 from app.routes.api.pages.tasks import tasks_api_bp
+from app.routes.api.json_utils import precomputed_json
 
 # Initialize specialized service
 task_service = TaskService()
 
+MAX_SERIES_DAYS = 366
+
 
 @tasks_api_bp.route("/dashboard/stats", methods=["GET"])
 def get_dashboard_statistics():
     """Get statistics for the tasks dashboard."""
-    stats = task_service.get_dashboard_statistics()
-    return jsonify(stats)
+    return precomputed_json(task_service, "get_dashboard_statistics")
 
 
 @tasks_api_bp.route("/dashboard/top", methods=["GET"])
@@ -23,11 +27,32 @@ def get_top_tasks():
     return jsonify([task.to_dict() for task in top_tasks])
 
 
+@tasks_api_bp.route("/dashboard/series", methods=["GET"])
+def get_daily_series():
+    """Get tasks created, completed and overdue per day.
+
+    Query parameters: ``end`` (ISO date, default today) and either ``start``
+    (ISO date) or ``days`` (default 7); windows are capped at MAX_SERIES_DAYS.
+    """
+    end = request.args.get("end", type=date.fromisoformat) or datetime.now().date()
+    start = request.args.get("start", type=date.fromisoformat)
+    days = min(max(request.args.get("days", 7, type=int), 1), MAX_SERIES_DAYS)
+    try:
+        if start is None:
+            start = end - timedelta(days=days - 1)
+    except OverflowError:
+        return jsonify({"error": "end is too early for the requested window"}), 400
+    if start > end:
+        return jsonify({"error": "start must not be after end"}), 400
+    if (end - start).days >= MAX_SERIES_DAYS:
+        start = end - timedelta(days=MAX_SERIES_DAYS - 1)
+    return jsonify(task_service.get_daily_series(start, end))
+
+
 @tasks_api_bp.route("/dashboard/status", methods=["GET"])
 def get_status_breakdown():
     """Get tasks breakdown by status."""
-    status_data = task_service.get_status_breakdown()
-    return jsonify(status_data)
+    return precomputed_json(task_service, "get_status_breakdown")
 
 
 @tasks_api_bp.route("/dashboard/overdue", methods=["GET"])
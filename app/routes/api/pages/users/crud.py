@@ -1,6 +1,7 @@
 # app/routes/api/pages/users/crud.py
 
 from flask import jsonify
+from app.models.pages.user import User
 from app.services.user import UserService
 from app.routes.api.pages.users import users_api_bp
 from app.routes.api.route_registration import ApiCrudRouteConfig
@@ -17,7 +18,7 @@ user_api_crud_config = ApiCrudRouteConfig(blueprint=users_api_bp, entity_table_n
 def get_all():
     """Get all users."""
     users = user_service.get_all()
-    return jsonify([user.to_dict() for user in users])
+    return jsonify(User.to_dict_many(users))
 
 
 @users_api_bp.route("/<int:user_id>", methods=["GET"])
@@ -1,6 +1,7 @@
 # app/routes/api/pages/users/filters.py
 
 from flask import jsonify, request
+from app.models.pages.user import User
 from app.services.user import UserService
 from app.routes.api.pages.users import users_api_bp
 
@@ -13,4 +14,4 @@ def get_filtered_users():
     """Get users based on filter criteria."""
     filters = {"role": request.args.get("role"), "active": request.args.get("active"), "department": request.args.get("department")}
     users = user_service.get_filtered_users(filters)
-    return jsonify([user.to_dict() for user in users])
+    return jsonify(User.to_dict_many(users))
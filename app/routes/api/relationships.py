@@ -1,8 +1,10 @@
-from flask import Blueprint, request
+from flask import Blueprint, abort, request
 
 from app.models import Relationship
 from app.routes.api.route_registration import ApiCrudRouteConfig
 from app.services.crud_service import CRUDService
+from app.services.relationship.graph import MAX_HOPS, RelationshipGraphService
+from app.services.service_base import ServiceRegistry
 from app.utils.app_logging import get_logger
 from .json_utils import json_endpoint
 
@@ -14,6 +16,7 @@ ENTITY_PLURAL_NAME = "Relationships"
 relationships_api_bp = Blueprint(f"{ENTITY_NAME.lower()}_api", __name__, url_prefix=f"/api/{ENTITY_PLURAL_NAME.lower()}")
 
 relationship_service = CRUDService(Relationship)
+graph_service = ServiceRegistry.get(RelationshipGraphService)
 
 # Configure standard CRUD routes
 relationship_api_crud_config = ApiCrudRouteConfig(
@@ -74,3 +77,73 @@ def search_relationships():
     except Exception as e:
         logger.error(f"Error searching relationships: {str(e)}")
         return {"success": False, "message": f"An error occurred: {str(e)}"}, 500
+
+
+def _entity_arg(type_arg: str, id_arg: str):
+    """Read an (entity_type, entity_id) pair from the query string."""
+    entity_type = request.args.get(type_arg)
+    entity_id = request.args.get(id_arg, type=int)
+    if not entity_type or entity_id is None:
+        abort(400, f"{type_arg} and an integer {id_arg} are required parameters")
+    return entity_type.lower(), entity_id
+
+
+@relationships_api_bp.route("/graph/neighbors", methods=["GET"])
+@json_endpoint
+def graph_neighbors():
+    """
+    Entities directly related to an entity.
+
+    Query parameters:
+    - entity_type, entity_id: The starting entity
+    """
+    entity_type, entity_id = _entity_arg("entity_type", "entity_id")
+    return graph_service.add_entity_names(graph_service.neighbors(entity_type, entity_id))
+
+
+@relationships_api_bp.route("/graph/k-hop", methods=["GET"])
+@json_endpoint
+def graph_k_hop():
+    """
+    Entities within k relationship hops of an entity.
+
+    Query parameters:
+    - entity_type, entity_id: The starting entity
+    - k: Maximum number of hops (default 2, at most MAX_HOPS)
+    - related_entity_type: Only return entities of this type
+    """
+    entity_type, entity_id = _entity_arg("entity_type", "entity_id")
+    k = request.args.get("k", default=2, type=int)
+    if not 1 <= k <= MAX_HOPS:
+        abort(400, f"k must be between 1 and {MAX_HOPS}")
+
+    related = graph_service.k_hop(entity_type, entity_id, k, request.args.get("related_entity_type"))
+    return graph_service.add_entity_names(related)
+
+
+@relationships_api_bp.route("/graph/path", methods=["GET"])
+@json_endpoint
+def graph_shortest_path():
+    """
+    Strongest introduction path between two entities, weighted by CRISP scores.
+
+    Query parameters:
+    - from_type, from_id: The starting entity
+    - to_type, to_id: The entity to reach
+    """
+    source = _entity_arg("from_type", "from_id")
+    target = _entity_arg("to_type", "to_id")
+
+    result = graph_service.shortest_path(source, target)
+    if result is None:
+        abort(404, "No path between the given entities")
+
+    graph_service.add_entity_names(result["path"])
+    return result
+
+
+@relationships_api_bp.route("/graph/stats", methods=["GET"])
+@json_endpoint
+def graph_stats():
+    """Size of the in-memory relationship graph."""
+    return graph_service.stats()
@@ -2,14 +2,12 @@
 
 from flask import Blueprint, abort, request
 
-from app.models.pages.company import Company
-from app.models.pages.contact import Contact
-from app.models.pages.note import Note
-from app.models.pages.opportunity import Opportunity
-from app.models.pages.srs import SRS
-from app.models.pages.task import Task
-from app.models.pages.user import User
-from app.services.search import SearchService
+from app.services.search.cache import cached_search, model_tables, search_cache
+from app.services.search.federated import DEFAULT_SOURCE_LIMIT, FederatedSearchService
+from app.services.search.index import DEFAULT_LIMIT, ENTITIES_BY_NAME, SearchIndexService
+from app.services.search.trigram import SOURCES_BY_NAME as TRIGRAM_SOURCES_BY_NAME, TrigramSearchService
+from app.services.service_base import ServiceRegistry
+from app.services.srs.search import SRSSearchService
 from app.utils.app_logging import get_logger
 
 from .json_utils import json_endpoint
@@ -19,19 +17,131 @@ logger = get_logger()
 search_api_bp = Blueprint("search_api", __name__, url_prefix="/api/search")
 # search_bp = Blueprint("search_bp", __name__, url_prefix="/api/search")
 
-# Map each entity name to its model and searchable fields
-_entity_search_map = {
-    "companies": (Company, ["name", "industry"]),
-    "contacts": (Contact, ["first_name", "last_name", "email"]),
-    "notes": (Note, ["content"]),
-    "opportunities": (Opportunity, ["title", "status"]),
-    "tasks": (Task, ["title", "description"]),
-    "users": (User, ["username", "email"]),
-    "srs": (SRS, ["question", "answer"]),
-}
+MAX_LIMIT = 100
+MAX_SOURCE_LIMIT = 20
 
-# Instantiate one SearchService per entity
-_search_services = {key: SearchService(model, fields) for key, (model, fields) in _entity_search_map.items()}
+# One SearchService per indexed entity, shared with the federated search
+_search_services = dict(ServiceRegistry.get(FederatedSearchService).sources)
+
+# SRS cards use the ranked full-text index
+_search_services["srs"] = ServiceRegistry.get(SRSSearchService)
+
+
+def _serialise_result(item) -> dict:
+    """Convert a search hit to a dict, keeping any ranking metadata attached by the service."""
+    data = item.to_dict()
+    for attr in ("search_rank", "search_snippet"):
+        if hasattr(item, attr):
+            data[attr] = getattr(item, attr)
+    return data
+
+
+def _requested_types():
+    """Entity names from the comma-separated ``types`` query param, None for all."""
+    return [name for name in request.args.get("types", "").split(",") if name] or None
+
+
+def _entity_tables(names, models_by_name) -> set:
+    """Tables read by a search over the named entities, all of them for None."""
+    tables = set()
+    for name in models_by_name if names is None else names:
+        if name in models_by_name:
+            tables.update(model_tables(models_by_name[name]))
+    return tables
+
+
+_INDEXED_MODELS = {name: entity.model for name, entity in ENTITIES_BY_NAME.items()}
+_TRIGRAM_MODELS = {name: source.model for name, source in TRIGRAM_SOURCES_BY_NAME.items()}
+
+
+@search_api_bp.route("/cache", methods=["GET"])
+@json_endpoint
+def search_cache_stats():
+    """Size in bytes and hit/miss/eviction/invalidation counters of the search result cache."""
+    return search_cache.stats()
+
+
+@search_api_bp.route("/cache", methods=["DELETE"])
+@json_endpoint
+def clear_search_cache():
+    """Drop every cached search result and reset the counters."""
+    search_cache.clear()
+    logger.info("Search cache cleared")
+    return {"cleared": True}
+
+
+@search_api_bp.route("/", methods=["GET"])
+@json_endpoint
+def search_federated():
+    """
+    Search every entity type concurrently, for omnibox-style lookups.
+
+    Query params:
+      - q: text term
+      - types: comma-separated entity names to search (default: all)
+      - limit: hits per entity type (default 5, at most 20)
+
+    Returns the merged hits best first, plus the status, hit count and
+    elapsed time of each source.
+    """
+    limit = min(max(request.args.get("limit", DEFAULT_SOURCE_LIMIT, type=int), 1), MAX_SOURCE_LIMIT)
+    try:
+        return ServiceRegistry.get(FederatedSearchService).search(request.args.get("q", ""), _requested_types(), limit=limit)
+    except ValueError as e:
+        abort(400, str(e))
+
+
+@search_api_bp.route("/all", methods=["GET"])
+@json_endpoint
+def search_all():
+    """
+    Ranked search across every indexed entity.
+
+    Query params:
+      - q: text term
+      - types: comma-separated entity names to search (default: all)
+      - limit/offset: paging (limit defaults to 20, at most 100)
+    """
+    limit = min(max(request.args.get("limit", DEFAULT_LIMIT, type=int), 1), MAX_LIMIT)
+    offset = max(request.args.get("offset", 0, type=int), 0)
+    types = _requested_types()
+    try:
+        return cached_search(
+            "all",
+            request.args.get("q", ""),
+            {"types": tuple(types or ()), "limit": limit, "offset": offset},
+            _entity_tables(types, _INDEXED_MODELS),
+            lambda term: ServiceRegistry.get(SearchIndexService).search(term, types, limit=limit, offset=offset),
+        )
+    except ValueError as e:
+        abort(400, str(e))
+
+
+@search_api_bp.route("/fuzzy", methods=["GET"])
+@json_endpoint
+def search_fuzzy():
+    """
+    Typo-tolerant search over note content and contact and company names.
+
+    Query params:
+      - q: text term
+      - types: comma-separated sources, any of notes, contacts, companies (default: all)
+      - threshold: minimum similarity between 0 and 1 (default per source)
+      - limit: maximum hits (default 20, at most 100)
+    """
+    limit = min(max(request.args.get("limit", DEFAULT_LIMIT, type=int), 1), MAX_LIMIT)
+    threshold = request.args.get("threshold", type=float)
+    types = _requested_types()
+    try:
+        return cached_search(
+            "fuzzy",
+            request.args.get("q", ""),
+            {"types": tuple(types or ()), "threshold": threshold, "limit": limit},
+            _entity_tables(types, _TRIGRAM_MODELS),
+            lambda term: ServiceRegistry.get(TrigramSearchService).search(term, types, threshold, limit),
+        )
+    except ValueError as e:
+        abort(400, str(e))
 
 
 @search_api_bp.route("/<entity_name>", methods=["GET"])
@@ -42,6 +152,7 @@ def search_entity(entity_name: str):
 
     Query params:
       - q: text term (optional)
+      - limit/offset: paging (limit defaults to 20, at most 100)
       - any other: exact-match filters
     """
     svc = _search_services.get(entity_name)
@@ -50,8 +161,17 @@ def search_entity(entity_name: str):
 
     params = request.args.to_dict(flat=True)
     term = params.pop("q", "")
+    limit = min(max(request.args.get("limit", DEFAULT_LIMIT, type=int), 1), MAX_LIMIT)
+    offset = max(request.args.get("offset", 0, type=int), 0)
+    params.pop("limit", None)
+    params.pop("offset", None)
     filters = {k: v for k, v in params.items() if v != ""}
 
-    items = svc.search(term, filters)
     # Return a list of plain dicts; json_endpoint will wrap it
-    return [item.to_dict() for item in items]
+    return cached_search(
+        f"entity:{entity_name}",
+        term,
+        {"filters": tuple(sorted(filters.items())), "limit": limit, "offset": offset},
+        model_tables(svc.model_class),
+        lambda normalized: [_serialise_result(item) for item in svc.search(normalized, filters, limit=limit, offset=offset)],
+    )
@@ -0,0 +1,34 @@
+# app/routes/api/typeahead.py
+
+from flask import Blueprint, abort, request
+
+from app.services.search.typeahead import DEFAULT_LIMIT, TypeaheadService
+from app.services.service_base import ServiceRegistry
+from app.utils.app_logging import get_logger
+
+from .json_utils import json_endpoint
+
+logger = get_logger()
+
+typeahead_api_bp = Blueprint("typeahead_api", __name__, url_prefix="/api/typeahead")
+
+MAX_LIMIT = 50
+
+
+@typeahead_api_bp.route("/", methods=["GET"])
+@json_endpoint
+def typeahead():
+    """
+    Autocomplete suggestions served from the in-memory prefix index.
+
+    Query params:
+      - q: typed prefix of a name, username or email
+      - types: comma-separated sources, any of users, contacts, companies (default: all)
+      - limit: maximum suggestions (default 10, at most 50)
+    """
+    types = [name for name in request.args.get("types", "").split(",") if name] or None
+    limit = min(max(request.args.get("limit", DEFAULT_LIMIT, type=int), 1), MAX_LIMIT)
+    try:
+        return ServiceRegistry.get(TypeaheadService).suggest(request.args.get("q", ""), types, limit=limit)
+    except ValueError as e:
+        abort(400, str(e))
@@ -1,4 +1,4 @@
-from flask import render_template
+from flask import render_template, request
 from app.routes.web.views.base_view import DashboardView, RecordsView
 from app.models import Crisp, Relationship
 
@@ -25,29 +25,27 @@ class CrispDashboardView(DashboardView):
 
 class CrispScoresView(RecordsView):
     def get(self):
-        scores = Crisp.query.order_by(Crisp.created_at.desc()).all()
-
-        for score in scores:
-            relationship = Relationship.query.get(score.relationship_id)
-            score.relationship_display_name = self.service.get_relationship_display_name(relationship)
-
-        return render_template(self.template_path, scores=scores)
+        scores, next_cursor = self.service.get_scores_page(
+            after=request.args.get("after"), limit=request.args.get("per_page", 25, type=int)
+        )
+        return render_template(self.template_path, scores=scores, next_cursor=next_cursor)
 
 
 class CrispDetailView(RecordsView):
     def get(self, score_id):
         score = Crisp.query.get_or_404(score_id)
-        relationship = Relationship.query.get(score.relationship_id)
-        score.relationship_display_name = self.service.get_relationship_display_name(relationship)
-
-        historical_scores = Crisp.query.filter_by(relationship_id=score.relationship_id).order_by(
-            Crisp.created_at).all()
-        historical_dates = [score.created_at.strftime("%Y-%m-%d") for score in historical_scores]
-        historical_scores_data = [float(score.total_score) for score in historical_scores]
-        historical_credibility = [score.credibility for score in historical_scores]
-        historical_reliability = [score.reliability for score in historical_scores]
-        historical_intimacy = [score.intimacy for score in historical_scores]
-        historical_self_orientation = [score.self_orientation for score in historical_scores]
+        score.relationship_display_name = self.service.get_relationship_display_names([score.relationship]).get(
+            score.relationship_id, "Unknown Relationship"
+        )
+
+        # Downsampled when the relationship has a long assessment history
+        historical_scores = self.service.get_score_history(score.relationship_id)
+        historical_dates = [point["created_at"].strftime("%Y-%m-%d") for point in historical_scores]
+        historical_scores_data = [float(point["total_score"]) for point in historical_scores]
+        historical_credibility = [point["credibility"] for point in historical_scores]
+        historical_reliability = [point["reliability"] for point in historical_scores]
+        historical_intimacy = [point["intimacy"] for point in historical_scores]
+        historical_self_orientation = [point["self_orientation"] for point in historical_scores]
 
         return render_template(
             self.template_path,
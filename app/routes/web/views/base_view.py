@@ -15,6 +15,8 @@ from flask_login import login_required
 
 from app.routes.web.utils.context import WebContext, TableContext
 from app.routes.web.utils.template_renderer import render_safely, RenderSafelyConfig
+from app.services.contact.loader import ContactGraphLoader
+from app.services.precompute import dashboard_scheduler
 from app.utils.app_logging import get_logger
 
 logger = get_logger()
@@ -69,8 +71,10 @@ class DashboardView(BaseView):
         """
         logger.info(f"Rendering dashboard: {self.template_path}")
 
-        # Common dashboard data preparation
-        stats = self.service.get_stats() if hasattr(self.service, 'get_stats') else {}
+        # Common dashboard data preparation, served precomputed where registered
+        stats, data_age = {}, 0.0
+        if hasattr(self.service, 'get_stats'):
+            stats, data_age = dashboard_scheduler.read(self.service, 'get_stats')
 
         # Create context with default dashboard data
         context = WebContext(title=self.title)
@@ -78,9 +82,11 @@ class DashboardView(BaseView):
 
         # Add additional data if the service provides it
         if hasattr(self.service, 'get_dashboard_data'):
-            dashboard_data = self.service.get_dashboard_data()
+            dashboard_data, age = dashboard_scheduler.read(self.service, 'get_dashboard_data')
+            data_age = max(data_age, age)
             for key, value in dashboard_data.items():
                 setattr(context, key, value)
+        context.data_age = data_age
 
         config = RenderSafelyConfig(
             template_path=self.template_path,
@@ -211,8 +217,10 @@ class RecordsView(BaseView):
 
         logger.info(f"Retrieved {len(items)} records")
 
-        # Convert to dict format for table
-        table_data = [item.to_dict() for item in items.items]
+        # Convert to dict format for table, in bulk where the model supports it
+        records = ContactGraphLoader.prime_list(items.items)
+        to_dict_many = getattr(self.model_class, "to_dict_many", None)
+        table_data = to_dict_many(records) if to_dict_many else [item.to_dict() for item in records]
         serialized_data = json.dumps(table_data, cls=CustomJSONEncoder)
 
         # Create table context
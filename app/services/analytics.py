@@ -0,0 +1,337 @@
+# app/services/analytics.py
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, exists, func
+from sqlalchemy.orm.attributes import QueryableAttribute
+
+from app.models.base import db
+
+DAY = "day"
+WEEK = "week"
+MONTH = "month"
+BUCKETS = (DAY, WEEK, MONTH)
+
+DEFAULT_LABEL_FORMATS = {DAY: "%a %d", WEEK: "%d %b", MONTH: "%b %Y"}
+
+# Segments reported by segment_counts for values outside every bucket and for NULLs
+UNKNOWN_SEGMENT = "Unknown"
+MISSING_SEGMENT = "Not Set"
+
+# Rows older than the requested range are folded into this bucket so the
+# running sum starts from the correct baseline. It sorts before every real key.
+_BASELINE_KEY = ""
+
+
+def _check_bucket(bucket: str) -> None:
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unknown bucket {bucket!r}, expected one of {', '.join(BUCKETS)}")
+
+
+def bucket_start(moment: datetime, bucket: str) -> datetime:
+    """
+    Truncate a datetime to the start of its bucket.
+
+    Weeks start on Monday.
+
+    Args:
+        moment: Datetime to truncate
+        bucket: "day", "week" or "month"
+
+    Returns:
+        Midnight on the first day of the bucket
+    """
+    _check_bucket(bucket)
+    day = datetime(moment.year, moment.month, moment.day)
+    if bucket == WEEK:
+        return day - timedelta(days=day.weekday())
+    if bucket == MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(moment: datetime, bucket: str) -> datetime:
+    """Return the start of the bucket following the one ``moment`` falls in."""
+    start = bucket_start(moment, bucket)
+    if bucket == DAY:
+        return start + timedelta(days=1)
+    if bucket == WEEK:
+        return start + timedelta(weeks=1)
+    return datetime(start.year + start.month // 12, start.month % 12 + 1, 1)
+
+
+def bucket_key(moment: datetime, bucket: str) -> str:
+    """
+    Key a datetime the same way :func:`bucket_expression` keys a row.
+
+    Args:
+        moment: Datetime to key
+        bucket: "day", "week" or "month"
+
+    Returns:
+        "YYYY-MM-DD" for days and weeks (the Monday), "YYYY-MM" for months
+    """
+    start = bucket_start(moment, bucket)
+    return start.strftime("%Y-%m") if bucket == MONTH else start.strftime("%Y-%m-%d")
+
+
+def bucket_starts(start: datetime, end: datetime, bucket: str) -> List[datetime]:
+    """
+    List the start of every bucket overlapping [start, end).
+
+    Args:
+        start: Start of the range (inclusive)
+        end: End of the range (exclusive)
+        bucket: "day", "week" or "month"
+
+    Returns:
+        Bucket start datetimes in chronological order
+    """
+    starts = []
+    current = bucket_start(start, bucket)
+    while current < end:
+        starts.append(current)
+        current = next_bucket(current, bucket)
+    return starts
+
+
+def month_range(months_back: int, now: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+    """
+    Range covering the current month and the ``months_back - 1`` months before it.
+
+    Args:
+        months_back: Number of calendar months to cover
+        now: Reference time, defaults to the current local time
+
+    Returns:
+        Tuple of (first day of the earliest month, first day of next month)
+    """
+    now = now or datetime.now()
+    months = now.year * 12 + now.month - 1 - (max(months_back, 1) - 1)
+    return datetime(months // 12, months % 12 + 1, 1), next_bucket(now, MONTH)
+
+
+def bucket_expression(column, bucket: str):
+    """
+    SQL expression keying a date/datetime column by bucket.
+
+    Args:
+        column: Date or DateTime column
+        bucket: "day", "week" or "month"
+
+    Returns:
+        SQL string expression matching :func:`bucket_key`
+    """
+    _check_bucket(bucket)
+    if bucket == WEEK:
+        # The following Sunday (or the day itself), minus six days: the Monday
+        return func.date(column, "weekday 0", "-6 days")
+    return func.strftime("%Y-%m" if bucket == MONTH else "%Y-%m-%d", column)
+
+
+def _bound(column, moment: datetime):
+    """Compare Date columns against dates so the end day isn't included as a string prefix."""
+    if isinstance(column.type, db.Date) and not isinstance(column.type, db.DateTime):
+        return moment.date() if isinstance(moment, datetime) else moment
+    return moment if isinstance(moment, datetime) else datetime.combine(moment, datetime.min.time())
+
+
+def growth_series(
+    column,
+    start: datetime,
+    end: datetime,
+    bucket: str = MONTH,
+    criteria: Iterable[Any] = (),
+    value=None,
+    label_format: Optional[str] = None,
+) -> Dict[str, List[Any]]:
+    """
+    New rows per bucket and the running total at the end of each bucket.
+
+    Uses a single GROUP BY over ``column`` with a window sum for the running
+    total; rows before ``start`` are collapsed into one baseline group.
+    Buckets without rows are filled in with zero.
+
+    Args:
+        column: Date or DateTime column to bucket on, e.g. ``Company.created_at``
+        start: Start of the range (inclusive); truncated to the bucket start
+        end: End of the range (exclusive)
+        bucket: "day", "week" or "month"
+        criteria: Extra filter expressions applied to every row
+        value: Optional numeric column to sum per bucket
+        label_format: strftime format for the labels, defaults per bucket
+
+    Returns:
+        Dictionary with "keys", "labels", "new" and "total" lists (plus
+        "value" when a value column is given), one entry per bucket
+    """
+    starts = bucket_starts(start, end, bucket)
+    first = starts[0] if starts else bucket_start(start, bucket)
+
+    key = case((column < _bound(column, first), _BASELINE_KEY), else_=bucket_expression(column, bucket)).label("bucket")
+    columns = [key, func.count().label("new"), func.sum(func.count()).over(order_by=key).label("total")]
+    if value is not None:
+        columns.append(func.coalesce(func.sum(value), 0).label("value"))
+
+    query = db.session.query(*columns).filter(column < _bound(column, end), *criteria).group_by(key)
+    rows = {row.bucket: row for row in query.all()}
+
+    baseline = rows.get(_BASELINE_KEY)
+    running = baseline.total if baseline else 0
+    series = {"keys": [], "labels": [], "new": [], "total": []}
+    if value is not None:
+        series["value"] = []
+
+    label_format = label_format or DEFAULT_LABEL_FORMATS[bucket]
+    for bucket_begin in starts:
+        key_value = bucket_key(bucket_begin, bucket)
+        row = rows.get(key_value)
+        if row is not None:
+            running = row.total
+        series["keys"].append(key_value)
+        series["labels"].append(bucket_begin.strftime(label_format))
+        series["new"].append(row.new if row is not None else 0)
+        series["total"].append(running)
+        if value is not None:
+            series["value"].append(row.value if row is not None else 0)
+    return series
+
+
+def monthly_growth(column, months_back: int = 6, **kwargs) -> Dict[str, List[Any]]:
+    """
+    :func:`growth_series` over the last ``months_back`` calendar months.
+
+    Args:
+        column: Date or DateTime column to bucket on
+        months_back: Number of months, including the current one
+        **kwargs: Passed through to :func:`growth_series`
+
+    Returns:
+        Growth series dictionary
+    """
+    start, end = month_range(months_back)
+    return growth_series(column, start, end, MONTH, **kwargs)
+
+
+def percentage(count: int, total: int) -> int:
+    """Whole-number percentage of ``count`` in ``total``, 0 when the total is 0."""
+    return round(count / total * 100) if total else 0
+
+
+def segment_counts(model, column, buckets: Dict[str, Any], *criteria) -> List[Dict[str, Any]]:
+    """
+    Count rows per category of ``column`` with one GROUP BY.
+
+    Args:
+        model: Model whose rows are counted, e.g. ``Task``
+        column: Categorical column, e.g. ``Task.status``
+        buckets: Segment names mapped to the column value (or tuple of values) they cover
+        *criteria: Filters restricting the rows counted
+
+    Returns:
+        One ``{"name", "count", "percentage"}`` entry per bucket, in order,
+        followed by "Unknown" (values no bucket covers) and "Not Set" (NULL).
+        Percentages are of all rows matching ``criteria``.
+    """
+    names = {}
+    for name, values in buckets.items():
+        for value in values if isinstance(values, (tuple, list, set, frozenset)) else (values,):
+            names[value] = name
+
+    counts = dict.fromkeys([*buckets, UNKNOWN_SEGMENT, MISSING_SEGMENT], 0)
+    rows = db.session.query(column, func.count()).select_from(model).filter(*criteria).group_by(column).all()
+    for value, count in rows:
+        counts[MISSING_SEGMENT if value is None else names.get(value, UNKNOWN_SEGMENT)] += count
+
+    total = sum(counts.values())
+    return [{"name": name, "count": count, "percentage": percentage(count, total)} for name, count in counts.items()]
+
+
+class EngagementSegmentation:
+    """Counts rows of a model by how much related activity they have, in one query.
+
+    Conditions are built from two kinds of related-activity expressions:
+
+    * :meth:`related_count` LEFT JOINs a grouped count of related rows, so
+      thresholds like ``count > 2`` cost one pass over the related table and
+      ``count == 0`` is a LEFT JOIN anti-join.
+    * :meth:`has` is a correlated EXISTS; negate it (``~``) for NOT EXISTS.
+
+    :meth:`counts` then evaluates every named condition as a filtered count
+    in a single aggregate over the model's table.
+
+    Example::
+
+        segmentation = EngagementSegmentation(Company)
+        opportunities = segmentation.related_count(Opportunity.company_id)
+        segmentation.counts({"high": opportunities > 2, "none": opportunities == 0})
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self._joins = []
+
+    def related_count(self, foreign_key, *criteria):
+        """
+        Number of related rows per model row, for use in segment conditions.
+
+        Args:
+            foreign_key: Column on the related table referencing the model's id,
+                e.g. ``Opportunity.company_id``
+            *criteria: Filters on the related rows
+
+        Returns:
+            Integer SQL expression, 0 for rows without related rows
+        """
+        related = (
+            db.session.query(foreign_key.label("owner_id"), func.count().label("total"))
+            .filter(foreign_key.isnot(None), *criteria)
+            .group_by(foreign_key)
+            .subquery()
+        )
+        self._joins.append(related)
+        return func.coalesce(related.c.total, 0)
+
+    def has(self, related, *criteria):
+        """
+        Whether a model row has any matching related row (a correlated EXISTS).
+
+        Args:
+            related: Relationship attribute on the model, e.g. ``Company.contacts``,
+                or a column on the related table referencing the model's id
+            *criteria: Filters on the related rows
+
+        Returns:
+            Boolean SQL expression; ``~`` gives the NOT EXISTS anti-join
+        """
+        if isinstance(related, QueryableAttribute) and hasattr(related.property, "mapper"):
+            return related.any(*criteria)
+        return exists().where(related == self.model.id, *criteria)
+
+    def counts(self, segments: Dict[str, Any], *criteria) -> Dict[str, int]:
+        """
+        Count the model rows matching each segment condition.
+
+        Args:
+            segments: Boolean SQL conditions keyed by segment name; segments may overlap
+            *criteria: Filters restricting the rows counted, including the total
+
+        Returns:
+            Count per segment name, plus "total" for all rows matching ``criteria``
+        """
+        columns = [func.count()] + [func.count().filter(condition) for condition in segments.values()]
+        query = db.session.query(*columns).select_from(self.model)
+        for related in self._joins:
+            query = query.outerjoin(related, related.c.owner_id == self.model.id)
+        row = query.filter(*criteria).one()
+        return {"total": row[0], **{name: row[index] for index, name in enumerate(segments, start=1)}}
+
+    def segments(self, segments: Dict[str, Any], *criteria) -> List[Dict[str, Any]]:
+        """
+        :meth:`counts` as a list of ``{"name", "count", "percentage"}`` entries.
+
+        Percentages are of all rows matching ``criteria``.
+        """
+        counts = self.counts(segments, *criteria)
+        return [{"name": name, "count": counts[name], "percentage": percentage(counts[name], counts["total"])} for name in segments]
@@ -0,0 +1,278 @@
+# app/services/analytics_cache.py
+import copy
+import functools
+import sys
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, List, Optional, Set, Tuple, Union
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.models.base import db
+from app.utils.app_logging import get_logger
+
+logger = get_logger()
+
+DEFAULT_TTL = 300
+DEFAULT_MAX_ENTRIES = 512
+
+_SESSION_TABLES_KEY = "analytics_cache_written_tables"
+
+Tables = Union[Iterable[str], Callable[[Any], Iterable[str]]]
+
+
+def approximate_size(value: Any) -> int:
+    """Approximate memory held by a JSON-like value (dicts, lists, tuples and scalars), in bytes."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(approximate_size(key) + approximate_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(approximate_size(item) for item in value)
+    return size
+
+
+class AnalyticsCache:
+    """Thread-safe LRU store for analytics results, indexed by the tables they read.
+
+    Entries expire after their TTL, the least recently used entries are
+    evicted once ``max_entries`` or ``max_bytes`` (None for no limit) is
+    exceeded, and :meth:`invalidate_tables` drops every entry that depends on
+    a written table. Entry sizes are whatever the caller passes to :meth:`set`.
+
+    Each invalidation also bumps a per-table generation. A caller reads
+    :meth:`generation` before computing a result and passes it to
+    :meth:`set`, which skips storing the result if a write landed meanwhile.
+    """
+
+    def __init__(self, max_entries: Optional[int] = DEFAULT_MAX_ENTRIES, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._bytes = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, FrozenSet[str], int]]" = OrderedDict()
+        self._by_table: Dict[str, Set[Hashable]] = defaultdict(set)
+        self._lock = threading.RLock()
+        self._counters: Dict[str, int] = defaultdict(int)
+        self._by_function: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0})
+        # Not reset by clear(), so a result computed across a clear() still sees writes
+        self._generations: Dict[str, int] = defaultdict(int)
+
+    def get(self, key: Hashable, name: str = "") -> Tuple[bool, Any]:
+        """
+        Look up a result, counting the hit or miss against ``name``.
+
+        Returns:
+            Tuple of (found, value)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= time.monotonic():
+                self._discard(key)
+                self._counters["expirations"] += 1
+                entry = None
+
+            outcome = "hits" if entry is not None else "misses"
+            self._counters[outcome] += 1
+            self._by_function[name][outcome] += 1
+            if entry is None:
+                return False, None
+
+            self._entries.move_to_end(key)
+            return True, entry[0]
+
+    def generation(self, tables: Iterable[str]) -> int:
+        """Token that changes whenever any of ``tables`` is invalidated."""
+        with self._lock:
+            return sum(self._generations.get(table_name, 0) for table_name in set(tables))
+
+    def set(self, key: Hashable, value: Any, tables: Iterable[str], ttl: float, size: int = 0,
+            generation: Optional[int] = None) -> None:
+        """
+        Store a result of ``size`` bytes that depends on ``tables`` for ``ttl`` seconds.
+
+        If ``generation`` is given and any of ``tables`` has been invalidated
+        since it was read, the result may predate the write and isn't stored.
+        """
+        tables = frozenset(tables)
+        with self._lock:
+            if generation is not None and self.generation(tables) != generation:
+                self._counters["stale"] += 1
+                return
+            self._discard(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                self._counters["oversized"] += 1
+                return
+            self._entries[key] = (value, time.monotonic() + ttl, tables, size)
+            self._bytes += size
+            for table_name in tables:
+                self._by_table[table_name].add(key)
+            while self._over_limit():
+                self._discard(next(iter(self._entries)))
+                self._counters["evictions"] += 1
+
+    def invalidate_tables(self, tables: Iterable[str]) -> int:
+        """
+        Drop every entry that depends on any of the given tables.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            tables = set(tables)
+            for table_name in tables:
+                self._generations[table_name] += 1
+            keys = set().union(*(self._by_table.get(table_name, ()) for table_name in tables))
+            for key in keys:
+                self._discard(key)
+            self._counters["invalidations"] += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Remove all entries and reset the metrics."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._by_table.clear()
+            self._counters.clear()
+            self._by_function.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and size, hit/miss/eviction/invalidation/stale counters and per-function hits and misses."""
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._counters["hits"],
+                "misses": self._counters["misses"],
+                "hit_rate": round(self._counters["hits"] / lookups, 4) if lookups else 0.0,
+                "evictions": self._counters["evictions"],
+                "expirations": self._counters["expirations"],
+                "invalidations": self._counters["invalidations"],
+                "oversized": self._counters["oversized"],
+                "stale": self._counters["stale"],
+                "functions": {name: dict(counts) for name, counts in self._by_function.items()},
+            }
+
+    def _over_limit(self) -> bool:
+        if self.max_entries is not None and len(self._entries) > max(self.max_entries, 1):
+            return True
+        return self.max_bytes is not None and self._bytes > self.max_bytes
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry[3]
+        for table_name in entry[2]:
+            keys = self._by_table.get(table_name)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table_name]
+
+
+analytics_cache = AnalyticsCache()
+
+# Callbacks run with the set of written table names after each commit
+_write_listeners: List[Callable[[Set[str]], None]] = []
+
+
+def on_tables_written(callback: Callable[[Set[str]], None]) -> None:
+    """Register a callback to run with the names of the tables each commit wrote to."""
+    if callback not in _write_listeners:
+        _write_listeners.append(callback)
+
+
+def cached_analytics(tables: Tables, ttl: Optional[float] = None):
+    """
+    Cache a service method's result until one of ``tables`` is written or ``ttl`` expires.
+
+    Results are keyed by database, service class, method and arguments, and
+    copied on the way in and out so callers can't mutate the cached value.
+    A result computed while one of ``tables`` was written is returned but
+    not cached. Methods called with unhashable arguments, outside an app context or with
+    ``ANALYTICS_CACHE_ENABLED`` off are run uncached.
+
+    Args:
+        tables: Names of the tables the result is computed from, or a callable
+            taking the service instance and returning them
+        ttl: Seconds before the entry expires, defaults to ``ANALYTICS_CACHE_TTL``
+
+    Returns:
+        Decorator for service methods
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not has_app_context() or not current_app.config.get("ANALYTICS_CACHE_ENABLED", True):
+                return method(self, *args, **kwargs)
+
+            engine = db.engine
+            name = f"{type(self).__name__}.{method.__name__}"
+            key = (id(engine), str(engine.url), type(self).__module__, name, args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                return method(self, *args, **kwargs)
+
+            analytics_cache.max_entries = current_app.config.get("ANALYTICS_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)
+            found, value = analytics_cache.get(key, name)
+            if found:
+                return copy.deepcopy(value)
+
+            depends_on = frozenset(tables(self) if callable(tables) else tables)
+            generation = analytics_cache.generation(depends_on)
+            value = method(self, *args, **kwargs)
+            expires_in = ttl if ttl is not None else current_app.config.get("ANALYTICS_CACHE_TTL", DEFAULT_TTL)
+            analytics_cache.set(key, copy.deepcopy(value), depends_on, expires_in, generation=generation)
+            return value
+
+        wrapper.cache_tables = tables
+        return wrapper
+
+    return decorator
+
+
+# -- Write tracking ------------------------------------------------------------
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_written_tables(session, flush_context):
+    """Remember which tables this transaction's flushes wrote to."""
+    written = session.info.setdefault(_SESSION_TABLES_KEY, set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        written.update(table.name for table in inspect(obj).mapper.tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_writes(orm_execute_state):
+    """Bulk ORM insert/update/delete statements bypass the flush."""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None and getattr(table, "name", None):
+            orm_execute_state.session.info.setdefault(_SESSION_TABLES_KEY, set()).add(table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_written_tables(session):
+    written = session.info.pop(_SESSION_TABLES_KEY, None)
+    if written:
+        removed = analytics_cache.invalidate_tables(written)
+        if removed:
+            logger.debug(f"Analytics cache: invalidated {removed} entries after writes to {', '.join(sorted(written))}")
+        for callback in list(_write_listeners):
+            try:
+                callback(written)
+            except Exception:
+                logger.exception("Analytics cache: write listener failed")
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_written_tables(session, previous_transaction):
+    session.info.pop(_SESSION_TABLES_KEY, None)
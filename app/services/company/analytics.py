@@ -1,11 +1,22 @@
 # app/services/company/analytics.py
 
-from datetime import datetime
 from sqlalchemy import func
 from app.models.pages.company import Company
+from app.models.pages.opportunity import Opportunity
 from app.models.base import db
+from app.services.analytics import EngagementSegmentation, monthly_growth, percentage
+from app.services.analytics_cache import cached_analytics
 from app.services.service_base import ServiceBase
 
+COMPANY_TABLES = ["companies", "opportunities", "contacts", "company_capabilities"]
+
+# Engagement segments by a company's opportunity count
+ENGAGEMENT_SEGMENTS = {
+    "High Engagement": lambda opportunities: opportunities > 2,
+    "Medium Engagement": lambda opportunities: opportunities.between(1, 2),
+    "No Opportunities": lambda opportunities: opportunities == 0,
+}
+
 
 class CompanyAnalyticsService(ServiceBase):
     """Service for company analytics and statistics."""
@@ -18,15 +29,37 @@ class CompanyAnalyticsService(ServiceBase):
         """Get the total number of companies."""
         return Company.query.count()
 
+    @cached_analytics(COMPANY_TABLES)
+    def get_engagement_counts(self):
+        """
+        Count companies by their opportunities, contacts and capabilities in one query.
+
+        Returns:
+            Dictionary with total, with_opportunities, with_contacts,
+            with_capabilities, no_engagement (neither opportunities nor
+            contacts) and the high/medium/no engagement segment counts
+        """
+        segmentation = EngagementSegmentation(Company)
+        opportunities = segmentation.related_count(Opportunity.company_id)
+        has_contacts = segmentation.has(Company.contacts)
+        return segmentation.counts(
+            {
+                "with_opportunities": opportunities > 0,
+                "with_contacts": has_contacts,
+                "with_capabilities": segmentation.has(Company.company_capabilities),
+                "no_engagement": db.and_(opportunities == 0, ~has_contacts),
+                **{name: condition(opportunities) for name, condition in ENGAGEMENT_SEGMENTS.items()},
+            }
+        )
+
     def get_dashboard_statistics(self):
         """Get statistics for the companies dashboard."""
-        total_companies = self.get_total_companies()
-
+        counts = self.get_engagement_counts()
         return {
-            "total_companies": total_companies,
-            "with_opportunities": db.session.query(Company).filter(Company.opportunities.any()).count(),
-            "with_contacts": db.session.query(Company).filter(Company.contacts.any()).count(),
-            "with_capabilities": db.session.query(Company).filter(Company.company_capabilities.any()).count(),
+            "total_companies": counts["total"],
+            "with_opportunities": counts["with_opportunities"],
+            "with_contacts": counts["with_contacts"],
+            "with_capabilities": counts["with_capabilities"],
         }
 
     def get_top_companies(self, limit=5):
@@ -41,122 +74,25 @@ class CompanyAnalyticsService(ServiceBase):
         )
 
     def get_engagement_segments(self):
-        """Get company segments by engagement level."""
-        total_companies = self.get_total_companies()
-
-        # High engagement (>2 opportunities)
-        high_engagement_count = (
-            db.session.query(Company).join(Company.opportunities).group_by(Company.id).having(func.count(Company.opportunities) > 2).count()
-        )
-
-        # Medium engagement (1-2 opportunities)
-        medium_engagement_count = (
-            db.session.query(Company)
-            .join(Company.opportunities)
-            .group_by(Company.id)
-            .having(func.count(Company.opportunities).between(1, 2))
-            .count()
-        )
-
-        # No opportunities
-        no_opportunities_count = (
-            db.session.query(Company)
-            .outerjoin(Company.opportunities)
-            .group_by(Company.id)
-            .having(func.count(Company.opportunities) == 0)
-            .count()
-        )
-
+        """Get company segments by engagement level (number of opportunities)."""
+        counts = self.get_engagement_counts()
         return [
-            {
-                "name": "High Engagement",
-                "count": high_engagement_count,
-                "percentage": self._calculate_percentage(high_engagement_count, total_companies),
-            },
-            {
-                "name": "Medium Engagement",
-                "count": medium_engagement_count,
-                "percentage": self._calculate_percentage(medium_engagement_count, total_companies),
-            },
-            {
-                "name": "No Opportunities",
-                "count": no_opportunities_count,
-                "percentage": self._calculate_percentage(no_opportunities_count, total_companies),
-            },
+            {"name": name, "count": counts[name], "percentage": percentage(counts[name], counts["total"])}
+            for name in ENGAGEMENT_SEGMENTS
         ]
 
+    @cached_analytics(["companies"])
     def prepare_growth_data(self, months_back=6):
         """Prepare growth data for the chart."""
-        months = []
-        new_companies = []
-        total_companies = []
-
-        current_month = datetime.now().month
-        current_year = datetime.now().year
-
-        for i in range(months_back):
-            month = (current_month - i) % 12
-            if month == 0:
-                month = 12
-            year = current_year - ((current_month - i) // 12)
-
-            # Month name for label
-            month_name = datetime(year, month, 1).strftime("%b %Y")
-
-            # Start of month date
-            start_date = datetime(year, month, 1)
-
-            # End of month date - first day of next month
-            next_month = month + 1 if month < 12 else 1
-            next_year = year if month < 12 else year + 1
-            end_date = datetime(next_year, next_month, 1)
-
-            # New companies in this month
-            new_in_month = Company.query.filter(Company.created_at >= start_date, Company.created_at < end_date).count()
-
-            # Total companies at end of month
-            total_at_month_end = Company.query.filter(Company.created_at < end_date).count()
-
-            months.append(month_name)
-            new_companies.append(new_in_month)
-            total_companies.append(total_at_month_end)
-
-        # Reverse lists to display chronologically
-        months.reverse()
-        new_companies.reverse()
-        total_companies.reverse()
-
-        return {"labels": months, "new_companies": new_companies, "total_companies": total_companies}
+        series = monthly_growth(Company.created_at, months_back)
+        return {"labels": series["labels"], "new_companies": series["new"], "total_companies": series["total"]}
 
     def get_statistics(self):
         """Get comprehensive statistics for the statistics page."""
-        total_companies = self.get_total_companies()
-
-        # Companies with opportunities
-        with_opportunities = db.session.query(Company).filter(Company.opportunities.any()).count()
-
-        # Companies with contacts
-        with_contacts = db.session.query(Company).filter(Company.contacts.any()).count()
-
-        # Companies with no engagement
-        no_engagement = (
-            db.session.query(Company)
-            .outerjoin(Company.opportunities)
-            .outerjoin(Company.contacts)
-            .group_by(Company.id)
-            .having(func.count(Company.opportunities) == 0, func.count(Company.contacts) == 0)
-            .count()
-        )
-
+        counts = self.get_engagement_counts()
         return {
-            "total_companies": total_companies,
-            "with_opportunities": with_opportunities,
-            "with_contacts": with_contacts,
-            "no_engagement": no_engagement,
+            "total_companies": counts["total"],
+            "with_opportunities": counts["with_opportunities"],
+            "with_contacts": counts["with_contacts"],
+            "no_engagement": counts["no_engagement"],
         }
-
-    def _calculate_percentage(self, count, total):
-        """Calculate percentage with safety check for division by zero."""
-        if total == 0:
-            return 0
-        return round((count / total) * 100)
@@ -1,38 +1,42 @@
-from app.services.service_base import BaseFeatureService
+from app.services.analytics_cache import cached_analytics
+from app.services.company.analytics import COMPANY_TABLES, CompanyAnalyticsService
+from app.services.service_base import BaseFeatureService, ServiceRegistry
 from app.models.pages.company import Company
 
 
 class CompanyService(BaseFeatureService):
     def __init__(self):
         super().__init__(Company)
+        self.analytics = ServiceRegistry.get(CompanyAnalyticsService)
 
+    @cached_analytics(COMPANY_TABLES)
     def get_dashboard_statistics(self):
         """Get company dashboard statistics."""
-        stats = super().get_dashboard_statistics()
-        stats.update({
-            "total_companies": Company.query.count(),
-            "with_opportunities": self.count_with_opportunities(),
-            "with_contacts": self.count_with_contacts()
-        })
-        return stats
+        counts = self.analytics.get_engagement_counts()
+        return {
+            "total_count": counts["total"],
+            "total_companies": counts["total"],
+            "with_opportunities": counts["with_opportunities"],
+            "with_contacts": counts["with_contacts"]
+        }
 
     def count_with_opportunities(self):
         """Count companies with opportunities."""
-        return Company.query.filter(Company.opportunities.any()).count()
+        return self.analytics.get_engagement_counts()["with_opportunities"]
 
     def count_with_contacts(self):
         """Count companies with contacts."""
-        return Company.query.filter(Company.contacts.any()).count()
+        return self.analytics.get_engagement_counts()["with_contacts"]
 
+    @cached_analytics(COMPANY_TABLES)
     def get_statistics(self):
         """Get company statistics."""
-        return {
-            "total_companies": Company.query.count(),
-            "with_opportunities": self.count_with_opportunities(),
-            "with_contacts": self.count_with_contacts(),
-            "no_engagement": self.count_no_engagement()
-        }
+        return self.analytics.get_statistics()
 
     def count_no_engagement(self):
         """Count companies with no engagement."""
-        return Company.query.filter(~Company.opportunities.any(), ~Company.contacts.any()).count()
\ No newline at end of file
+        return self.analytics.get_engagement_counts()["no_engagement"]
+
+    def get_engagement_segments(self):
+        """Get company segments by engagement level."""
+        return self.analytics.get_engagement_segments()
\ No newline at end of file
@@ -1,2 +1,3 @@
 # app/services/contact/__init__.py
-from app.services.contact.core import ContactService
\ No newline at end of file
+from app.services.contact.core import ContactService
+from app.services.contact.loader import ContactGraphLoader
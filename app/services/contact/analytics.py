@@ -1,10 +1,14 @@
 # app/services/contact/analytics.py
-from datetime import datetime
 from sqlalchemy import func
 from app.models.pages.contact import Contact
 from app.models.base import db
+from app.services.analytics import EngagementSegmentation, monthly_growth, segment_counts
+from app.services.analytics_cache import cached_analytics
 from app.services.service_base import ServiceBase
 
+CONTACT_TABLES = ["contacts", "relationships"]
+SKILL_SEGMENTS = {level: level for level in ("Expert", "Advanced", "Intermediate", "Beginner")}
+
 
 class ContactAnalyticsService(ServiceBase):
     """Service for contact analytics and statistics."""
@@ -17,15 +21,34 @@ class ContactAnalyticsService(ServiceBase):
         """Get the total number of contacts."""
         return Contact.query.count()
 
+    @cached_analytics(CONTACT_TABLES)
+    def get_engagement_counts(self):
+        """
+        Count contacts by their opportunities, company and skills in one query.
+
+        Returns:
+            Dictionary with total, with_opportunities, with_companies,
+            with_skills and no_engagement (no opportunities) counts
+        """
+        segmentation = EngagementSegmentation(Contact)
+        has_opportunities = segmentation.has(Contact.opportunity_relationships)
+        return segmentation.counts(
+            {
+                "with_opportunities": has_opportunities,
+                "with_companies": Contact.company_id.isnot(None),
+                "with_skills": Contact.skill_level.isnot(None),
+                "no_engagement": ~has_opportunities,
+            }
+        )
+
     def get_dashboard_statistics(self):
         """Get statistics for the contacts dashboard."""
-        total_contacts = self.get_total_contacts()
-
+        counts = self.get_engagement_counts()
         return {
-            "total_contacts": total_contacts,
-            "with_opportunities": db.session.query(Contact).filter(Contact.opportunity_relationships.any()).count(),
-            "with_companies": db.session.query(Contact).filter(Contact.company_id.isnot(None)).count(),
-            "with_skills": db.session.query(Contact).filter(Contact.skill_level.isnot(None)).count(),
+            "total_contacts": counts["total"],
+            "with_opportunities": counts["with_opportunities"],
+            "with_companies": counts["with_companies"],
+            "with_skills": counts["with_skills"],
         }
 
     def get_top_contacts(self, limit=5):
@@ -39,95 +62,16 @@ class ContactAnalyticsService(ServiceBase):
             .all()
         )
 
+    @cached_analytics(["contacts"])
     def get_skill_segments(self):
-        """Get contact segments by skill level."""
-        total_contacts = self.get_total_contacts()
-
-        # Expert level
-        expert_count = (
-            db.session.query(Contact).filter(Contact.skill_level == "Expert").count()
-        )
-
-        # Advanced level
-        advanced_count = (
-            db.session.query(Contact).filter(Contact.skill_level == "Advanced").count()
-        )
-
-        # Intermediate level
-        intermediate_count = (
-            db.session.query(Contact).filter(Contact.skill_level == "Intermediate").count()
-        )
-
-        # Beginner level
-        beginner_count = (
-            db.session.query(Contact).filter(Contact.skill_level == "Beginner").count()
-        )
-
-        return [
-            {
-                "name": "Expert",
-                "count": expert_count,
-                "percentage": self._calculate_percentage(expert_count, total_contacts),
-            },
-            {
-                "name": "Advanced",
-                "count": advanced_count,
-                "percentage": self._calculate_percentage(advanced_count, total_contacts),
-            },
-            {
-                "name": "Intermediate",
-                "count": intermediate_count,
-                "percentage": self._calculate_percentage(intermediate_count, total_contacts),
-            },
-            {
-                "name": "Beginner",
-                "count": beginner_count,
-                "percentage": self._calculate_percentage(beginner_count, total_contacts),
-            },
-        ]
+        """Get contact segments by skill level, including unknown and unset levels."""
+        return segment_counts(Contact, Contact.skill_level, SKILL_SEGMENTS)
 
+    @cached_analytics(["contacts"])
     def prepare_growth_data(self, months_back=6):
         """Prepare growth data for the chart."""
-        months = []
-        new_contacts = []
-        total_contacts = []
-
-        current_month = datetime.now().month
-        current_year = datetime.now().year
-
-        for i in range(months_back):
-            month = (current_month - i) % 12
-            if month == 0:
-                month = 12
-            year = current_year - ((current_month - i) // 12)
-
-            # Month name for label
-            month_name = datetime(year, month, 1).strftime("%b %Y")
-
-            # Start of month date
-            start_date = datetime(year, month, 1)
-
-            # End of month date - first day of next month
-            next_month = month + 1 if month < 12 else 1
-            next_year = year if month < 12 else year + 1
-            end_date = datetime(next_year, next_month, 1)
-
-            # New contacts in this month
-            new_in_month = Contact.query.filter(Contact.created_at >= start_date, Contact.created_at < end_date).count()
-
-            # Total contacts at end of month
-            total_at_month_end = Contact.query.filter(Contact.created_at < end_date).count()
-
-            months.append(month_name)
-            new_contacts.append(new_in_month)
-            total_contacts.append(total_at_month_end)
-
-        # Reverse lists to display chronologically
-        months.reverse()
-        new_contacts.reverse()
-        total_contacts.reverse()
-
-        return {"labels": months, "new_contacts": new_contacts, "total_contacts": total_contacts}
+        series = monthly_growth(Contact.created_at, months_back)
+        return {"labels": series["labels"], "new_contacts": series["new"], "total_contacts": series["total"]}
 
     def get_skill_distribution(self):
         """Get distribution of contacts by skill level."""
@@ -144,30 +88,11 @@ class ContactAnalyticsService(ServiceBase):
 
     def get_statistics(self):
         """Get comprehensive statistics for the statistics page."""
-        total_contacts = self.get_total_contacts()
-
-        # Contacts with opportunities
-        with_opportunities = db.session.query(Contact).filter(Contact.opportunity_relationships.any()).count()
-
-        # Contacts with companies
-        with_companies = db.session.query(Contact).filter(Contact.company_id.isnot(None)).count()
-
-        # Contacts with skills
-        with_skills = db.session.query(Contact).filter(Contact.skill_level.isnot(None)).count()
-
-        # Contacts with no engagement
-        no_engagement = db.session.query(Contact).filter(~Contact.opportunity_relationships.any()).count()
-
+        counts = self.get_engagement_counts()
         return {
-            "total_contacts": total_contacts,
-            "with_opportunities": with_opportunities,
-            "with_companies": with_companies,
-            "with_skills": with_skills,
-            "no_engagement": no_engagement,
-        }
-
-    def _calculate_percentage(self, count, total):
-        """Calculate percentage with safety check for division by zero."""
-        if total == 0:
-            return 0
-        return round((count / total) * 100)
\ No newline at end of file
+            "total_contacts": counts["total"],
+            "with_opportunities": counts["with_opportunities"],
+            "with_companies": counts["with_companies"],
+            "with_skills": counts["with_skills"],
+            "no_engagement": counts["no_engagement"],
+        }
\ No newline at end of file
@@ -1,47 +1,46 @@
 # app/services/contact/core.py
-from app.services.service_base import BaseFeatureService
+from app.services.analytics_cache import cached_analytics
+from app.services.contact.analytics import CONTACT_TABLES, ContactAnalyticsService
+from app.services.service_base import BaseFeatureService, ServiceRegistry
 from app.models.pages.contact import Contact
 
 
 class ContactService(BaseFeatureService):
     def __init__(self):
         super().__init__(Contact)
+        self.analytics = ServiceRegistry.get(ContactAnalyticsService)
 
+    @cached_analytics(CONTACT_TABLES)
     def get_dashboard_statistics(self):
         """Get contact dashboard statistics."""
-        stats = super().get_dashboard_statistics()
-        stats.update({
-            "total_contacts": Contact.query.count(),
-            "with_opportunities": self.count_with_opportunities(),
-            "with_companies": self.count_with_companies()
-        })
-        return stats
+        counts = self.analytics.get_engagement_counts()
+        return {
+            "total_count": counts["total"],
+            "total_contacts": counts["total"],
+            "with_opportunities": counts["with_opportunities"],
+            "with_companies": counts["with_companies"]
+        }
 
     def count_with_opportunities(self):
         """Count contacts with opportunities."""
-        return Contact.query.filter(Contact.opportunity_relationships.any()).count()
+        return self.analytics.get_engagement_counts()["with_opportunities"]
 
     def count_with_companies(self):
         """Count contacts with companies."""
-        return Contact.query.filter(Contact.company_id.isnot(None)).count()
+        return self.analytics.get_engagement_counts()["with_companies"]
 
     def count_with_skills(self):
         """Count contacts with skills."""
-        return Contact.query.filter(Contact.skill_level.isnot(None)).count()
+        return self.analytics.get_engagement_counts()["with_skills"]
 
+    @cached_analytics(CONTACT_TABLES)
     def get_statistics(self):
         """Get contact statistics."""
-        return {
-            "total_contacts": Contact.query.count(),
-            "with_opportunities": self.count_with_opportunities(),
-            "with_companies": self.count_with_companies(),
-            "with_skills": self.count_with_skills(),
-            "no_engagement": self.count_no_engagement()
-        }
+        return self.analytics.get_statistics()
 
     def count_no_engagement(self):
         """Count contacts with no engagement."""
-        return Contact.query.filter(~Contact.opportunity_relationships.any()).count()
+        return self.analytics.get_engagement_counts()["no_engagement"]
 
     def get_filtered_contacts(self, has_opportunities=None, has_company=None, skill_level=None):
         """Get contacts based on filter criteria."""
@@ -0,0 +1,161 @@
+# app/services/contact/loader.py
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.base import db
+from app.models.pages.contact import Contact
+from app.models.pages.opportunity import Opportunity
+from app.models.pages.user import User
+from app.models.relationship import Relationship
+from app.utils.app_logging import get_logger
+
+logger = get_logger()
+
+MANAGER = "manager"
+
+
+class ContactGraphLoader:
+    """Batch loader for the relationship-backed collections on contacts and opportunities.
+
+    ``Contact.managers``, ``Contact.direct_reports``, ``Contact.opportunities`` and
+    ``Opportunity.contacts`` each query the relationships table per instance.
+    Priming a list resolves them for every instance in a fixed number of
+    queries and caches the results on the instances for the rest of the request.
+    The ``opportunity_relationships`` / ``contact_relationships`` link
+    collections serialized by ``to_dict`` are filled in from the same query.
+    """
+
+    @classmethod
+    def prime_list(cls, items: Iterable[Any]) -> List[Any]:
+        """
+        Prime a page of list results if they are contacts or opportunities.
+
+        Args:
+            items: Records of any single model
+
+        Returns:
+            The items, in the order given
+        """
+        items = list(items)
+        item_types = {type(item) for item in items}
+        if item_types == {Contact}:
+            return cls.prime(items)
+        if item_types == {Opportunity}:
+            return cls.prime_opportunities(items)
+        return items
+
+    @classmethod
+    def prime(cls, contacts: Iterable[Contact]) -> List[Contact]:
+        """
+        Resolve managers, direct reports and opportunities for a list of contacts.
+
+        Uses one relationships query plus one IN query each for the related
+        users, contacts and opportunities.
+
+        Args:
+            contacts: Contacts to prime
+
+        Returns:
+            The contacts, in the order given
+        """
+        contacts = list(contacts)
+        ids = {contact.id for contact in contacts if contact.id is not None}
+        if not ids:
+            return contacts
+
+        relationships = Relationship.query.filter(
+            db.or_(
+                db.and_(Relationship.relationship_type == MANAGER, Relationship.entity2_type == "contact", Relationship.entity2_id.in_(ids)),
+                db.and_(Relationship.relationship_type == MANAGER, Relationship.entity1_type == "contact", Relationship.entity1_id.in_(ids)),
+                db.and_(Relationship.entity1_type == "contact", Relationship.entity1_id.in_(ids), Relationship.entity2_type == "opportunity"),
+                db.and_(Relationship.entity2_type == "contact", Relationship.entity2_id.in_(ids), Relationship.entity1_type == "opportunity"),
+            )
+        ).order_by(Relationship.id).all()
+
+        managers: Dict[int, List[Tuple[str, int]]] = defaultdict(list)
+        reports: Dict[int, List[Tuple[str, int]]] = defaultdict(list)
+        opportunity_ids: Dict[int, List[int]] = defaultdict(list)
+        opportunity_links: Dict[int, List[Relationship]] = defaultdict(list)
+        wanted: Dict[str, set] = defaultdict(set)
+
+        for rel in relationships:
+            if rel.entity1_type == "opportunity" and rel.entity2_type == "contact":
+                opportunity_ids[rel.entity2_id].append(rel.entity1_id)
+                opportunity_links[rel.entity2_id].append(rel)
+                wanted["opportunity"].add(rel.entity1_id)
+            elif rel.entity1_type == "contact" and rel.entity2_type == "opportunity":
+                opportunity_ids[rel.entity1_id].append(rel.entity2_id)
+                opportunity_links[rel.entity1_id].append(rel)
+                wanted["opportunity"].add(rel.entity2_id)
+
+            if rel.relationship_type != MANAGER:
+                continue
+            if rel.entity2_type == "contact" and rel.entity2_id in ids and rel.entity1_type in ("user", "contact"):
+                managers[rel.entity2_id].append((rel.entity1_type, rel.entity1_id))
+                wanted[rel.entity1_type].add(rel.entity1_id)
+            if rel.entity1_type == "contact" and rel.entity1_id in ids and rel.entity2_type in ("user", "contact"):
+                reports[rel.entity1_id].append((rel.entity2_type, rel.entity2_id))
+                wanted[rel.entity2_type].add(rel.entity2_id)
+
+        # Contacts already in the list don't need to be fetched again
+        entities = {("contact", contact.id): contact for contact in contacts}
+        wanted["contact"] -= ids
+        for entity_type, model in (("user", User), ("contact", Contact), ("opportunity", Opportunity)):
+            if wanted[entity_type]:
+                for entity in model.query.filter(model.id.in_(wanted[entity_type])).all():
+                    entities[(entity_type, entity.id)] = entity
+
+        for contact in contacts:
+            # Populate the link collection so BaseModel.to_dict doesn't lazy-load it
+            if "opportunity_relationships" not in contact.__dict__:
+                set_committed_value(contact, "opportunity_relationships", opportunity_links[contact.id])
+            contact.set_primed("managers", [entities[key] for key in managers[contact.id] if key in entities])
+            contact.set_primed("direct_reports", [entities[key] for key in reports[contact.id] if key in entities])
+            opportunities = {opp_id: entities[("opportunity", opp_id)] for opp_id in opportunity_ids[contact.id] if ("opportunity", opp_id) in entities}
+            contact.set_primed("opportunities", [opportunities[opp_id] for opp_id in sorted(opportunities)])
+
+        logger.info(f"ContactGraphLoader: Primed {len(contacts)} contacts from {len(relationships)} relationships")
+        return contacts
+
+    @classmethod
+    def prime_opportunities(cls, opportunities: Iterable[Opportunity]) -> List[Opportunity]:
+        """
+        Resolve ``Opportunity.contacts`` (and ``contact_relationships``) for a list of opportunities in two queries.
+
+        Args:
+            opportunities: Opportunities to prime
+
+        Returns:
+            The opportunities, in the order given
+        """
+        opportunities = list(opportunities)
+        ids = {opportunity.id for opportunity in opportunities if opportunity.id is not None}
+        if not ids:
+            return opportunities
+
+        relationships = Relationship.query.filter(
+            db.or_(
+                db.and_(Relationship.entity1_type == "opportunity", Relationship.entity1_id.in_(ids), Relationship.entity2_type == "contact"),
+                db.and_(Relationship.entity2_type == "opportunity", Relationship.entity2_id.in_(ids), Relationship.entity1_type == "contact"),
+            )
+        ).order_by(Relationship.id).all()
+
+        contact_ids: Dict[int, set] = defaultdict(set)
+        contact_links: Dict[int, List[Relationship]] = defaultdict(list)
+        for rel in relationships:
+            opportunity_id, contact_id = (rel.entity1_id, rel.entity2_id) if rel.entity1_type == "opportunity" else (rel.entity2_id, rel.entity1_id)
+            contact_ids[opportunity_id].add(contact_id)
+            contact_links[opportunity_id].append(rel)
+
+        all_contact_ids = set().union(*contact_ids.values()) if contact_ids else set()
+        contacts = {c.id: c for c in Contact.query.filter(Contact.id.in_(all_contact_ids)).all()} if all_contact_ids else {}
+
+        for opportunity in opportunities:
+            if "contact_relationships" not in opportunity.__dict__:
+                set_committed_value(opportunity, "contact_relationships", contact_links[opportunity.id])
+            opportunity.set_primed("contacts", [contacts[cid] for cid in sorted(contact_ids[opportunity.id]) if cid in contacts])
+
+        logger.info(f"ContactGraphLoader: Primed {len(opportunities)} opportunities from {len(relationships)} relationships")
+        return opportunities
@@ -1,41 +1,204 @@
 # app/services/crisp/analytics.py
-from app.models import Crisp, Relationship, db
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import Integer, case, cast, func, literal, or_
+from sqlalchemy.orm import contains_eager
+
+from app.models import Crisp, CrispRollup, db
+from app.models.pages.crisp import ROLLUP_ALL, crisp_total_expression
+from app.services.analytics_cache import cached_analytics
 from app.services.service_base import ServiceBase
 
+# Detail charts are downsampled to at most this many points
+HISTORY_POINTS = 200
+
+CRISP_TABLES = ["crisp", "crisp_rollups"]
+
 
 class CrispAnalyticsService(ServiceBase):
     def get_recent_scores(self, limit=10):
-        recent_scores = db.session.query(Crisp).order_by(Crisp.created_at.desc()).limit(limit).all()
+        recent_scores, _ = self.get_scores_page(limit=limit)
+        return recent_scores
 
-        for score in recent_scores:
-            relationship = Relationship.query.get(score.relationship_id)
-            score.relationship_display_name = self.get_relationship_display_name(relationship)
+    @staticmethod
+    def encode_cursor(score):
+        """Keyset cursor pointing just past a score in newest-first order."""
+        return f"{score.created_at.isoformat()}_{score.id}"
 
-        return recent_scores
+    @staticmethod
+    def decode_cursor(cursor):
+        """Parse a cursor from encode_cursor into (created_at, id), or None if malformed."""
+        try:
+            created_at, score_id = cursor.rsplit("_", 1)
+            return datetime.fromisoformat(created_at), int(score_id)
+        except (AttributeError, ValueError):
+            return None
+
+    def get_scores_page(self, after=None, limit=25):
+        """
+        Keyset-paginated scores, newest first, with relationships joined and named.
+
+        Args:
+            after: Cursor returned with the previous page
+            limit: Page size
+
+        Returns:
+            Tuple of (scores, cursor for the next page or None)
+        """
+        query = (
+            db.session.query(Crisp)
+            .join(Crisp.relationship)
+            .options(contains_eager(Crisp.relationship))
+            .order_by(Crisp.created_at.desc(), Crisp.id.desc())
+        )
+
+        position = self.decode_cursor(after) if after else None
+        if position:
+            created_at, score_id = position
+            query = query.filter(
+                or_(Crisp.created_at < created_at, (Crisp.created_at == created_at) & (Crisp.id < score_id))
+            )
+
+        rows = query.limit(limit + 1).all()
+        scores = rows[:limit]
+
+        names = self.get_relationship_display_names([score.relationship for score in scores])
+        for score in scores:
+            score.relationship_display_name = names[score.relationship_id]
+
+        next_cursor = self.encode_cursor(scores[-1]) if scores and len(rows) > limit else None
+        return scores, next_cursor
+
+    def get_score_history(self, relationship_id, max_points=HISTORY_POINTS):
+        """
+        Assessment history for a relationship, oldest first, downsampled for charting.
+
+        Relationships with more than ``max_points`` assessments are split into
+        ``max_points`` consecutive buckets (NTILE) and each bucket is averaged in SQL.
+
+        Args:
+            relationship_id: Relationship to chart
+            max_points: Maximum number of points to return
+
+        Returns:
+            List of dicts with created_at, total_score and the four components
+        """
+        fields = ("total_score", "credibility", "reliability", "intimacy", "self_orientation")
+        base = db.session.query(Crisp).filter(Crisp.relationship_id == relationship_id)
+
+        if base.count() <= max_points:
+            return [
+                {"created_at": score.created_at, **{field: getattr(score, field) for field in fields}}
+                for score in base.order_by(Crisp.created_at, Crisp.id).all()
+            ]
+
+        self.logger.info(f"CrispAnalyticsService: Downsampling history for relationship {relationship_id} to {max_points} points")
+        bucketed = (
+            db.session.query(
+                Crisp.created_at,
+                *(getattr(Crisp, field) for field in fields),
+                func.ntile(max_points).over(order_by=(Crisp.created_at, Crisp.id)).label("bucket"),
+            )
+            .filter(Crisp.relationship_id == relationship_id)
+            .subquery()
+        )
+        rows = (
+            db.session.query(
+                func.min(bucketed.c.created_at),
+                *(func.avg(bucketed.c[field]) for field in fields),
+            )
+            .group_by(bucketed.c.bucket)
+            .order_by(bucketed.c.bucket)
+            .all()
+        )
+        return [
+            {"created_at": self._as_datetime(created_at), **dict(zip(fields, averages))}
+            for created_at, *averages in rows
+        ]
+
+    @staticmethod
+    def _as_datetime(value):
+        # Aggregates over DateTime columns come back as strings on SQLite
+        return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+    def get_relationship_display_names(self, relationships):
+        """
+        Display names for relationships, resolving both endpoints with one query per entity type.
+
+        Args:
+            relationships: Relationship instances
+
+        Returns:
+            Dict of relationship id to "Name - Name" display name
+        """
+        from app.services.relationship import RelationshipService
+        from app.services.service_base import ServiceRegistry
+
+        entity_models = ServiceRegistry.get(RelationshipService).ENTITY_MODELS
+        relationships = [rel for rel in relationships if rel is not None]
 
+        ids_by_type = defaultdict(set)
+        for rel in relationships:
+            ids_by_type[rel.entity1_type].add(rel.entity1_id)
+            ids_by_type[rel.entity2_type].add(rel.entity2_id)
+
+        entities = {}
+        for entity_type, ids in ids_by_type.items():
+            model = entity_models.get(entity_type)
+            if model:
+                entities.update({(entity_type, entity.id): entity for entity in model.query.filter(model.id.in_(ids))})
+
+        def name(entity_type, entity_id):
+            entity = entities.get((entity_type, entity_id))
+            if entity is None:
+                return f"{entity_type.capitalize()} {entity_id}"
+            return getattr(entity, "name", None) or getattr(entity, "full_name", None) or str(entity)
+
+        return {
+            rel.id: f"{name(rel.entity1_type, rel.entity1_id)} - {name(rel.entity2_type, rel.entity2_id)}"
+            for rel in relationships
+        }
+
+    @cached_analytics(CRISP_TABLES)
     def get_score_statistics(self):
-        all_scores = Crisp.query.all()
-        total_assessments = len(all_scores)
+        """
+        Dashboard statistics for all CRISP assessments.
+
+        Averages come from the precomputed ``("all", 0)`` rollup; trust counts
+        and the histogram from one conditional-aggregation query.
+
+        Returns:
+            Dict of averages, trust counts, total and the 5-bucket score distribution
+        """
+        rollup = CrispRollup.lookup(ROLLUP_ALL)
+        total_assessments = rollup.count if rollup else 0
 
         if total_assessments > 0:
-            avg_credibility = sum(score.credibility for score in all_scores) / total_assessments
-            avg_reliability = sum(score.reliability for score in all_scores) / total_assessments
-            avg_intimacy = sum(score.intimacy for score in all_scores) / total_assessments
-            avg_self_orientation = sum(score.self_orientation for score in all_scores) / total_assessments
-            avg_score = sum(score.total_score for score in all_scores) / total_assessments
+            avg_credibility = rollup.sum_credibility / total_assessments
+            avg_reliability = rollup.sum_reliability / total_assessments
+            avg_intimacy = rollup.sum_intimacy / total_assessments
+            avg_self_orientation = rollup.sum_self_orientation / total_assessments
+            avg_score = rollup.avg_total
         else:
             avg_credibility = avg_reliability = avg_intimacy = avg_self_orientation = avg_score = 0
 
-        high_trust_count = sum(1 for score in all_scores if score.total_score >= 3)
-        low_trust_count = sum(1 for score in all_scores if score.total_score < 2)
+        total = func.coalesce(Crisp.total_score, crisp_total_expression(Crisp.__table__))
 
-        score_distribution = [
-            sum(1 for score in all_scores if score.total_score < 1),
-            sum(1 for score in all_scores if 1 <= score.total_score < 2),
-            sum(1 for score in all_scores if 2 <= score.total_score < 3),
-            sum(1 for score in all_scores if 3 <= score.total_score < 4),
-            sum(1 for score in all_scores if score.total_score >= 4),
-        ]
+        def count_where(condition):
+            return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+        counts = db.session.query(
+            count_where(total >= 3),
+            count_where(total < 2),
+            count_where(total < 1),
+            count_where((total >= 1) & (total < 2)),
+            count_where((total >= 2) & (total < 3)),
+            count_where((total >= 3) & (total < 4)),
+            count_where(total >= 4),
+        ).one()
+        high_trust_count, low_trust_count = counts[0], counts[1]
+        score_distribution = list(counts[2:])
 
         return {
             "avg_credibility": avg_credibility,
@@ -49,6 +212,69 @@ class CrispAnalyticsService(ServiceBase):
             "score_distribution": score_distribution
         }
 
+    @cached_analytics(CRISP_TABLES)
+    def get_score_distribution(self, bins=10):
+        """
+        Histogram of total scores with equal-width bins, computed in SQL.
+
+        The range comes from separate MIN and MAX lookups (each a single seek on
+        the total_score index) and the counts from one GROUP BY over the bucket
+        expression.
+
+        Args:
+            bins: Number of buckets
+
+        Returns:
+            Dict with min, max, total and a list of {lower, upper, count} bins
+        """
+        low = db.session.query(func.min(Crisp.total_score)).scalar()
+        high = db.session.query(func.max(Crisp.total_score)).scalar()
+        if low is None:
+            return {"min": None, "max": None, "total": 0, "bins": []}
+
+        width = (high - low) / bins or 1.0
+        if high == low:
+            bucket = literal(0)
+        else:
+            bucket = case((Crisp.total_score >= high, bins - 1), else_=cast((Crisp.total_score - low) / width, Integer))
+        counts = dict(
+            db.session.query(bucket, func.count())
+            .filter(Crisp.total_score.isnot(None))
+            .group_by(bucket)
+            .all()
+        )
+
+        return {
+            "min": low,
+            "max": high,
+            "total": sum(counts.values()),
+            "bins": [
+                {"lower": low + i * width, "upper": low + (i + 1) * width, "count": counts.get(i, 0)}
+                for i in range(bins)
+            ],
+        }
+
+    def get_rollup(self, scope_type, scope_id=0):
+        """
+        Running CRISP aggregates for a relationship, an entity or the whole table.
+
+        Args:
+            scope_type: "all", "relationship" or an entity type such as "contact"
+            scope_id: ID within the scope (ignored for "all")
+
+        Returns:
+            Dict with count, average, min and max total score
+        """
+        rollup = CrispRollup.lookup(scope_type, scope_id)
+        if not rollup:
+            return {"count": 0, "avg_total": None, "min_total": None, "max_total": None}
+        return {
+            "count": rollup.count,
+            "avg_total": rollup.avg_total,
+            "min_total": rollup.min_total,
+            "max_total": rollup.max_total,
+        }
+
     def get_relationship_display_name(self, relationship):
         if not relationship:
             return "Unknown Relationship"
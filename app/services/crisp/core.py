@@ -1,8 +1,37 @@
 # app/services/crisp/core.py
 from app.models import Crisp, Relationship, db
-from app.services.service_base import ServiceBase
+from app.services.crisp.analytics import CrispAnalyticsService
+from app.services.service_base import ServiceBase, ServiceRegistry
 
 class CrispService(ServiceBase):
+    def __init__(self):
+        super().__init__()
+        self.analytics = ServiceRegistry.get(CrispAnalyticsService)
+
+    # Analytics methods
+    def get_score_statistics(self):
+        return self.analytics.get_score_statistics()
+
+    def get_recent_scores(self, limit=10):
+        return self.analytics.get_recent_scores(limit)
+
+    def get_rollup(self, scope_type, scope_id=0):
+        return self.analytics.get_rollup(scope_type, scope_id)
+
+    def get_score_distribution(self, bins=10):
+        return self.analytics.get_score_distribution(bins)
+
+    def get_scores_page(self, after=None, limit=25):
+        return self.analytics.get_scores_page(after, limit)
+
+    def get_score_history(self, relationship_id, max_points=None):
+        if max_points is None:
+            return self.analytics.get_score_history(relationship_id)
+        return self.analytics.get_score_history(relationship_id, max_points)
+
+    def get_relationship_display_names(self, relationships):
+        return self.analytics.get_relationship_display_names(relationships)
+
     def get_relationship_display_name(self, relationship):
         if not relationship:
             return "Unknown Relationship"
@@ -4,6 +4,7 @@ from typing import List, Optional
 from app.services.service_base import ServiceBase, ServiceRegistry
 from app.services.note.core import NoteCoreService
 from app.services.note.search import NoteSearchService
+from app.services.search.trigram import DEFAULT_LIMIT
 
 
 class NoteService(ServiceBase):
@@ -51,6 +52,6 @@ class NoteService(ServiceBase):
         """Get notes within a date range."""
         return self.search_service.get_by_date_range(start_date, end_date)
 
-    def search(self, term: str) -> List:
-        """Search notes by term."""
-        return self.search_service.search(term)
+    def search(self, term: str, threshold: Optional[float] = None, limit: Optional[int] = DEFAULT_LIMIT) -> List:
+        """Fuzzy search notes by term, most similar first."""
+        return self.search_service.search(term, threshold, limit)
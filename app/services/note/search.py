@@ -1,10 +1,10 @@
 # app/services/note/search.py
 from datetime import datetime
-from typing import List
-from sqlalchemy import or_
+from typing import List, Optional
 
 from app.models import Note
-from app.services.service_base import ServiceBase
+from app.services.search.trigram import DEFAULT_LIMIT, TrigramSearchService
+from app.services.service_base import ServiceBase, ServiceRegistry
 from app.utils.app_logging import get_logger
 
 logger = get_logger()
@@ -33,13 +33,28 @@ class NoteSearchService(ServiceBase):
             logger.error(f"❌ Error querying notes between {start_date} and {end_date}: {e}")
             raise
 
-    def search(self, term: str) -> List[Note]:
+    def search(self, term: str, threshold: Optional[float] = None, limit: Optional[int] = DEFAULT_LIMIT) -> List[Note]:
         """
-        Simple text search over note content.
+        Fuzzy search over note content, most similar first.
+
+        Tolerates misspellings and partial words. Each note carries its score
+        as ``search_similarity``.
+
+        Args:
+            term: Search text
+            threshold: Minimum share of the term's trigrams a note must contain
+            limit: Maximum number of notes, None for all
         """
         try:
-            pattern = f"%{term}%"
-            return Note.query.filter(or_(Note.content.ilike(pattern), Note.user_id == term)).order_by(Note.created_at.desc()).all()
+            hits = ServiceRegistry.get(TrigramSearchService).search(term, ["notes"], threshold, limit)
+            notes = {note.id: note for note in Note.query.filter(Note.id.in_([hit["id"] for hit in hits]))} if hits else {}
+            results = []
+            for hit in hits:
+                note = notes.get(hit["id"])
+                if note is not None:
+                    note.search_similarity = hit["similarity"]
+                    results.append(note)
+            return results
         except Exception as e:
             logger.error(f"❌ Error searching notes for '{term}': {e}")
             raise
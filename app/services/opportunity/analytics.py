@@ -1,10 +1,22 @@
 # app/services/opportunity/analytics.py
 from datetime import datetime, timedelta
-from sqlalchemy import func, extract
+from sqlalchemy import and_, case, func
 from app.models import Opportunity
 from app.models.base import db
+from app.services.analytics import month_range, monthly_growth
+from app.services.analytics_cache import cached_analytics
 from app.services.service_base import ServiceBase
 
+PIPELINE_STAGES = ("qualification", "negotiation", "closing")
+CLOSING_SOON_WINDOW = timedelta(days=30)
+STALE_AFTER = timedelta(days=14)
+
+DASHBOARD_KEYS = (
+    "active_count", "total_value", "deal_count", "win_rate", "avg_deal_size", "closing_soon",
+    "won_this_month", "win_rate_change", "stale_count", "hot_opportunities_count",
+)
+STATISTICS_KEYS = ("total", "active", "won", "lost", "total_value", "avg_deal_size", "win_rate", "stale_count", "closing_soon")
+
 
 class OpportunityAnalyticsService(ServiceBase):
     """Service for opportunity analytics and statistics."""
@@ -17,65 +29,85 @@ class OpportunityAnalyticsService(ServiceBase):
         """Get the total number of opportunities."""
         return Opportunity.query.count()
 
-    def get_dashboard_statistics(self):
-        """Get statistics for the opportunities dashboard."""
-        return {
-            "active_count": Opportunity.query.filter_by(status="active").count(),
-            "total_value": db.session.query(func.sum(Opportunity.value)).filter_by(status="active").scalar() or 0,
-            "deal_count": Opportunity.query.filter_by(status="active").count(),
-            "win_rate": self.calculate_win_rate(),
-            "avg_deal_size": self.calculate_avg_deal_size(),
-            "closing_soon": Opportunity.query.filter(
-                Opportunity.status == "active", Opportunity.close_date <= (datetime.now() + timedelta(days=30))
-            ).count(),
-            "won_this_month": Opportunity.query.filter(
-                Opportunity.status == "won",
-                extract("month", Opportunity.close_date) == datetime.now().month,
-                extract("year", Opportunity.close_date) == datetime.now().year,
-            ).count(),
+    @cached_analytics(["opportunities"])
+    def get_pipeline_summary(self):
+        """
+        Compute the dashboard KPIs and per-stage pipeline figures in one query.
+
+        Every figure is a conditional aggregate (``COUNT(*) FILTER (WHERE ...)``
+        or ``SUM(CASE ...)``) over a single scan of the opportunities table.
+
+        Returns:
+            Dictionary with "stats" (KPIs keyed as on the dashboard and
+            statistics pages) and "stages" (name, count, value and percentage of
+            active opportunities for each pipeline stage)
+        """
+        now = datetime.now()
+        month_start, next_month = month_range(1, now)
+        active = Opportunity.status == "active"
+        won = Opportunity.status == "won"
+
+        columns = [
+            func.count().label("total"),
+            func.count().filter(active).label("active"),
+            func.count().filter(won).label("won"),
+            func.count().filter(Opportunity.status == "lost").label("lost"),
+            func.sum(case((active, Opportunity.value), else_=0)).label("active_value"),
+            func.avg(case((won, Opportunity.value))).label("avg_won_value"),
+            func.count().filter(active, Opportunity.close_date <= now + CLOSING_SOON_WINDOW).label("closing_soon"),
+            func.count().filter(won, Opportunity.close_date >= month_start, Opportunity.close_date < next_month).label("won_this_month"),
+            func.count().filter(active, Opportunity.last_activity_date <= now - STALE_AFTER).label("stale"),
+            func.count().filter(Opportunity.priority == "high").label("hot"),
+        ]
+        for stage in PIPELINE_STAGES:
+            in_stage = and_(active, Opportunity.stage == stage)
+            columns.append(func.count().filter(in_stage).label(f"{stage}_count"))
+            columns.append(func.sum(case((in_stage, Opportunity.value), else_=0)).label(f"{stage}_value"))
+
+        row = db.session.query(*columns).one()
+
+        win_rate = self._calculate_percentage(row.won, row.won + row.lost)
+        stats = {
+            "total": row.total,
+            "active": row.active,
+            "active_count": row.active,
+            "deal_count": row.active,
+            "won": row.won,
+            "lost": row.lost,
+            "total_value": row.active_value or 0,
+            "win_rate": win_rate,
+            "avg_deal_size": row.avg_won_value or 0,
+            "closing_soon": row.closing_soon,
+            "won_this_month": row.won_this_month,
             "win_rate_change": self.calculate_win_rate_change(),
-            "stale_count": self.calculate_stale_opportunities(),
-            "hot_opportunities_count": Opportunity.query.filter_by(priority="high").count(),
+            "stale_count": row.stale,
+            "hot_opportunities_count": row.hot,
         }
+        stages = [
+            {
+                "name": stage.title(),
+                "stage": stage,
+                "count": row._mapping[f"{stage}_count"],
+                "value": row._mapping[f"{stage}_value"] or 0,
+                "percentage": self._calculate_percentage(row._mapping[f"{stage}_count"], row.active),
+            }
+            for stage in PIPELINE_STAGES
+        ]
+        return {"stats": stats, "stages": stages}
+
+    def get_dashboard_statistics(self):
+        """Get statistics for the opportunities dashboard."""
+        stats = self.get_pipeline_summary()["stats"]
+        return {key: stats[key] for key in DASHBOARD_KEYS}
 
     def get_pipeline_stages(self):
         """Get data for pipeline stages visualization."""
-        return [
-            {
-                "name": "Qualification",
-                "count": Opportunity.query.filter_by(stage="qualification", status="active").count(),
-                "value": db.session.query(func.sum(Opportunity.value)).filter_by(stage="qualification",
-                                                                                 status="active").scalar() or 0,
-                "percentage": self.calculate_stage_percentage("qualification"),
-            },
-            {
-                "name": "Negotiation",
-                "count": Opportunity.query.filter_by(stage="negotiation", status="active").count(),
-                "value": db.session.query(func.sum(Opportunity.value)).filter_by(stage="negotiation",
-                                                                                 status="active").scalar() or 0,
-                "percentage": self.calculate_stage_percentage("negotiation"),
-            },
-            {
-                "name": "Closing",
-                "count": Opportunity.query.filter_by(stage="closing", status="active").count(),
-                "value": db.session.query(func.sum(Opportunity.value)).filter_by(stage="closing",
-                                                                                 status="active").scalar() or 0,
-                "percentage": self.calculate_stage_percentage("closing"),
-            },
-        ]
+        return self.get_pipeline_summary()["stages"]
 
     def get_statistics(self):
         """Get comprehensive statistics for the statistics page."""
-        return {
-            "total": Opportunity.query.count(),
-            "active": Opportunity.query.filter_by(status="active").count(),
-            "won": Opportunity.query.filter_by(status="won").count(),
-            "lost": Opportunity.query.filter_by(status="lost").count(),
-            "total_value": db.session.query(func.sum(Opportunity.value)).filter_by(status="active").scalar() or 0,
-            "avg_deal_size": self.calculate_avg_deal_size(),
-            "win_rate": self.calculate_win_rate(),
-            "stale_count": self.calculate_stale_opportunities()
-        }
+        stats = self.get_pipeline_summary()["stats"]
+        return {key: stats[key] for key in STATISTICS_KEYS}
 
     def get_pipeline_by_stage(self):
         """Calculate pipeline value by stage."""
@@ -86,41 +118,14 @@ class OpportunityAnalyticsService(ServiceBase):
             .all()
         )
 
+    @cached_analytics(["opportunities"])
     def get_monthly_data(self):
         """Get monthly data for the past 12 months."""
-        monthly_data = []
-        current_month = datetime.now().month
-        current_year = datetime.now().year
-
-        for i in range(12):
-            month = (current_month - i) % 12
-            if month == 0:
-                month = 12
-            year = current_year - ((current_month - i) // 12)
-
-            month_name = datetime(year, month, 1).strftime("%b %Y")
-
-            won_count = Opportunity.query.filter(
-                Opportunity.status == "won",
-                extract("month", Opportunity.close_date) == month,
-                extract("year", Opportunity.close_date) == year,
-            ).count()
-
-            won_value = (
-                    db.session.query(func.sum(Opportunity.value))
-                    .filter(
-                        Opportunity.status == "won",
-                        extract("month", Opportunity.close_date) == month,
-                        extract("year", Opportunity.close_date) == year,
-                    )
-                    .scalar()
-                    or 0
-            )
-
-            monthly_data.append({"month": month_name, "won_count": won_count, "won_value": won_value})
-
-        monthly_data.reverse()
-        return monthly_data
+        series = monthly_growth(Opportunity.close_date, 12, criteria=[Opportunity.status == "won"], value=Opportunity.value)
+        return [
+            {"month": label, "won_count": count, "won_value": value}
+            for label, count, value in zip(series["labels"], series["new"], series["value"])
+        ]
 
     def calculate_win_rate(self):
         """Calculate the win rate of opportunities."""
@@ -141,7 +146,7 @@ class OpportunityAnalyticsService(ServiceBase):
 
     def calculate_stale_opportunities(self):
         """Calculate the number of stale opportunities."""
-        two_weeks_ago = datetime.now() - timedelta(days=14)
+        two_weeks_ago = datetime.now() - STALE_AFTER
         return Opportunity.query.filter(Opportunity.status == "active",
                                         Opportunity.last_activity_date <= two_weeks_ago).count()
 
@@ -1,23 +1,36 @@
 # app/services/opportunity/core.py
-from datetime import datetime, timedelta
-from app.services.service_base import BaseFeatureService
+from app.services.opportunity.analytics import OpportunityAnalyticsService
+from app.services.opportunity.forecast import OpportunityForecastService
+from app.services.service_base import BaseFeatureService, ServiceRegistry
 from app.models import Opportunity
 
 
 class OpportunityService(BaseFeatureService):
     def __init__(self):
         super().__init__(Opportunity)
+        self.analytics = ServiceRegistry.get(OpportunityAnalyticsService)
+        self.forecasting = ServiceRegistry.get(OpportunityForecastService)
 
     def get_dashboard_statistics(self):
         """Get opportunity dashboard statistics."""
-        stats = super().get_dashboard_statistics()
-        stats.update({
-            "active_count": Opportunity.query.filter_by(status="active").count(),
-            "total_value": self.calculate_total_value(),
-            "win_rate": self.calculate_win_rate()
-        })
+        stats = self.analytics.get_pipeline_summary()["stats"]
+        stats["total_count"] = stats["total"]
         return stats
 
+    def get_dashboard_data(self):
+        """Get the dashboard KPIs and pipeline stages from a single query, plus the bookings forecast."""
+        data = self.analytics.get_pipeline_summary()
+        data["forecast"] = self.get_forecast()
+        return data
+
+    def get_forecast(self, months=6):
+        """Get the Monte Carlo bookings forecast for the coming months."""
+        return self.forecasting.prepare_forecast_data(months)
+
+    def get_stage_segments(self):
+        """Get opportunity segments by pipeline stage."""
+        return self.analytics.get_pipeline_stages()
+
     def calculate_total_value(self):
         """Calculate total value of active opportunities."""
         from app.models.base import db
@@ -59,13 +72,4 @@ class OpportunityService(BaseFeatureService):
 
     def get_statistics(self):
         """Get opportunity statistics."""
-        return {
-            "total": Opportunity.query.count(),
-            "active": Opportunity.query.filter_by(status="active").count(),
-            "won": Opportunity.query.filter_by(status="won").count(),
-            "lost": Opportunity.query.filter_by(status="lost").count(),
-            "closing_soon": Opportunity.query.filter(
-                Opportunity.status == "active",
-                Opportunity.close_date <= (datetime.now() + timedelta(days=30))
-            ).count()
-        }
\ No newline at end of file
+        return self.analytics.get_statistics()
\ No newline at end of file
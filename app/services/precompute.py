@@ -0,0 +1,273 @@
+# app/services/precompute.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Optional, Set, Tuple
+
+from app.models.base import db
+from app.services.analytics_cache import on_tables_written
+from app.utils.app_logging import get_logger
+
+logger = get_logger()
+
+DEFAULT_INTERVAL = 300
+DEFAULT_DEBOUNCE = 2.0
+DEFAULT_WORKERS = 2
+# A job kept dirty by a steady stream of writes still refreshes this often
+MAX_DEBOUNCE_DELAY = 30.0
+TICK = 0.5
+
+
+@dataclass
+class PrecomputeJob:
+    """A registered dashboard computation and its scheduling state."""
+
+    name: str
+    compute: Callable[[], Any]
+    tables: FrozenSet[str]
+    interval: float
+    last_run: Optional[float] = None
+    dirty_since: Optional[float] = None
+    last_write: Optional[float] = None
+    running: bool = False
+
+    def is_due(self, now: float, debounce: float) -> bool:
+        if self.running:
+            return False
+        if self.last_run is None or now - self.last_run >= self.interval:
+            return True
+        if self.dirty_since is None:
+            return False
+        return now - self.last_write >= debounce or now - self.dirty_since >= MAX_DEBOUNCE_DELAY
+
+
+@dataclass
+class PrecomputedResult:
+    value: Any
+    computed_at: float = field(default_factory=time.time)
+
+    @property
+    def age(self) -> float:
+        return max(0.0, time.time() - self.computed_at)
+
+
+def job_name(service_class: type, method: str, args: Tuple = ()) -> str:
+    """Name of the job computing ``service_class().method(*args)``."""
+    suffix = f"({', '.join(map(repr, args))})" if args else ""
+    return f"{service_class.__name__}.{method}{suffix}"
+
+
+class DashboardScheduler:
+    """In-process scheduler keeping dashboard statistics precomputed.
+
+    Registered jobs are refreshed on a thread pool every ``interval`` seconds
+    and, debounced, shortly after a commit writes to one of their tables.
+    Each job runs inside its own app context. Readers get the last result and
+    its age; before the scheduler has started (or when it is disabled) they
+    compute the result inline.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.debounce = DEFAULT_DEBOUNCE
+        self._jobs: Dict[str, PrecomputeJob] = {}
+        self._results: Dict[str, PrecomputedResult] = {}
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._workers = DEFAULT_WORKERS
+
+    # -- Setup -----------------------------------------------------------------
+
+    def init_app(self, app) -> None:
+        """Configure the scheduler and start it on the app's first request."""
+        self.app = app
+        self.debounce = app.config.get("DASHBOARD_PRECOMPUTE_DEBOUNCE", DEFAULT_DEBOUNCE)
+        self._workers = app.config.get("DASHBOARD_PRECOMPUTE_WORKERS", DEFAULT_WORKERS)
+        interval = app.config.get("DASHBOARD_PRECOMPUTE_INTERVAL", DEFAULT_INTERVAL)
+        register_dashboard_jobs(self, interval)
+        on_tables_written(self.mark_dirty)
+
+        # Started by the first request so CLI commands and the reloader's
+        # watcher process never spin up workers
+        if not app.config.get("DASHBOARD_PRECOMPUTE_ENABLED", True) or app.testing:
+            return
+
+        @app.before_request
+        def _start_dashboard_scheduler():
+            if not self.running:
+                self.start()
+
+    def register(self, service_class: type, method: str, tables: Optional[Iterable[str]] = None,
+                 interval: float = DEFAULT_INTERVAL, args: Tuple = ()) -> PrecomputeJob:
+        """
+        Register ``service_class().method(*args)`` for precomputation.
+
+        Args:
+            service_class: Service to take from the ServiceRegistry
+            method: Method name
+            tables: Tables whose writes trigger a refresh; defaults to the
+                method's @cached_analytics tables
+            interval: Seconds between scheduled refreshes
+            args: Positional arguments for the method
+
+        Returns:
+            The registered job
+        """
+        from app.services.service_base import ServiceRegistry
+
+        def compute():
+            return getattr(ServiceRegistry.get(service_class), method)(*args)
+
+        if tables is None:
+            tables = getattr(getattr(service_class, method), "cache_tables", ())
+            if callable(tables):
+                tables = tables(ServiceRegistry.get(service_class))
+
+        job = PrecomputeJob(job_name(service_class, method, args), compute, frozenset(tables), interval)
+        with self._lock:
+            self._jobs[job.name] = job
+        return job
+
+    # -- Lifecycle -------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the scheduling thread and worker pool."""
+        with self._lock:
+            if self.running:
+                return
+            self._stop.clear()
+            self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="dashboard-precompute")
+            self._thread = threading.Thread(target=self._loop, name="dashboard-scheduler", daemon=True)
+            self._thread.start()
+        logger.info(f"DashboardScheduler: Started with {len(self._jobs)} jobs and {self._workers} workers")
+
+    def stop(self, wait: bool = True) -> None:
+        """Stop scheduling and shut the worker pool down."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+        self._thread = self._executor = None
+
+    def _loop(self) -> None:
+        while not self._stop.wait(TICK):
+            now = time.monotonic()
+            with self._lock:
+                due = [job for job in self._jobs.values() if job.is_due(now, self.debounce)]
+                for job in due:
+                    job.running = True
+            for job in due:
+                self._executor.submit(self._run, job)
+
+    def _run(self, job: PrecomputeJob) -> None:
+        with self._lock:
+            job.dirty_since = job.last_write = None
+        started = time.monotonic()
+        try:
+            with self.app.app_context():
+                try:
+                    value = job.compute()
+                finally:
+                    db.session.remove()
+            with self._lock:
+                self._results[job.name] = PrecomputedResult(value)
+            logger.debug(f"DashboardScheduler: Refreshed {job.name} in {time.monotonic() - started:.3f}s")
+        except Exception:
+            logger.exception(f"DashboardScheduler: Job {job.name} failed")
+        finally:
+            with self._lock:
+                job.running = False
+                job.last_run = time.monotonic()
+
+    # -- Write events ----------------------------------------------------------
+
+    def mark_dirty(self, tables: Set[str]) -> None:
+        """Schedule a debounced refresh of every job reading one of ``tables``."""
+        now = time.monotonic()
+        with self._lock:
+            for job in self._jobs.values():
+                if job.tables & tables:
+                    job.dirty_since = job.dirty_since or now
+                    job.last_write = now
+
+    # -- Reading ---------------------------------------------------------------
+
+    def read(self, service, method: str, *args) -> Tuple[Any, float]:
+        """
+        Get a precomputed result, computing it inline if there is none yet.
+
+        Args:
+            service: Service instance the job was registered for (by class)
+            method: Method name
+            *args: Positional arguments the job was registered with
+
+        Returns:
+            Tuple of (value, age in seconds)
+        """
+        name = job_name(type(service), method, args)
+        with self._lock:
+            result = self._results.get(name) if self.running else None
+            job = self._jobs.get(name)
+        if result is not None:
+            return result.value, result.age
+
+        value = getattr(service, method)(*args)
+        if job is not None and self.running:
+            with self._lock:
+                self._results[name] = PrecomputedResult(value)
+                job.last_run = time.monotonic()
+        return value, 0.0
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Age, refresh interval and pending state of every job."""
+        with self._lock:
+            return {
+                name: {
+                    "age": round(self._results[name].age, 3) if name in self._results else None,
+                    "interval": job.interval,
+                    "tables": sorted(job.tables),
+                    "dirty": job.dirty_since is not None,
+                    "running": job.running,
+                }
+                for name, job in self._jobs.items()
+            }
+
+
+def register_dashboard_jobs(scheduler: DashboardScheduler, interval: float = DEFAULT_INTERVAL) -> None:
+    """Register the dashboard statistics, engagement segment and growth series computations."""
+    from app.services.company import CompanyService
+    from app.services.company.analytics import COMPANY_TABLES
+    from app.services.contact import ContactService
+    from app.services.contact.analytics import ContactAnalyticsService
+    from app.services.opportunity import OpportunityService
+    from app.services.srs import SRSService
+    from app.services.srs.analytics import SRS_TABLES
+    from app.services.task import TaskService
+    from app.services.user import UserService
+
+    for service_class in (CompanyService, ContactService, TaskService, UserService):
+        scheduler.register(service_class, "get_dashboard_statistics", interval=interval)
+    scheduler.register(OpportunityService, "get_dashboard_statistics", ["opportunities"], interval=interval)
+    scheduler.register(OpportunityService, "get_dashboard_data", ["opportunities"], interval=interval)
+    scheduler.register(TaskService, "get_dashboard_data", ["tasks"], interval=interval)
+    scheduler.register(SRSService, "get_stats", SRS_TABLES, interval=interval)
+
+    # Engagement segmentation. The cached counts also keep the statistics pages warm.
+    scheduler.register(CompanyService, "get_engagement_segments", COMPANY_TABLES, interval=interval)
+    scheduler.register(ContactAnalyticsService, "get_engagement_counts", interval=interval)
+    scheduler.register(UserService, "get_activity_counts", interval=interval)
+    scheduler.register(TaskService, "get_status_breakdown", ["tasks"], interval=interval)
+
+    for service_class in (CompanyService, ContactService, OpportunityService):
+        scheduler.register(service_class, "prepare_growth_data", interval=interval, args=(6,))
+
+
+dashboard_scheduler = DashboardScheduler()
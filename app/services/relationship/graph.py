@@ -0,0 +1,406 @@
+# app/services/relationship/graph.py
+import heapq
+import threading
+from array import array
+from collections import defaultdict, deque
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from app.models.base import db
+from app.models.pages.crisp import Crisp
+from app.models.relationship import Relationship
+from app.services.service_base import ServiceBase
+from app.utils.app_logging import get_logger
+
+logger = get_logger()
+
+Node = Tuple[str, int]
+# (relationship id, node a, node b, relationship type, traversal cost)
+Edge = Tuple[int, Node, Node, Optional[str], float]
+
+# CRISP components are 0-10 (self-orientation 1-10), so trust scores fall in 0-30.
+# Relationships without a score are treated as a middling 5/5/5/5 relationship.
+DEFAULT_TRUST_SCORE = 3.0
+
+# Pending overlay edits tolerated before the CSR arrays are compacted
+COMPACT_THRESHOLD = 256
+
+MAX_HOPS = 4
+
+_SESSION_CHANGES_KEY = "relationship_graph_changes"
+
+
+def trust_score(credibility: int, reliability: int, intimacy: int, self_orientation: int) -> float:
+    """CRISP trust score, (C + R + I) / S, falling back to C + R + I when S is zero."""
+    total = float(credibility + reliability + intimacy)
+    return total / self_orientation if self_orientation else total
+
+
+def edge_cost(score: Optional[float]) -> float:
+    """Traversal cost of a relationship; stronger relationships are cheaper to cross."""
+    if score is None:
+        score = DEFAULT_TRUST_SCORE
+    return 1.0 / (1.0 + max(score, 0.0))
+
+
+class CSRGraph:
+    """Immutable undirected adjacency in compressed sparse row form.
+
+    Node ``i``'s neighbours are ``targets[offsets[i]:offsets[i + 1]]`` with the
+    matching relationship ids and traversal costs at the same positions.
+    """
+
+    def __init__(self, edges: Iterable[Edge]):
+        self.nodes: List[Node] = []
+        self.index: Dict[Node, int] = {}
+        self.edge_types: Dict[int, Optional[str]] = {}
+
+        adjacency = defaultdict(list)
+        for edge_id, a, b, rel_type, cost in edges:
+            ia, ib = self._intern(a), self._intern(b)
+            adjacency[ia].append((ib, edge_id, cost))
+            adjacency[ib].append((ia, edge_id, cost))
+            self.edge_types[edge_id] = rel_type
+
+        self.offsets = array("l", [0])
+        self.targets = array("l")
+        self.edge_ids = array("l")
+        self.costs = array("d")
+        for i in range(len(self.nodes)):
+            for target, edge_id, cost in adjacency.get(i, ()):
+                self.targets.append(target)
+                self.edge_ids.append(edge_id)
+                self.costs.append(cost)
+            self.offsets.append(len(self.targets))
+
+    def _intern(self, node: Node) -> int:
+        if node not in self.index:
+            self.index[node] = len(self.nodes)
+            self.nodes.append(node)
+        return self.index[node]
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets) // 2
+
+    def adjacent(self, node: Node) -> Iterable[Tuple[Node, int, float]]:
+        """Yield (neighbour, relationship id, cost) for a node."""
+        i = self.index.get(node)
+        if i is None:
+            return
+        for pos in range(self.offsets[i], self.offsets[i + 1]):
+            yield self.nodes[self.targets[pos]], self.edge_ids[pos], self.costs[pos]
+
+    def edges(self) -> List[Edge]:
+        """Recover the edge list, each undirected edge once."""
+        result, seen = [], set()
+        for i, node in enumerate(self.nodes):
+            for pos in range(self.offsets[i], self.offsets[i + 1]):
+                edge_id = self.edge_ids[pos]
+                if edge_id not in seen:
+                    seen.add(edge_id)
+                    result.append((edge_id, node, self.nodes[self.targets[pos]], self.edge_types.get(edge_id), self.costs[pos]))
+        return result
+
+
+class RelationshipGraphService(ServiceBase):
+    """In-memory graph of the Relationship table.
+
+    The graph is loaded once into CSR arrays. Committed changes to relationships
+    and CRISP scores are applied as an overlay of added/removed edges, which is
+    folded back into the arrays once it grows past ``COMPACT_THRESHOLD``.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.RLock()
+        self._graph: Optional[CSRGraph] = None
+        self._added: Dict[int, Edge] = {}
+        self._added_adjacency: Dict[Node, Dict[int, Tuple[Node, float]]] = defaultdict(dict)
+        self._removed: Set[int] = set()
+        self._pending: Set[int] = set()
+
+    # -- Loading ---------------------------------------------------------
+
+    @staticmethod
+    def _load_edges(relationship_ids: Optional[Iterable[int]] = None) -> List[Edge]:
+        """Load relationships with their latest CRISP score as graph edges."""
+        latest = db.session.query(func.max(Crisp.id).label("crisp_id")).group_by(Crisp.relationship_id).subquery()
+        query = (
+            db.session.query(
+                Relationship.id,
+                Relationship.entity1_type,
+                Relationship.entity1_id,
+                Relationship.entity2_type,
+                Relationship.entity2_id,
+                Relationship.relationship_type,
+                Crisp.credibility,
+                Crisp.reliability,
+                Crisp.intimacy,
+                Crisp.self_orientation,
+            )
+            .outerjoin(Crisp, (Crisp.relationship_id == Relationship.id) & Crisp.id.in_(db.select(latest.c.crisp_id)))
+        )
+        if relationship_ids is not None:
+            query = query.filter(Relationship.id.in_(list(relationship_ids)))
+
+        edges = []
+        for rel_id, type1, id1, type2, id2, rel_type, c, r, i, s in query.all():
+            score = trust_score(c, r, i, s) if c is not None else None
+            edges.append((rel_id, (type1.lower(), id1), (type2.lower(), id2), rel_type, edge_cost(score)))
+        return edges
+
+    def rebuild(self) -> CSRGraph:
+        """Reload the whole graph from the database."""
+        with self._lock:
+            # Changes committed while loading are queued again and re-applied afterwards
+            self._pending.clear()
+        edges = self._load_edges()
+        with self._lock:
+            self._graph = CSRGraph(edges)
+            self._added.clear()
+            self._added_adjacency.clear()
+            self._removed.clear()
+        self.logger.info(f"RelationshipGraphService: Loaded {len(self._graph.nodes)} nodes and {self._graph.edge_count} edges")
+        return self._graph
+
+    def mark_changed(self, relationship_ids: Iterable[int]) -> None:
+        """Queue relationships whose edges must be refreshed before the next read."""
+        with self._lock:
+            self._pending.update(relationship_ids)
+
+    def _refresh(self) -> None:
+        """Ensure the graph is loaded and apply queued changes."""
+        if self._graph is None:
+            self.rebuild()
+            return
+
+        with self._lock:
+            pending, self._pending = self._pending, set()
+        if not pending:
+            return
+
+        edges = {edge[0]: edge for edge in self._load_edges(pending)}
+        with self._lock:
+            for rel_id in pending:
+                self._drop_added(rel_id)
+                self._removed.add(rel_id)
+                if rel_id in edges:
+                    self._add(edges[rel_id])
+
+            if len(self._added) + len(self._removed) > COMPACT_THRESHOLD:
+                self._compact()
+        self.logger.info(f"RelationshipGraphService: Applied {len(pending)} relationship changes")
+
+    def _add(self, edge: Edge) -> None:
+        rel_id, a, b, _, cost = edge
+        self._added[rel_id] = edge
+        self._added_adjacency[a][rel_id] = (b, cost)
+        self._added_adjacency[b][rel_id] = (a, cost)
+
+    def _drop_added(self, rel_id: int) -> None:
+        edge = self._added.pop(rel_id, None)
+        if edge:
+            _, a, b, _, _ = edge
+            self._added_adjacency[a].pop(rel_id, None)
+            self._added_adjacency[b].pop(rel_id, None)
+
+    def _compact(self) -> None:
+        """Fold the overlay into fresh CSR arrays without going back to the database."""
+        edges = [edge for edge in self._graph.edges() if edge[0] not in self._removed]
+        edges.extend(self._added.values())
+        self._graph = CSRGraph(edges)
+        self._added.clear()
+        self._added_adjacency.clear()
+        self._removed.clear()
+
+    # -- Traversal -------------------------------------------------------
+
+    def _relationship_type(self, rel_id: int) -> Optional[str]:
+        if rel_id in self._added:
+            return self._added[rel_id][3]
+        return self._graph.edge_types.get(rel_id)
+
+    def _adjacent(self, node: Node) -> List[Tuple[Node, int, float]]:
+        result = [edge for edge in self._graph.adjacent(node) if edge[1] not in self._removed]
+        result.extend((other, rel_id, cost) for rel_id, (other, cost) in self._added_adjacency.get(node, {}).items())
+        return result
+
+    @staticmethod
+    def _node(entity_type: str, entity_id: int) -> Node:
+        return entity_type.lower(), int(entity_id)
+
+    def neighbors(self, entity_type: str, entity_id: int) -> List[Dict[str, Any]]:
+        """
+        Get the entities directly related to an entity.
+
+        Args:
+            entity_type: Type of the starting entity
+            entity_id: ID of the starting entity
+
+        Returns:
+            List of {"entity_type", "entity_id", "relationship_id", "relationship_type", "cost"} dicts
+        """
+        self._refresh()
+        with self._lock:
+            return [
+                {
+                    "entity_type": other[0],
+                    "entity_id": other[1],
+                    "relationship_id": rel_id,
+                    "relationship_type": self._relationship_type(rel_id),
+                    "cost": cost,
+                }
+                for other, rel_id, cost in self._adjacent(self._node(entity_type, entity_id))
+            ]
+
+    def k_hop(self, entity_type: str, entity_id: int, k: int = 2, related_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Breadth-first search for entities within ``k`` hops.
+
+        Args:
+            entity_type: Type of the starting entity
+            entity_id: ID of the starting entity
+            k: Maximum number of hops (capped at ``MAX_HOPS``)
+            related_type: Only return entities of this type (traversal still passes through others)
+
+        Returns:
+            List of {"entity_type", "entity_id", "hops"} dicts ordered by distance
+        """
+        self._refresh()
+        k = max(1, min(k, MAX_HOPS))
+        start = self._node(entity_type, entity_id)
+        related_type = related_type.lower() if related_type else None
+
+        seen = {start: 0}
+        frontier = deque([start])
+        result = []
+        with self._lock:
+            while frontier:
+                node = frontier.popleft()
+                hops = seen[node]
+                if hops == k:
+                    continue
+                for other, _, _ in self._adjacent(node):
+                    if other in seen:
+                        continue
+                    seen[other] = hops + 1
+                    frontier.append(other)
+                    if related_type is None or other[0] == related_type:
+                        result.append({"entity_type": other[0], "entity_id": other[1], "hops": hops + 1})
+        return result
+
+    def shortest_path(self, source: Node, target: Node) -> Optional[Dict[str, Any]]:
+        """
+        Cheapest introduction path between two entities (Dijkstra over CRISP costs).
+
+        Args:
+            source: (entity_type, entity_id) to start from
+            target: (entity_type, entity_id) to reach
+
+        Returns:
+            {"cost", "path": [...], "relationship_ids": [...]} or None if unreachable
+        """
+        self._refresh()
+        source, target = self._node(*source), self._node(*target)
+
+        best = {source: 0.0}
+        previous: Dict[Node, Tuple[Node, int]] = {}
+        heap = [(0.0, source)]
+        with self._lock:
+            while heap:
+                cost, node = heapq.heappop(heap)
+                if node == target:
+                    break
+                if cost > best.get(node, float("inf")):
+                    continue
+                for other, rel_id, edge_cost_ in self._adjacent(node):
+                    candidate = cost + edge_cost_
+                    if candidate < best.get(other, float("inf")):
+                        best[other] = candidate
+                        previous[other] = (node, rel_id)
+                        heapq.heappush(heap, (candidate, other))
+
+        if target not in best:
+            return None
+
+        path, relationship_ids = [target], []
+        while path[-1] != source:
+            node, rel_id = previous[path[-1]]
+            path.append(node)
+            relationship_ids.append(rel_id)
+        path.reverse()
+        relationship_ids.reverse()
+
+        return {
+            "cost": best[target],
+            "path": [{"entity_type": t, "entity_id": i} for t, i in path],
+            "relationship_ids": relationship_ids,
+        }
+
+    def add_entity_names(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Attach an ``entity_name`` to graph results, loading each entity type with one query.
+
+        Args:
+            items: Dicts with "entity_type" and "entity_id" keys
+
+        Returns:
+            The same dicts, updated in place
+        """
+        from app.services.relationship import RelationshipService
+        from app.services.relationship.query import RelationshipQueryService
+        from app.services.service_base import ServiceRegistry
+
+        entity_models = ServiceRegistry.get(RelationshipService).ENTITY_MODELS
+        ids_by_type = defaultdict(set)
+        for item in items:
+            if item["entity_type"] in entity_models:
+                ids_by_type[item["entity_type"]].add(item["entity_id"])
+
+        entities = RelationshipQueryService._load_entities(ids_by_type, entity_models)
+        for item in items:
+            entity = entities.get((item["entity_type"], item["entity_id"]))
+            item["entity_name"] = (getattr(entity, "name", None) or getattr(entity, "full_name", str(entity))) if entity else None
+        return items
+
+    def stats(self) -> Dict[str, int]:
+        """Size of the loaded graph and its pending overlay."""
+        self._refresh()
+        with self._lock:
+            return {
+                "nodes": len(self._graph.nodes),
+                "edges": len(set(self._graph.edge_ids) - self._removed) + len(self._added),
+                "overlay_added": len(self._added),
+                "overlay_removed": len(self._removed),
+            }
+
+
+# -- Commit tracking -----------------------------------------------------------
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_graph_changes(session, flush_context):
+    """Remember which relationships were touched by this transaction."""
+    changed = session.info.setdefault(_SESSION_CHANGES_KEY, set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Relationship) and obj.id is not None:
+            changed.add(obj.id)
+        elif isinstance(obj, Crisp) and obj.relationship_id is not None:
+            changed.add(obj.relationship_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_graph_changes(session):
+    changed = session.info.pop(_SESSION_CHANGES_KEY, None)
+    if changed:
+        from app.services.service_base import ServiceRegistry
+
+        ServiceRegistry.get(RelationshipGraphService).mark_changed(changed)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_graph_changes(session, previous_transaction):
+    session.info.pop(_SESSION_CHANGES_KEY, None)
@@ -1,5 +1,6 @@
 # app/services/relationship/query.py
-from typing import Any, Dict, List
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
 from sqlalchemy import and_, or_
 
 from app.models.relationship import Relationship
@@ -15,30 +16,53 @@ class RelationshipQueryService(ServiceBase):
     def __init__(self):
         super().__init__()
 
-    def get_relationships_for_entity(self, entity_type: str, entity_id: int, entity_models: dict) -> List[Dict[str, Any]]:
-        """Get all relationships for an entity with related data."""
-        relationships = Relationship.query.filter(
-            or_(
-                and_(Relationship.entity1_type == entity_type.lower(), Relationship.entity1_id == entity_id),
-                and_(Relationship.entity2_type == entity_type.lower(), Relationship.entity2_id == entity_id),
-            )
-        ).all()
+    def get_relationships_for_entity(
+        self, entity_type: str, entity_id: int, entity_models: dict, related_type: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get all relationships for an entity with related data.
 
-        result = []
+        Related entities are loaded with one ``IN`` query per entity type rather
+        than one query per relationship.
+
+        Args:
+            entity_type: Type of the entity whose relationships are wanted
+            entity_id: ID of the entity
+            entity_models: Mapping of entity type name to model class
+            related_type: Only return relationships to entities of this type
+
+        Returns:
+            List of relationship dicts describing the related side
+        """
+        entity_type = entity_type.lower()
+        as_entity1 = and_(Relationship.entity1_type == entity_type, Relationship.entity1_id == entity_id)
+        as_entity2 = and_(Relationship.entity2_type == entity_type, Relationship.entity2_id == entity_id)
+        if related_type:
+            related_type = related_type.lower()
+            as_entity1 = and_(as_entity1, Relationship.entity2_type == related_type)
+            as_entity2 = and_(as_entity2, Relationship.entity1_type == related_type)
+
+        relationships = Relationship.query.filter(or_(as_entity1, as_entity2)).order_by(Relationship.id).all()
+
+        # Determine the related side of each relationship and group the ids by type
+        related = []
+        ids_by_type = defaultdict(set)
         for rel in relationships:
-            # Determine the related side
-            if rel.entity1_type == entity_type.lower() and rel.entity1_id == entity_id:
-                related_type = rel.entity2_type
-                related_id = rel.entity2_id
+            if rel.entity1_type == entity_type and rel.entity1_id == entity_id:
+                other_type, other_id = rel.entity2_type, rel.entity2_id
             else:
-                related_type = rel.entity1_type
-                related_id = rel.entity1_id
+                other_type, other_id = rel.entity1_type, rel.entity1_id
 
-            model = entity_models.get(related_type)
-            if not model:
+            if other_type not in entity_models:
                 continue
+            related.append((rel, other_type, other_id))
+            ids_by_type[other_type].add(other_id)
+
+        entities = self._load_entities(ids_by_type, entity_models)
 
-            related_entity = model.query.get(related_id)
+        result = []
+        for rel, other_type, other_id in related:
+            related_entity = entities.get((other_type, other_id))
             if not related_entity:
                 continue
 
@@ -47,8 +71,8 @@ class RelationshipQueryService(ServiceBase):
             result.append(
                 {
                     "id": rel.id,
-                    "entity_type": related_type,
-                    "entity_id": related_id,
+                    "entity_type": other_type,
+                    "entity_id": other_id,
                     "entity_name": display_name,
                     "relationship_type": rel.relationship_type,
                 }
@@ -58,8 +82,19 @@ class RelationshipQueryService(ServiceBase):
 
     def get_entities_by_type(self, entity_type: str, related_type: str, entity_id: int) -> List[Dict[str, Any]]:
         """Get related entities of a specific type."""
-        rels = self.get_relationships_for_entity(entity_type, entity_id, self._get_relationship_service().ENTITY_MODELS)
-        return [r for r in rels if r["entity_type"] == related_type]
+        return self.get_relationships_for_entity(
+            entity_type, entity_id, self._get_relationship_service().ENTITY_MODELS, related_type=related_type
+        )
+
+    @staticmethod
+    def _load_entities(ids_by_type: Dict[str, set], entity_models: dict) -> Dict[tuple, Any]:
+        """Fetch entities with one IN query per type, keyed by (type, id)."""
+        entities = {}
+        for related_type, ids in ids_by_type.items():
+            model = entity_models[related_type]
+            for entity in model.query.filter(model.id.in_(ids)).all():
+                entities[(related_type, entity.id)] = entity
+        return entities
 
     def _get_relationship_service(self):
         from app.services import get_service
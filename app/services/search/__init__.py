@@ -1,10 +1,12 @@
 # app/services/search/__init__.py
 import traceback
-from typing import Any, Dict, List, Type
+from typing import Any, Dict, List, Optional, Type
 
 from sqlalchemy import or_
 
-from app.services.service_base import ServiceBase
+from app.models.base import db
+from app.services.search.index import ENTITIES_BY_NAME, SearchIndexService, build_match_query, highlight_snippet
+from app.services.service_base import ServiceBase, ServiceRegistry
 from app.utils.app_logging import get_logger
 
 logger = get_logger()
@@ -12,19 +14,25 @@ logger = get_logger()
 
 class SearchService(ServiceBase):
     """
-    Generic search service that performs simple text and equality filtering
+    Generic search service that performs text and equality filtering
     on a given SQLAlchemy model.
+
+    Models in the cross-entity search index are matched and ranked through it;
+    others (and databases without FTS5 or with an empty index) fall back to
+    ILIKE matching.
     """
 
-    def __init__(self, model_class: Type = None, search_fields: List[str] = None):
+    def __init__(self, model_class: Type = None, search_fields: List[str] = None, entity_name: Optional[str] = None):
         """
         Args:
             model_class (Type): SQLAlchemy model to search.
             search_fields (List[str]): Columns to apply ilike(text) searches.
+            entity_name (str, optional): Name of the model in the search index, e.g. "companies".
         """
         super().__init__()
         self._model_class = model_class  # Use backing field
         self.search_fields = search_fields or []
+        self.entity_name = entity_name
 
     @property
     def model_class(self):
@@ -36,20 +44,37 @@ class SearchService(ServiceBase):
         """Set the model class this service operates on."""
         self._model_class = value
 
-    def search(self, term: str, filters: Dict[str, Any] = None) -> List[Any]:
+    def search(self, term: str, filters: Dict[str, Any] = None, limit: Optional[int] = None, offset: int = 0) -> List[Any]:
         """
         Search the model.
 
+        Indexed matches are returned best first and carry ``search_rank``
+        (lower is better) and ``search_snippet`` (HTML-escaped excerpt with
+        ``<mark>`` highlights) attributes.
+
         Args:
-            term (str): Text to search via ilike on each search_field.
+            term (str): Text to search for.
             filters (dict, optional): Exact-match filters {column: value}.
+            limit (int, optional): Maximum number of results.
+            offset (int): Number of results to skip.
 
         Returns:
             List[Any]: Matched model instances.
         """
         try:
-            query = self.model_class.query
-            if term:
+            index = ServiceRegistry.get(SearchIndexService)
+            ranked = self.entity_name in ENTITIES_BY_NAME and build_match_query(term) and index.is_populated()
+            if ranked:
+                matches = index.ranked_matches(term, [ENTITIES_BY_NAME[self.entity_name]])
+                query = (
+                    db.session.query(self.model_class, matches.c.rank, matches.c.snippet)
+                    .join(matches, self.model_class.id == matches.c.entity_id)
+                    .order_by(matches.c.rank)
+                )
+            else:
+                query = self.model_class.query
+
+            if term and not ranked:
                 pattern = f"%{term}%"
                 clauses = [getattr(self.model_class, f).ilike(pattern) for f in self.search_fields if hasattr(self.model_class, f)]
                 if clauses:
@@ -60,7 +85,19 @@ class SearchService(ServiceBase):
                     if hasattr(self.model_class, col) and val is not None:
                         query = query.filter(getattr(self.model_class, col) == val)
 
-            return query.all()
+            if offset:
+                query = query.offset(offset)
+            if limit:
+                query = query.limit(limit)
+            if not ranked:
+                return query.all()
+
+            items = []
+            for item, rank, snippet in query.all():
+                item.search_rank = rank
+                item.search_snippet = highlight_snippet(snippet)
+                items.append(item)
+            return items
 
         except Exception as e:
             logger.error(f"❌ Error searching {self.model_class.__name__}: {e}")
@@ -0,0 +1,81 @@
+# app/services/search/cache.py
+import copy
+import re
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Optional
+
+from flask import current_app, has_app_context
+from sqlalchemy import inspect
+
+from app.models.base import db
+from app.services.analytics_cache import AnalyticsCache, approximate_size, on_tables_written
+
+DEFAULT_TTL = 60
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+_SPACE_RE = re.compile(r"\s+")
+
+# Search results keyed by (database, search, normalized term, params), dropped
+# when a commit writes to a table they were read from
+search_cache = AnalyticsCache(max_entries=None, max_bytes=DEFAULT_MAX_BYTES)
+on_tables_written(search_cache.invalidate_tables)
+
+
+def normalize_term(term: Optional[str]) -> str:
+    """Collapse whitespace so "acme  corp " and "acme corp" share a cache entry."""
+    return _SPACE_RE.sub(" ", term or "").strip()
+
+
+def model_tables(model: type) -> FrozenSet[str]:
+    """Tables of a model and of the models it relates to directly, which ``to_dict`` may embed."""
+    mapper = inspect(model)
+    tables = {table.name for table in mapper.tables}
+    for relationship in mapper.relationships:
+        tables.update(table.name for table in relationship.mapper.tables)
+    return frozenset(tables)
+
+
+def cached_search(name: str, term: Optional[str], params: Dict[str, Any], tables: Iterable[str],
+                  compute: Callable[[str], Any]) -> Any:
+    """
+    Get a search result from the cache, or compute and cache it.
+
+    Terms differing only in case or whitespace share an entry, as every search
+    matches case-insensitively. Results are copied on the way in and out so
+    callers can't mutate the cached value, and a result computed while one of
+    its tables was written is not cached. With ``SEARCH_CACHE_ENABLED`` off,
+    outside an app context or for unhashable params the result is computed
+    uncached.
+
+    Args:
+        name: Search being cached, e.g. "entity:contacts"
+        term: Raw search text
+        params: Everything else the result depends on (filters, limit, offset...)
+        tables: Tables whose writes invalidate the result
+        compute: Called with the whitespace-normalized term to produce the result
+
+    Returns:
+        The (possibly cached) result
+    """
+    term = normalize_term(term)
+    if not has_app_context() or not current_app.config.get("SEARCH_CACHE_ENABLED", True):
+        return compute(term)
+
+    engine = db.engine
+    key = (id(engine), str(engine.url), name, term.casefold(), tuple(sorted(params.items())))
+    try:
+        hash(key)
+    except TypeError:
+        return compute(term)
+
+    search_cache.max_bytes = current_app.config.get("SEARCH_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+    found, value = search_cache.get(key, name)
+    if found:
+        return copy.deepcopy(value)
+
+    tables = frozenset(tables)
+    generation = search_cache.generation(tables)
+    value = compute(term)
+    stored = copy.deepcopy(value)
+    search_cache.set(key, stored, tables, current_app.config.get("SEARCH_CACHE_TTL", DEFAULT_TTL), approximate_size(stored),
+                     generation=generation)
+    return value
@@ -0,0 +1,137 @@
+# app/services/search/federated.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy.pool import StaticPool
+
+from app.models.base import db
+from app.services.search import SearchService
+from app.services.search.index import ENTITIES_BY_NAME, SEARCHABLE_ENTITIES
+from app.services.service_base import ServiceBase
+
+DEFAULT_SOURCE_LIMIT = 5
+DEFAULT_TIMEOUT = 2.0
+DEFAULT_WORKERS = 4
+
+OK = "ok"
+TIMEOUT = "timeout"
+ERROR = "error"
+
+
+class FederatedSearchService(ServiceBase):
+    """Searches every entity type concurrently and merges the hits by score.
+
+    Each source runs on a bounded thread pool inside its own app context, so it
+    gets its own session and pooled connection. Sources still running at the
+    deadline are reported as timed out and left out of the results, so the
+    response takes as long as the slowest source, or the deadline if sooner.
+    While the full-text index is missing or empty the sources fall back to
+    unranked ILIKE matches, which score 0.
+    """
+
+    def __init__(self):
+        """Initialize the federated search service."""
+        super().__init__()
+        self.sources = {entity.name: SearchService(entity.model, list(entity.fields), entity.name) for entity in SEARCHABLE_ENTITIES}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                workers = current_app.config.get("SEARCH_FEDERATION_WORKERS", DEFAULT_WORKERS)
+                self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="federated-search")
+            return self._executor
+
+    @staticmethod
+    def _hit(name: str, item) -> Dict[str, Any]:
+        document = ENTITIES_BY_NAME[name].document(item)
+        rank = getattr(item, "search_rank", None)
+        return {
+            "type": name,
+            "id": item.id,
+            "title": document["title"] or document["body"][:80],
+            "snippet": getattr(item, "search_snippet", None),
+            "score": -rank if rank is not None else 0.0,
+        }
+
+    def _search_source(self, name: str, term: str, limit: int) -> Tuple[str, List[Dict[str, Any]], float]:
+        started = time.perf_counter()
+        try:
+            hits = [self._hit(name, item) for item in self.sources[name].search(term, limit=limit)]
+            return OK, hits, time.perf_counter() - started
+        except Exception:
+            self.logger.exception(f"FederatedSearchService: Source {name} failed")
+            return ERROR, [], time.perf_counter() - started
+
+    def _search_source_isolated(self, app, name: str, term: str, limit: int) -> Tuple[str, List[Dict[str, Any]], float]:
+        with app.app_context():
+            try:
+                return self._search_source(name, term, limit)
+            finally:
+                db.session.remove()
+
+    def search(self, term: str, types: Optional[Iterable[str]] = None, limit: int = DEFAULT_SOURCE_LIMIT,
+               timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Search the given entity types concurrently.
+
+        Args:
+            term: Raw search text
+            types: Entity names to search (e.g. "companies"), all by default
+            limit: Maximum number of hits per entity type
+            timeout: Seconds to wait for the sources, defaults to ``SEARCH_FEDERATION_TIMEOUT``
+
+        Returns:
+            Dictionary with the merged "results" (best score first), per-source
+            "sources" status, hit count and elapsed_ms, and the total "elapsed_ms"
+
+        Raises:
+            ValueError: If ``types`` names an unknown entity
+        """
+        names = list(self.sources) if types is None else list(dict.fromkeys(types))
+        unknown = sorted(set(names) - set(self.sources))
+        if unknown:
+            raise ValueError(f"Unknown search types: {', '.join(unknown)}")
+        if not (term or "").strip():
+            return {"results": [], "sources": {}, "elapsed_ms": 0.0}
+
+        if timeout is None:
+            timeout = current_app.config.get("SEARCH_FEDERATION_TIMEOUT", DEFAULT_TIMEOUT)
+        started = time.perf_counter()
+        outcomes: Dict[str, Tuple[str, List[Dict[str, Any]], float]] = {}
+
+        # An in-memory SQLite database lives on a single shared connection, which
+        # can't be used from several threads at once
+        if current_app.config.get("SEARCH_FEDERATION_WORKERS", DEFAULT_WORKERS) < 1 or isinstance(db.engine.pool, StaticPool):
+            for name in names:
+                timed_out = time.perf_counter() - started >= timeout
+                outcomes[name] = (TIMEOUT, [], 0.0) if timed_out else self._search_source(name, term, limit)
+        else:
+            app = current_app._get_current_object()
+            pool = self._pool()
+            futures = {pool.submit(self._search_source_isolated, app, name, term, limit): name for name in names}
+            done, pending = wait(futures, timeout=timeout)
+            for future in pending:
+                future.cancel()
+                outcomes[futures[future]] = (TIMEOUT, [], timeout)
+            for future in done:
+                outcomes[futures[future]] = future.result()
+
+        results = sorted((hit for _, hits, _ in outcomes.values() for hit in hits), key=lambda hit: hit["score"], reverse=True)
+        elapsed = time.perf_counter() - started
+        timed_out = [name for name in names if outcomes[name][0] == TIMEOUT]
+        if timed_out:
+            self.logger.warning(f"FederatedSearchService: {', '.join(timed_out)} missed the {timeout}s deadline for {term!r}")
+        self.logger.info(f"FederatedSearchService: Found {len(results)} hits for {term!r} in {elapsed:.3f}s")
+        return {
+            "results": results,
+            "sources": {
+                name: {"status": outcomes[name][0], "count": len(outcomes[name][1]), "elapsed_ms": round(outcomes[name][2] * 1000, 2)}
+                for name in names
+            },
+            "elapsed_ms": round(elapsed * 1000, 2),
+        }
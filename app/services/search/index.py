@@ -0,0 +1,405 @@
+# app/services/search/index.py
+import html
+import re
+from dataclasses import dataclass
+from functools import reduce
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import Integer, case, event, func, inspect, literal, literal_column, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import column, table
+
+from app.models.base import db
+from app.models.pages.company import Company
+from app.models.pages.contact import Contact
+from app.models.pages.note import Note
+from app.models.pages.opportunity import Opportunity
+from app.models.pages.srs import SRS
+from app.models.pages.task import Task
+from app.models.pages.user import User
+from app.services.service_base import ServiceBase, ServiceRegistry
+from app.utils.app_logging import get_logger
+
+logger = get_logger()
+
+SEARCH_INDEX_TABLE = "search_index"
+
+SEARCH_INDEX_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_INDEX_TABLE} USING fts5("
+    "title, body, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+)
+
+# bm25 column weights: matches in the title count triple.
+TITLE_WEIGHT = 3.0
+BODY_WEIGHT = 1.0
+
+DEFAULT_LIMIT = 20
+
+SNIPPET_START = "<mark>"
+SNIPPET_END = "</mark>"
+SNIPPET_ELLIPSIS = "…"
+SNIPPET_TOKENS = 12
+# snippet() copies the indexed text verbatim, so it marks matches with
+# private-use characters and highlight_snippet() escapes the text before
+# turning them into SNIPPET_START/SNIPPET_END.
+SNIPPET_OPEN_MARKER = "\ue000"
+SNIPPET_CLOSE_MARKER = "\ue001"
+
+# Each document's rowid is entity_id * ENTITY_SLOTS + the entity's code, so a
+# row can be found (and replaced) by rowid without a scan of the index.
+ENTITY_SLOTS = 16
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass(frozen=True)
+class SearchableEntity:
+    """How one model is represented in the search index."""
+
+    name: str
+    model: type
+    code: int
+    title_fields: Tuple[str, ...]
+    body_fields: Tuple[str, ...]
+    boost: float = 1.0
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return self.title_fields + self.body_fields
+
+    def rowid(self, entity_id: int) -> int:
+        return entity_id * ENTITY_SLOTS + self.code
+
+    def document(self, obj) -> Dict[str, Any]:
+        """Index row for a model instance."""
+        return {
+            "rowid": self.rowid(obj.id),
+            "title": " ".join(str(value) for value in (getattr(obj, name) for name in self.title_fields) if value),
+            "body": " ".join(str(value) for value in (getattr(obj, name) for name in self.body_fields) if value),
+        }
+
+    def document_columns(self):
+        """SQL expressions computing :meth:`document` for every row of the model's table."""
+
+        def joined(names):
+            if not names:
+                return literal("")
+            parts = [func.coalesce(getattr(self.model, name), "") for name in names]
+            return func.trim(reduce(lambda left, right: left + " " + right, parts))
+
+        return (self.model.id * ENTITY_SLOTS + self.code), joined(self.title_fields), joined(self.body_fields)
+
+
+# Codes are stored in the index; append new entities rather than renumbering.
+SEARCHABLE_ENTITIES: Tuple[SearchableEntity, ...] = (
+    SearchableEntity("companies", Company, 1, ("name",), ("description",), boost=1.5),
+    SearchableEntity("contacts", Contact, 2, ("first_name", "last_name"), ("email", "role", "primary_skill_area", "expertise_areas"), boost=1.5),
+    SearchableEntity("notes", Note, 3, (), ("content",), boost=0.8),
+    SearchableEntity("opportunities", Opportunity, 4, ("name",), ("description", "stage", "status"), boost=1.2),
+    SearchableEntity("tasks", Task, 5, ("title",), ("description",)),
+    SearchableEntity("users", User, 6, ("name", "username"), ("email",)),
+    SearchableEntity("srs", SRS, 7, ("question",), ("answer",), boost=0.8),
+)
+
+ENTITIES_BY_NAME = {entity.name: entity for entity in SEARCHABLE_ENTITIES}
+_ENTITIES_BY_MODEL = {entity.model: entity for entity in SEARCHABLE_ENTITIES}
+_ENTITIES_BY_CODE = {entity.code: entity for entity in SEARCHABLE_ENTITIES}
+
+_index_table = table(SEARCH_INDEX_TABLE, column("rowid"), column("title"), column("body"))
+
+# Engines on which the index has been confirmed to exist (and to hold
+# documents), reset whenever the schema is created or dropped so a recreated
+# database is re-checked.
+_index_engines: Dict[Tuple[int, str], bool] = {}
+_populated_engines: Set[Tuple[int, str]] = set()
+
+
+def build_match_query(term: str) -> str:
+    """
+    Convert free text into a safe FTS5 MATCH expression with prefix matching.
+
+    Each word is quoted (so FTS operators typed by the user are treated as text)
+    and suffixed with ``*``; all words must match.
+
+    Args:
+        term: Raw search text
+
+    Returns:
+        FTS5 query string, or an empty string if the term contains no words
+    """
+    return " ".join(f'"{token}"*' for token in _TOKEN_RE.findall(term or ""))
+
+
+def _engine_key(connection) -> Tuple[int, str]:
+    return id(connection.engine), str(connection.engine.url)
+
+
+def _reset_index_state() -> None:
+    _index_engines.clear()
+    _populated_engines.clear()
+
+
+def _index_is_empty(connection) -> bool:
+    return connection.execute(select(literal_column("rowid")).select_from(_index_table).limit(1)).first() is None
+
+
+def highlight_snippet(snippet: Optional[str]) -> Optional[str]:
+    """
+    Turn a marker-delimited FTS5 snippet into HTML-escaped text with ``<mark>`` highlights.
+
+    Args:
+        snippet: Output of ``snippet()`` called with SNIPPET_OPEN_MARKER and SNIPPET_CLOSE_MARKER
+
+    Returns:
+        HTML safe to render unescaped, or None for a missing snippet
+    """
+    if snippet is None:
+        return None
+    return html.escape(snippet).replace(SNIPPET_OPEN_MARKER, SNIPPET_START).replace(SNIPPET_CLOSE_MARKER, SNIPPET_END)
+
+
+def is_index_available(connection) -> bool:
+    """Check whether the search index exists on the connection's database."""
+    if connection.dialect.name != "sqlite":
+        return False
+
+    key = _engine_key(connection)
+    if key not in _index_engines:
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": SEARCH_INDEX_TABLE}
+        ).first()
+        _index_engines[key] = exists is not None
+    return _index_engines[key]
+
+
+def is_index_populated(connection) -> bool:
+    """
+    Check whether the search index exists and holds at least one document.
+
+    An empty index can't tell "no matches" from "never filled", so searches
+    treat it as unavailable. Only a populated index is remembered: the flush
+    hook keeps it filled from then on.
+    """
+    if not is_index_available(connection):
+        return False
+
+    key = _engine_key(connection)
+    if key not in _populated_engines:
+        if _index_is_empty(connection):
+            return False
+        _populated_engines.add(key)
+    return True
+
+
+def create_search_index(connection, rebuild: bool = True) -> bool:
+    """Create the cross-entity FTS5 search index if the database supports it.
+
+    Args:
+        connection: SQLAlchemy connection to run the DDL on.
+        rebuild: Populate the index from the entity tables if it holds no documents,
+            as after create_all() added it to a database that already had rows.
+
+    Returns:
+        bool: True if the index is available, False if FTS5 is not supported.
+    """
+    if connection.dialect.name != "sqlite":
+        return False
+
+    _reset_index_state()
+    try:
+        connection.execute(text(SEARCH_INDEX_DDL))
+        if rebuild and _index_is_empty(connection):
+            populate_search_index(connection)
+    except OperationalError as e:
+        logger.warning(f"Search index unavailable, falling back to LIKE search: {e}")
+        return False
+
+    return True
+
+
+def populate_search_index(connection, entities: Iterable[SearchableEntity] = SEARCHABLE_ENTITIES) -> Dict[str, int]:
+    """
+    Replace the indexed documents of ``entities`` with their current rows.
+
+    Each entity is reindexed with one DELETE and one INSERT ... SELECT.
+
+    Returns:
+        Number of documents indexed per entity name
+    """
+    counts = {}
+    for entity in entities:
+        connection.execute(_index_table.delete().where(literal_column("rowid") % ENTITY_SLOTS == entity.code))
+        result = connection.execute(
+            _index_table.insert().from_select(["rowid", "title", "body"], select(*entity.document_columns()))
+        )
+        counts[entity.name] = result.rowcount
+    return counts
+
+
+@event.listens_for(db.metadata, "after_create")
+def _create_search_index_after_create(target, connection, **kw):
+    """Attach the search index whenever the schema is created by create_all()."""
+    create_search_index(connection, rebuild=False)
+
+
+@event.listens_for(db.metadata, "after_drop")
+def _drop_search_index_after_drop(target, connection, **kw):
+    _reset_index_state()
+    if connection.dialect.name == "sqlite":
+        connection.execute(text(f"DROP TABLE IF EXISTS {SEARCH_INDEX_TABLE}"))
+
+
+@event.listens_for(Session, "after_flush")
+def _index_flushed_entities(session, flush_context):
+    """Keep the search index in step with ORM inserts, updates and deletes in the same transaction.
+
+    Bulk statements that bypass the flush are picked up by ``flask rebuild-search-index``.
+    """
+    stale, documents = [], []
+    for obj in chain(session.new, session.dirty, session.deleted):
+        entity = _ENTITIES_BY_MODEL.get(type(obj))
+        if entity is None or obj.id is None:
+            continue
+        if obj in session.deleted:
+            stale.append({"rowid": entity.rowid(obj.id)})
+            continue
+        if obj in session.dirty and not any(inspect(obj).attrs[name].history.has_changes() for name in entity.fields):
+            continue
+        stale.append({"rowid": entity.rowid(obj.id)})
+        documents.append(entity.document(obj))
+
+    if not stale:
+        return
+    connection = session.connection()
+    if not is_index_available(connection):
+        return
+    connection.execute(text(f"DELETE FROM {SEARCH_INDEX_TABLE} WHERE rowid = :rowid"), stale)
+    if documents:
+        connection.execute(text(f"INSERT INTO {SEARCH_INDEX_TABLE}(rowid, title, body) VALUES (:rowid, :title, :body)"), documents)
+
+
+class SearchIndexService(ServiceBase):
+    """Ranked full-text search across companies, contacts, notes, opportunities, tasks, users and SRS cards.
+
+    Documents are ranked by bm25 (title matches weighted over body matches)
+    scaled by a per-entity boost.
+    """
+
+    def is_available(self) -> bool:
+        """Check whether the index exists on the current database."""
+        return is_index_available(db.session.connection())
+
+    def is_populated(self) -> bool:
+        """Check whether the index exists and holds documents on the current database."""
+        return is_index_populated(db.session.connection())
+
+    def ranked_matches(self, term: str, entities: Optional[Sequence[SearchableEntity]] = None):
+        """
+        Build a subquery of (entity_code, entity_id, rank, title, snippet) rows matching a search term.
+
+        Snippets are raw: pass them through :func:`highlight_snippet` before display.
+
+        Args:
+            term: Raw search text; must contain at least one word
+            entities: Restrict matches to these entities, all by default
+
+        Returns:
+            Subquery ordered by nothing; lower ``rank`` is a better match
+        """
+        index_ref = literal_column(SEARCH_INDEX_TABLE)
+        rowid = literal_column(f"{SEARCH_INDEX_TABLE}.rowid", Integer)
+        code = rowid % ENTITY_SLOTS
+        boost = case({entity.code: entity.boost for entity in SEARCHABLE_ENTITIES}, value=code, else_=1.0)
+        query = select(
+            code.label("entity_code"),
+            (rowid // ENTITY_SLOTS).label("entity_id"),
+            (func.bm25(index_ref, TITLE_WEIGHT, BODY_WEIGHT) * boost).label("rank"),
+            literal_column("title"),
+            func.snippet(index_ref, -1, SNIPPET_OPEN_MARKER, SNIPPET_CLOSE_MARKER, SNIPPET_ELLIPSIS, SNIPPET_TOKENS).label("snippet"),
+        ).select_from(table(SEARCH_INDEX_TABLE)).where(index_ref.op("MATCH")(build_match_query(term)))
+        if entities is not None:
+            query = query.where(code.in_([entity.code for entity in entities]))
+        return query.subquery("search_matches")
+
+    def search(self, term: str, types: Optional[Iterable[str]] = None, limit: Optional[int] = DEFAULT_LIMIT, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Search every indexed entity, best matches first.
+
+        Args:
+            term: Raw search text
+            types: Entity names to search (e.g. "companies"), all by default
+            limit: Maximum number of hits to return, None for all
+            offset: Number of ranked hits to skip
+
+        Returns:
+            List of ``{"type", "id", "title", "snippet", "score"}`` hits;
+            higher scores are better matches
+
+        Raises:
+            ValueError: If ``types`` names an unknown entity
+        """
+        entities = None
+        if types is not None:
+            unknown = sorted(set(types) - set(ENTITIES_BY_NAME))
+            if unknown:
+                raise ValueError(f"Unknown search types: {', '.join(unknown)}")
+            entities = [ENTITIES_BY_NAME[name] for name in types]
+
+        if not build_match_query(term) or not self.is_available():
+            return []
+
+        matches = self.ranked_matches(term, entities)
+        query = select(matches).order_by(matches.c.rank).offset(offset or None)
+        if limit is not None:
+            query = query.limit(limit)
+        rows = db.session.execute(query).all()
+
+        self.logger.info(f"SearchIndexService: Found {len(rows)} hits for {term!r}")
+        return [
+            {
+                "type": _ENTITIES_BY_CODE[row.entity_code].name,
+                "id": row.entity_id,
+                "title": row.title,
+                "snippet": highlight_snippet(row.snippet),
+                "score": -row.rank,
+            }
+            for row in rows
+            if row.entity_code in _ENTITIES_BY_CODE
+        ]
+
+    def rebuild_index(self, types: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        Recreate the index if needed and reindex every row of the given entities.
+
+        Args:
+            types: Entity names to reindex, all by default
+
+        Returns:
+            Number of documents indexed per entity name, empty if FTS5 is unavailable
+        """
+        entities = SEARCHABLE_ENTITIES if types is None else [ENTITIES_BY_NAME[name] for name in types]
+        connection = db.session.connection()
+        if not create_search_index(connection, rebuild=False):
+            return {}
+        counts = populate_search_index(connection, entities)
+        db.session.commit()
+        self.logger.info(f"SearchIndexService: Rebuilt index with {sum(counts.values())} documents")
+        return counts
+
+
+@click.command("rebuild-search-index")
+@click.option("--type", "types", multiple=True, type=click.Choice([entity.name for entity in SEARCHABLE_ENTITIES]), help="Only reindex this entity (repeatable).")
+@with_appcontext
+def rebuild_search_index_command(types: Tuple[str, ...]) -> None:
+    """Rebuild the cross-entity full-text search index."""
+    click.echo(f"Rebuilding search index on {current_app.config['SQLALCHEMY_DATABASE_URI']}")
+    counts = ServiceRegistry.get(SearchIndexService).rebuild_index(types or None)
+    if not counts:
+        raise click.ClickException("The search index needs SQLite with FTS5")
+    for name, count in counts.items():
+        click.echo(f"{name}: {count} documents")
@@ -0,0 +1,292 @@
+# app/services/search/trigram.py
+import math
+import re
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import case, event, func, inspect, literal, select
+from sqlalchemy.orm import Session
+
+from app.models.base import db
+from app.models.pages.company import Company
+from app.models.pages.contact import Contact
+from app.models.pages.note import Note
+from app.models.trigram import trigram_documents, trigram_postings
+from app.services.search.index import ENTITIES_BY_NAME
+from app.services.service_base import ServiceBase, ServiceRegistry
+from app.utils.app_logging import get_logger
+
+logger = get_logger()
+
+DEFAULT_LIMIT = 20
+# Rows read, and postings written, per batch when rebuilding
+REBUILD_BATCH = 1000
+
+# Scoring: SIMILARITY is shared / all distinct trigrams of both texts, for
+# matching whole short values such as names. WORD_SIMILARITY is the share of
+# the query's trigrams found in the document, for finding words in long text.
+SIMILARITY = "similarity"
+WORD_SIMILARITY = "word_similarity"
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# Postings are written and deleted with plain executemany: at hundreds of rows
+# per document, compiling and binding each row through Core costs more than
+# the B-tree writes themselves.
+_INSERT_POSTINGS = "INSERT INTO trigram_postings (entity_code, trigram, entity_id) VALUES (?, ?, ?)"
+_DELETE_POSTINGS = "DELETE FROM trigram_postings WHERE entity_code = ? AND trigram = ? AND entity_id = ?"
+
+
+def trigrams(text: Optional[str]) -> FrozenSet[str]:
+    """
+    Distinct trigrams of a text.
+
+    Each word is lowercased and padded with two spaces in front and one
+    behind, so short words and word starts produce trigrams too.
+
+    Args:
+        text: Text to split
+
+    Returns:
+        Set of three-character strings
+    """
+    grams = set()
+    for word in _WORD_RE.findall((text or "").lower()):
+        padded = f"  {word} "
+        grams.update(padded[index : index + 3] for index in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+@dataclass(frozen=True)
+class TrigramSource:
+    """Which text of a model is indexed, and how it is scored."""
+
+    name: str
+    model: type
+    fields: Tuple[str, ...]
+    metric: str
+    threshold: float
+
+    @property
+    def code(self) -> int:
+        # Shared with the full-text search index
+        return ENTITIES_BY_NAME[self.name].code
+
+    def text(self, obj) -> str:
+        return " ".join(str(value) for value in (getattr(obj, name) for name in self.fields) if value)
+
+
+TRIGRAM_SOURCES: Tuple[TrigramSource, ...] = (
+    TrigramSource("notes", Note, ("content",), WORD_SIMILARITY, 0.6),
+    TrigramSource("contacts", Contact, ("first_name", "last_name"), SIMILARITY, 0.3),
+    TrigramSource("companies", Company, ("name",), SIMILARITY, 0.3),
+)
+
+SOURCES_BY_NAME = {source.name: source for source in TRIGRAM_SOURCES}
+_SOURCES_BY_MODEL = {source.model: source for source in TRIGRAM_SOURCES}
+_SOURCES_BY_CODE = {source.code: source for source in TRIGRAM_SOURCES}
+
+
+def _delete_documents(connection, code: int, entity_ids: List[int]) -> None:
+    """Remove documents and, looked up through their stored trigrams, their postings."""
+    for start in range(0, len(entity_ids), REBUILD_BATCH):
+        batch = entity_ids[start : start + REBUILD_BATCH]
+        documents = connection.execute(
+            select(trigram_documents.c.entity_id, trigram_documents.c.trigrams).where(
+                trigram_documents.c.entity_code == code, trigram_documents.c.entity_id.in_(batch)
+            )
+        ).all()
+        postings = sorted((code, grams[index : index + 3], entity_id) for entity_id, grams in documents for index in range(0, len(grams), 3))
+        if postings:
+            connection.exec_driver_sql(_DELETE_POSTINGS, postings)
+        connection.execute(trigram_documents.delete().where(trigram_documents.c.entity_code == code, trigram_documents.c.entity_id.in_(batch)))
+
+
+def _insert_documents(connection, code: int, documents: Iterable[Tuple[int, str]]) -> int:
+    """Index (entity id, text) pairs, writing postings in key order in batches. Returns the number of documents."""
+    postings, counts = [], []
+    for entity_id, text in documents:
+        grams = trigrams(text)
+        if not grams:
+            continue
+        counts.append({"entity_code": code, "entity_id": entity_id, "trigram_count": len(grams), "trigrams": "".join(grams)})
+        postings.extend((code, gram, entity_id) for gram in grams)
+        if len(postings) >= REBUILD_BATCH * 100:
+            connection.exec_driver_sql(_INSERT_POSTINGS, sorted(postings))
+            postings = []
+    if postings:
+        connection.exec_driver_sql(_INSERT_POSTINGS, sorted(postings))
+    if counts:
+        connection.execute(trigram_documents.insert(), counts)
+    return len(counts)
+
+
+def index_source(connection, source: TrigramSource) -> int:
+    """
+    Replace a source's postings with trigrams of its current rows.
+
+    Rows are read in id order, REBUILD_BATCH at a time, so memory stays
+    bounded however large the table is.
+
+    Returns:
+        Number of documents indexed
+    """
+    for table in (trigram_postings, trigram_documents):
+        connection.execute(table.delete().where(table.c.entity_code == source.code))
+
+    columns = [source.model.__table__.c[name] for name in source.fields]
+    id_column = source.model.__table__.c.id
+    indexed, last_id = 0, None
+    while True:
+        query = select(id_column, *columns).order_by(id_column).limit(REBUILD_BATCH)
+        if last_id is not None:
+            query = query.where(id_column > last_id)
+        rows = connection.execute(query).all()
+        if not rows:
+            return indexed
+        last_id = rows[-1][0]
+        indexed += _insert_documents(connection, source.code, ((row[0], " ".join(str(v) for v in row[1:] if v)) for row in rows))
+
+
+def ensure_trigram_index(connection) -> None:
+    """Populate the trigram index for databases that have rows but no postings yet."""
+    if connection.execute(select(trigram_documents.c.entity_id).limit(1)).first():
+        return
+    for source in TRIGRAM_SOURCES:
+        if connection.execute(select(source.model.__table__.c.id).limit(1)).first():
+            logger.info(f"Backfilling trigram index for {source.name}")
+            index_source(connection, source)
+
+
+@event.listens_for(Session, "after_flush")
+def _index_flushed_trigrams(session, flush_context):
+    """Reindex the text of flushed notes, contacts and companies in the same transaction."""
+    stale: Dict[int, List[int]] = {}
+    documents: Dict[int, List[Tuple[int, str]]] = {}
+    for obj in chain(session.new, session.dirty, session.deleted):
+        source = _SOURCES_BY_MODEL.get(type(obj))
+        if source is None or obj.id is None:
+            continue
+        if obj in session.dirty and not any(inspect(obj).attrs[name].history.has_changes() for name in source.fields):
+            continue
+        if obj not in session.new:
+            stale.setdefault(source.code, []).append(obj.id)
+        if obj not in session.deleted:
+            documents.setdefault(source.code, []).append((obj.id, source.text(obj)))
+
+    if not stale and not documents:
+        return
+    connection = session.connection()
+    for code, entity_ids in stale.items():
+        _delete_documents(connection, code, entity_ids)
+    for code, pairs in documents.items():
+        _insert_documents(connection, code, pairs)
+
+
+class TrigramSearchService(ServiceBase):
+    """Similarity-ranked fuzzy search over note content and contact and company names.
+
+    Text is split into trigrams stored in an inverted index table, so a query
+    reads only the posting lists of its own trigrams and tolerates typos and
+    partial words. Candidates are counted and pruned in SQL, so memory use does
+    not grow with the number of indexed rows.
+    """
+
+    def search(self, term: str, types: Optional[Iterable[str]] = None, threshold: Optional[float] = None,
+               limit: Optional[int] = DEFAULT_LIMIT) -> List[Dict[str, Any]]:
+        """
+        Find documents similar to a search term, most similar first.
+
+        Args:
+            term: Search text
+            types: Source names to search ("notes", "contacts", "companies"), all by default
+            threshold: Minimum similarity between 0 and 1; defaults per source
+                (0.6 of the term's trigrams for notes, 0.3 similarity for names)
+            limit: Maximum number of hits, None for all
+
+        Returns:
+            List of ``{"type", "id", "similarity"}`` hits
+
+        Raises:
+            ValueError: If ``types`` names an unknown source or the threshold is out of range
+        """
+        names = list(SOURCES_BY_NAME) if types is None else list(dict.fromkeys(types))
+        unknown = sorted(set(names) - set(SOURCES_BY_NAME))
+        if unknown:
+            raise ValueError(f"Unknown fuzzy search types: {', '.join(unknown)}")
+        if threshold is not None and not 0 <= threshold <= 1:
+            raise ValueError("threshold must be between 0 and 1")
+
+        grams = trigrams(term)
+        if not grams:
+            return []
+        sources = [SOURCES_BY_NAME[name] for name in names]
+        query_size = len(grams)
+
+        # Either metric needs at least threshold * |query| shared trigrams, so
+        # weaker candidates are dropped before the per-document join
+        thresholds = {source.code: source.threshold if threshold is None else threshold for source in sources}
+        minimum_shared = max(1, math.ceil(min(thresholds.values()) * query_size - 1e-9))
+
+        shared = (
+            select(trigram_postings.c.entity_code, trigram_postings.c.entity_id, func.count().label("shared"))
+            .where(trigram_postings.c.trigram.in_(grams), trigram_postings.c.entity_code.in_(list(thresholds)))
+            .group_by(trigram_postings.c.entity_code, trigram_postings.c.entity_id)
+            .having(func.count() >= minimum_shared)
+            .subquery("shared_trigrams")
+        )
+        word_similarity = shared.c.shared * 1.0 / query_size
+        similarity = shared.c.shared * 1.0 / (query_size + trigram_documents.c.trigram_count - shared.c.shared)
+        score = case(
+            *[(shared.c.entity_code == source.code, word_similarity if source.metric == WORD_SIMILARITY else similarity) for source in sources],
+            else_=literal(0.0),
+        ).label("similarity")
+        minimum = case(thresholds, value=shared.c.entity_code, else_=literal(1.0))
+
+        query = (
+            select(shared.c.entity_code, shared.c.entity_id, score)
+            .join(
+                trigram_documents,
+                (trigram_documents.c.entity_code == shared.c.entity_code) & (trigram_documents.c.entity_id == shared.c.entity_id),
+            )
+            .where(score >= minimum)
+            .order_by(score.desc(), shared.c.entity_code, shared.c.entity_id)
+        )
+        if limit is not None:
+            query = query.limit(limit)
+
+        rows = db.session.execute(query).all()
+        self.logger.info(f"TrigramSearchService: Found {len(rows)} documents similar to {term!r}")
+        return [{"type": _SOURCES_BY_CODE[row.entity_code].name, "id": row.entity_id, "similarity": round(row.similarity, 4)} for row in rows]
+
+    def rebuild_index(self, types: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        Reindex every row of the given sources.
+
+        Args:
+            types: Source names to reindex, all by default
+
+        Returns:
+            Number of documents indexed per source name
+        """
+        sources = TRIGRAM_SOURCES if types is None else [SOURCES_BY_NAME[name] for name in types]
+        connection = db.session.connection()
+        counts = {source.name: index_source(connection, source) for source in sources}
+        db.session.commit()
+        self.logger.info(f"TrigramSearchService: Rebuilt index with {sum(counts.values())} documents")
+        return counts
+
+
+@click.command("rebuild-trigram-index")
+@click.option("--type", "types", multiple=True, type=click.Choice([source.name for source in TRIGRAM_SOURCES]), help="Only reindex this source (repeatable).")
+@with_appcontext
+def rebuild_trigram_index_command(types: Tuple[str, ...]) -> None:
+    """Rebuild the trigram index used for fuzzy search."""
+    click.echo(f"Rebuilding trigram index on {current_app.config['SQLALCHEMY_DATABASE_URI']}")
+    counts = ServiceRegistry.get(TrigramSearchService).rebuild_index(types or None)
+    for name, count in counts.items():
+        click.echo(f"{name}: {count} documents")
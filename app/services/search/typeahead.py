@@ -0,0 +1,281 @@
+# app/services/search/typeahead.py
+import re
+import threading
+from bisect import bisect_left, insort
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.models.base import db
+from app.models.pages.company import Company
+from app.models.pages.contact import Contact
+from app.models.pages.user import User
+from app.services.service_base import ServiceBase, ServiceRegistry
+
+DEFAULT_LIMIT = 10
+# Commits changing more rows of a source than this reload its index instead of
+# inserting into the sorted arrays one row at a time
+MAX_INCREMENTAL_CHANGES = 1000
+
+# Keys starting the label, username or email rank above keys starting a later word
+PRIMARY = 0
+SECONDARY = 1
+
+# Sorts after every character, so (prefix + _MAX_CHAR,) bounds all keys starting with prefix
+_MAX_CHAR = "\U0010ffff"
+
+_SPACE_RE = re.compile(r"\s+")
+
+_SESSION_CHANGES_KEY = "typeahead_changes"
+
+
+def normalize(value: Optional[str]) -> str:
+    """Casefold and collapse whitespace so keys and queries compare alike."""
+    return _SPACE_RE.sub(" ", value or "").strip().casefold()
+
+
+@dataclass(frozen=True)
+class TypeaheadSource:
+    """Which columns of a model are suggested and matched."""
+
+    name: str
+    model: type
+    label_fields: Tuple[str, ...]
+    detail_field: Optional[str]
+    key_fields: Tuple[str, ...]
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return tuple(dict.fromkeys(self.label_fields + self.key_fields + ((self.detail_field,) if self.detail_field else ())))
+
+    def values(self, obj) -> Dict[str, Any]:
+        return {name: getattr(obj, name) for name in self.fields}
+
+    def entry(self, entity_id: int, values: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "type": self.name,
+            "id": entity_id,
+            "label": " ".join(str(values[name]) for name in self.label_fields if values[name]),
+            "detail": values[self.detail_field] if self.detail_field else None,
+        }
+
+    def keys(self, entry: Dict[str, Any], values: Dict[str, Any]) -> Set[Tuple[int, str]]:
+        """(tier, key) pairs: each whole value, and the label from each later word on."""
+        keys = {(PRIMARY, normalize(entry["label"]))}
+        keys.update((PRIMARY, normalize(values[name])) for name in self.key_fields if values[name])
+        words = normalize(entry["label"]).split(" ")
+        keys.update((SECONDARY, " ".join(words[index:])) for index in range(1, len(words)))
+        return {(tier, key) for tier, key in keys if key}
+
+
+TYPEAHEAD_SOURCES: Tuple[TypeaheadSource, ...] = (
+    TypeaheadSource("users", User, ("name",), "email", ("username", "email")),
+    TypeaheadSource("contacts", Contact, ("first_name", "last_name"), "email", ("email",)),
+    TypeaheadSource("companies", Company, ("name",), None, ()),
+)
+
+SOURCES_BY_NAME = {source.name: source for source in TYPEAHEAD_SOURCES}
+_SOURCES_BY_MODEL = {source.model: source for source in TYPEAHEAD_SOURCES}
+_SOURCES_BY_TABLE = {source.model.__tablename__: source for source in TYPEAHEAD_SOURCES}
+
+
+class PrefixIndex:
+    """Sorted (key, id) arrays for one source, searched by prefix with bisect."""
+
+    def __init__(self, source: TypeaheadSource):
+        self.source = source
+        self._keys: Dict[int, List[Tuple[str, int]]] = {PRIMARY: [], SECONDARY: []}
+        self._entries: Dict[int, Dict[str, Any]] = {}
+        self._entity_keys: Dict[int, Set[Tuple[int, str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self, rows: Iterable[Tuple[int, Dict[str, Any]]]) -> None:
+        """Fill an empty index, sorting each array once."""
+        for entity_id, values in rows:
+            entry = self.source.entry(entity_id, values)
+            self._entries[entity_id] = entry
+            self._entity_keys[entity_id] = self.source.keys(entry, values)
+            for tier, key in self._entity_keys[entity_id]:
+                self._keys[tier].append((key, entity_id))
+        for keys in self._keys.values():
+            keys.sort()
+
+    def upsert(self, entity_id: int, values: Dict[str, Any]) -> None:
+        self.remove(entity_id)
+        entry = self.source.entry(entity_id, values)
+        self._entries[entity_id] = entry
+        self._entity_keys[entity_id] = self.source.keys(entry, values)
+        for tier, key in self._entity_keys[entity_id]:
+            insort(self._keys[tier], (key, entity_id))
+
+    def remove(self, entity_id: int) -> None:
+        self._entries.pop(entity_id, None)
+        for tier, key in self._entity_keys.pop(entity_id, ()):
+            keys = self._keys[tier]
+            position = bisect_left(keys, (key, entity_id))
+            if position < len(keys) and keys[position] == (key, entity_id):
+                del keys[position]
+
+    def lookup(self, prefix: str, limit: int) -> List[Tuple[int, str, Dict[str, Any]]]:
+        """
+        Entries with a key starting with ``prefix``, primary keys first, then alphabetically by key.
+
+        Returns:
+            Up to ``limit`` (tier, matched key, entry) tuples, one per entity
+        """
+        matches, seen = [], set()
+        for tier in (PRIMARY, SECONDARY):
+            keys = self._keys[tier]
+            position = bisect_left(keys, (prefix,))
+            end = bisect_left(keys, (prefix + _MAX_CHAR,), position)
+            for key, entity_id in (keys[index] for index in range(position, end)):
+                if entity_id in seen:
+                    continue
+                seen.add(entity_id)
+                matches.append((tier, key, self._entries[entity_id]))
+                if len(matches) >= limit:
+                    return matches
+        return matches
+
+
+class TypeaheadService(ServiceBase):
+    """Per-process prefix index over user, contact and company names and emails.
+
+    Each database's index is loaded on first use with one narrow query per
+    source, then kept current from committed ORM changes, so lookups never
+    touch the database. Bulk statements that bypass the ORM drop the affected
+    source's index, which is reloaded on the next lookup.
+    """
+
+    def __init__(self):
+        """Initialize the typeahead service."""
+        super().__init__()
+        self._indexes: Dict[Tuple[int, str], Dict[str, PrefixIndex]] = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _engine_key(engine) -> Tuple[int, str]:
+        return id(engine), str(engine.url)
+
+    def _index(self, source: TypeaheadSource) -> PrefixIndex:
+        engine_key = self._engine_key(db.engine)
+        with self._lock:
+            indexes = self._indexes.setdefault(engine_key, {})
+            if source.name not in indexes:
+                columns = [getattr(source.model, name) for name in source.fields]
+                index = PrefixIndex(source)
+                index.load((row[0], dict(zip(source.fields, row[1:]))) for row in db.session.query(source.model.id, *columns))
+                indexes[source.name] = index
+                self.logger.info(f"TypeaheadService: Indexed {len(index)} {source.name}")
+            return indexes[source.name]
+
+    def suggest(self, query: str, types: Optional[Iterable[str]] = None, limit: int = DEFAULT_LIMIT) -> List[Dict[str, Any]]:
+        """
+        Suggest entities whose name, username or email starts with ``query``.
+
+        Words after the first in a name also match, ranked below matches on
+        the start of the name.
+
+        Args:
+            query: Typed prefix; case and extra whitespace are ignored
+            types: Source names to suggest from ("users", "contacts", "companies"), all by default
+            limit: Maximum number of suggestions
+
+        Returns:
+            List of ``{"type", "id", "label", "detail"}`` suggestions
+
+        Raises:
+            ValueError: If ``types`` names an unknown source
+        """
+        names = list(SOURCES_BY_NAME) if types is None else list(dict.fromkeys(types))
+        unknown = sorted(set(names) - set(SOURCES_BY_NAME))
+        if unknown:
+            raise ValueError(f"Unknown typeahead types: {', '.join(unknown)}")
+
+        prefix = normalize(query)
+        if not prefix or limit < 1:
+            return []
+
+        matches = []
+        for name in names:
+            index = self._index(SOURCES_BY_NAME[name])
+            with self._lock:
+                matches.extend(index.lookup(prefix, limit))
+        matches.sort(key=lambda match: (match[0], match[1]))
+        return [dict(entry) for _, _, entry in matches[:limit]]
+
+    def apply_changes(self, engine_key: Tuple[int, str], changes: Dict[Tuple[str, int], Optional[Dict[str, Any]]]) -> None:
+        """Apply committed upserts (values) and deletes (None) to a database's loaded indexes."""
+        with self._lock:
+            indexes = self._indexes.get(engine_key, {})
+            for (name, entity_id), values in changes.items():
+                index = indexes.get(name)
+                if index is None:
+                    continue
+                if values is None:
+                    index.remove(entity_id)
+                else:
+                    index.upsert(entity_id, values)
+
+    def invalidate(self, engine_key: Optional[Tuple[int, str]] = None, names: Optional[Iterable[str]] = None) -> None:
+        """Drop loaded indexes, all of them by default, so they are reloaded on next use."""
+        with self._lock:
+            for key in [engine_key] if engine_key is not None else list(self._indexes):
+                indexes = self._indexes.get(key, {})
+                for name in list(indexes) if names is None else names:
+                    indexes.pop(name, None)
+
+
+# -- Write tracking ------------------------------------------------------------
+
+
+def _pending_changes(session) -> Dict[Tuple[str, Optional[int]], Optional[Dict[str, Any]]]:
+    """This transaction's uncommitted changes, keyed by (source name, id); a None id marks the whole source stale."""
+    if _SESSION_CHANGES_KEY not in session.info:
+        session.info[_SESSION_CHANGES_KEY] = (TypeaheadService._engine_key(session.connection().engine), {})
+    return session.info[_SESSION_CHANGES_KEY][1]
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_typeahead_changes(session, flush_context):
+    """Remember the indexed values of flushed users, contacts and companies until commit."""
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        source = _SOURCES_BY_MODEL.get(type(obj))
+        if source is None or obj.id is None:
+            continue
+        if obj in session.dirty and not any(inspect(obj).attrs[name].history.has_changes() for name in source.fields):
+            continue
+        _pending_changes(session)[(source.name, obj.id)] = None if obj in session.deleted else source.values(obj)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_on_bulk_writes(orm_execute_state):
+    """Bulk ORM insert/update/delete statements bypass the flush."""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        source = _SOURCES_BY_TABLE.get(getattr(getattr(orm_execute_state.statement, "table", None), "name", None))
+        if source is not None:
+            _pending_changes(orm_execute_state.session)[(source.name, None)] = None
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_typeahead_changes(session):
+    engine_key, changes = session.info.pop(_SESSION_CHANGES_KEY, (None, None))
+    if not changes:
+        return
+
+    service = ServiceRegistry.get(TypeaheadService)
+    per_source = Counter(name for name, _ in changes)
+    stale = {name for name, entity_id in changes if entity_id is None or per_source[name] > MAX_INCREMENTAL_CHANGES}
+    if stale:
+        service.invalidate(engine_key, stale)
+    service.apply_changes(engine_key, {key: values for key, values in changes.items() if key[0] not in stale})
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_typeahead_changes(session, previous_transaction):
+    session.info.pop(_SESSION_CHANGES_KEY, None)
@@ -5,6 +5,8 @@ from typing import Any, Dict, List, Optional, Type, TypeVar, Union
 from sqlalchemy.orm import Query
 from app.utils.app_logging import get_logger
 from app.models.base import db
+from app.services.analytics import monthly_growth
+from app.services.analytics_cache import cached_analytics
 
 # Generic type for model
 T = TypeVar("T")
@@ -389,4 +391,19 @@ class BaseFeatureService(CRUDService):
         """Get common statistics for the entity."""
         return {
             "total_count": self.count()
-        }
\ No newline at end of file
+        }
+
+    @cached_analytics(lambda service: [service.model_class.__tablename__])
+    def prepare_growth_data(self, months_back=6):
+        """
+        Get new and cumulative entity counts per month for the growth chart.
+
+        Args:
+            months_back: Number of months to include, ending with the current one
+
+        Returns:
+            Dictionary with labels plus new_<table> and total_<table> series
+        """
+        name = self.model_class.__tablename__
+        series = monthly_growth(self.model_class.created_at, months_back)
+        return {"labels": series["labels"], f"new_{name}": series["new"], f"total_{name}": series["total"]}
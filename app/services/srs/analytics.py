@@ -4,6 +4,7 @@ from typing import Dict, List, Any, Optional, Union
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from app.models.pages.srs import SRS, ReviewHistory
+from app.services.analytics_cache import cached_analytics
 from app.services.service_base import ServiceBase
 from app.services.srs.constants import (
     DEFAULT_EASE_FACTOR,
@@ -11,6 +12,10 @@ from app.services.srs.constants import (
 )
 from app.models import db
 
+SRS_TABLES = ["srs", "review_history"]
+# Due counts move with the clock as well as with writes
+DUE_COUNTS_TTL = 60
+
 
 class SRSAnalyticsService(ServiceBase):
     """Service for SRS metrics, analytics, and statistical calculations."""
@@ -164,6 +169,7 @@ class SRSAnalyticsService(ServiceBase):
         self.logger.info(f"SRSAnalyticsService: Total consecutive perfect reviews: {consecutive_count}")
         return consecutive_count
 
+    @cached_analytics(SRS_TABLES)
     def get_learning_progress_data(self, months: int = 7) -> Dict[str, Any]:
         """
         Get historical learning progress data for charts.
@@ -256,6 +262,7 @@ class SRSAnalyticsService(ServiceBase):
         self.logger.info(f"SRSAnalyticsService: Total cards mastered this month: {result}")
         return result
 
+    @cached_analytics(SRS_TABLES, ttl=DUE_COUNTS_TTL)
     def get_stats(self) -> Dict[str, int]:
         """
         Get current SRS system statistics.
@@ -279,6 +286,7 @@ class SRSAnalyticsService(ServiceBase):
         self.logger.info(f"SRSAnalyticsService: Returning statistics: {stats}")
         return stats
 
+    @cached_analytics(SRS_TABLES, ttl=DUE_COUNTS_TTL)
     def get_detailed_stats(self) -> Dict[str, Any]:
         """
         Get detailed learning statistics for analysis.
@@ -348,6 +356,7 @@ class SRSAnalyticsService(ServiceBase):
         self.logger.info(f"SRSAnalyticsService: Found {count} reviews completed today")
         return count
 
+    @cached_analytics(SRS_TABLES)
     def get_learning_stages_counts(self) -> Dict[str, int]:
         """
         Get counts of cards by learning stage.
@@ -379,6 +388,7 @@ class SRSAnalyticsService(ServiceBase):
         self.logger.info(f"SRSAnalyticsService: Learning stage counts: {counts}")
         return counts
 
+    @cached_analytics(SRS_TABLES)
     def get_difficulty_counts(self) -> Dict[str, int]:
         """
         Get counts of cards by difficulty level.
@@ -406,6 +416,7 @@ class SRSAnalyticsService(ServiceBase):
         self.logger.info(f"SRSAnalyticsService: Difficulty counts: {counts}")
         return counts
 
+    @cached_analytics(SRS_TABLES)
     def get_performance_counts(self) -> Dict[str, int]:
         """
         Get counts of cards by performance level.
@@ -437,6 +448,7 @@ class SRSAnalyticsService(ServiceBase):
         self.logger.info(f"SRSAnalyticsService: Performance counts: {counts}")
         return counts
 
+    @cached_analytics(SRS_TABLES)
     def get_streak_days(self) -> int:
         """
         Calculate the current streak of consecutive days with SRS reviews.
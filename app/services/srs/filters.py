@@ -3,9 +3,10 @@
 from typing import Dict, List, Optional, Any, Union
 from datetime import datetime
 from zoneinfo import ZoneInfo
-from sqlalchemy import func
+from sqlalchemy import case, func
 from app.models.pages.srs import SRS, ReviewHistory
-from app.services.service_base import QueryService
+from app.services.service_base import QueryService, ServiceRegistry
+from app.services.srs.search import SRSSearchService
 from app.services.srs.constants import (
     LEARNING_THRESHOLD,
     REVIEWING_THRESHOLD,
@@ -56,11 +57,12 @@ class SRSFilterService(QueryService):
                 self.logger.info(f"SRSFilterService: Applying category filter: {filters['category']}")
                 query = query.filter(SRS.notable_type == filters["category"])
 
-            # Text search in question or answer
+            # Text search in question or answer; ranked by relevance unless an explicit sort is requested
+            ranked = False
             if filters.get("search"):
-                search_term = f"%{filters['search']}%"
                 self.logger.info(f"SRSFilterService: Applying search filter: {filters['search']}")
-                query = query.filter((SRS.question.ilike(search_term)) | (SRS.answer.ilike(search_term)))
+                search_service = ServiceRegistry.get(SRSSearchService)
+                query, ranked = search_service.apply_search(query, filters["search"], order_by_rank="sort_by" not in filters)
 
             # Interval range
             query = self.apply_numeric_range(query, SRS.interval, filters.get("min_interval"), filters.get("max_interval"))
@@ -69,7 +71,8 @@ class SRSFilterService(QueryService):
             query = self.apply_numeric_range(query, SRS.ease_factor, filters.get("min_ease"), filters.get("max_ease"))
 
             # Sort order
-            query = self.apply_sort(query, filters.get("sort_by", "next_review_at"), filters.get("sort_order", "asc"))
+            if not ranked or "sort_by" in filters:
+                query = self.apply_sort(query, filters.get("sort_by", "next_review_at"), filters.get("sort_order", "asc"))
 
         # Execute query
         result = query.all()
@@ -84,7 +87,7 @@ class SRSFilterService(QueryService):
             List of all due SRS items
         """
         self.logger.info("SRSFilterService: Retrieving all due SRS items")
-        items = SRS.query.filter(SRS.next_review_at.isnot(None), SRS.next_review_at <= datetime.now(ZoneInfo("UTC"))).all()
+        items = self._due_query().all()
 
         self.logger.info(f"SRSFilterService: Found {len(items)} due items")
         return items
@@ -219,10 +222,41 @@ class SRSFilterService(QueryService):
         self.logger.info(f"SRSFilterService: Found {len(items)} items of type '{type_name}'")
         return items
 
+    def _due_query(self):
+        """Build the base query for cards whose review is due now."""
+        return SRS.query.filter(SRS.next_review_at.isnot(None), SRS.next_review_at <= datetime.now(ZoneInfo("UTC")))
+
+    def _due_mix_query(self):
+        """
+        Build the 'due_mix' query: roughly a third of each category's due cards (at least one).
+
+        Cards are ranked within their category by how overdue they are, and the result
+        interleaves categories by that rank so any LIMIT still yields a mix.
+        """
+        ranked = (
+            self._due_query()
+            .with_entities(
+                SRS.id.label("srs_id"),
+                func.row_number().over(partition_by=SRS.notable_type, order_by=(SRS.next_review_at, SRS.id)).label("position"),
+                func.count().over(partition_by=SRS.notable_type).label("category_size"),
+            )
+            .subquery("ranked_due")
+        )
+        category_limit = case((ranked.c.category_size < 3, 1), else_=ranked.c.category_size / 3)
+
+        return (
+            SRS.query.join(ranked, SRS.id == ranked.c.srs_id)
+            .filter(ranked.c.position <= category_limit)
+            .order_by(ranked.c.position, SRS.next_review_at, SRS.id)
+        )
+
     def get_review_strategy(self, strategy_name: str, limit: Optional[int] = None) -> List[SRS]:
         """
         Get cards based on various predefined review strategies.
 
+        Selection, ordering and the limit all run in the database, so only the
+        returned cards are loaded.
+
         Args:
             strategy_name: Name of the review strategy ('due_mix', 'priority_first',
                           'hard_cards_first', 'mastery_boost', 'struggling_focus', 'new_mix')
@@ -235,91 +269,47 @@ class SRSFilterService(QueryService):
             ValueError: If the strategy_name parameter is invalid
         """
         self.logger.info(f"SRSFilterService: Getting cards using review strategy: {strategy_name}, limit: {limit}")
-        cards = []
+        success_rate = SRS.successful_reps * 100 / SRS.review_count
 
         if strategy_name == "due_mix":
             # A mix of cards from different categories that are due
             self.logger.info("SRSFilterService: Applying 'due_mix' strategy")
-            due_cards = self.get_due_items()
-            categories = {}
-
-            # Group by category
-            for card in due_cards:
-                if card.notable_type not in categories:
-                    categories[card.notable_type] = []
-                categories[card.notable_type].append(card)
-
-            self.logger.info(f"SRSFilterService: Found cards in {len(categories)} categories: {list(categories.keys())}")
-
-            # Get a mix of cards from each category
-            for category, category_cards in categories.items():
-                # Take about 1/3 of cards from each category, but at least 1
-                category_limit = max(1, len(category_cards) // 3)
-                self.logger.info(f"SRSFilterService: Taking {category_limit} cards from category '{category}'")
-                cards.extend(category_cards[:category_limit])
+            query = self._due_mix_query()
 
         elif strategy_name == "priority_first":
             # Cards that are most overdue first
             self.logger.info("SRSFilterService: Applying 'priority_first' strategy (most overdue first)")
-            cards = (
-                SRS.query.filter(SRS.next_review_at.isnot(None), SRS.next_review_at <= datetime.now(ZoneInfo("UTC")))
-                .order_by(SRS.next_review_at)
-                .all()
-            )
+            query = self._due_query().order_by(SRS.next_review_at)
 
         elif strategy_name == "hard_cards_first":
             # Focus on difficult cards first
             self.logger.info("SRSFilterService: Applying 'hard_cards_first' strategy (ease_factor <= 1.7)")
-            cards = (
-                SRS.query.filter(
-                    SRS.next_review_at.isnot(None), SRS.next_review_at <= datetime.now(ZoneInfo("UTC")), SRS.ease_factor <= 1.7
-                )
-                .order_by(SRS.ease_factor)
-                .all()
-            )
+            query = self._due_query().filter(SRS.ease_factor <= 1.7).order_by(SRS.ease_factor)
 
         elif strategy_name == "mastery_boost":
             # Cards that are close to mastery (interval between 15-21 days)
             self.logger.info("SRSFilterService: Applying 'mastery_boost' strategy (interval between 15-21 days)")
-            cards = (
-                SRS.query.filter(
-                    SRS.next_review_at.isnot(None),
-                    SRS.next_review_at <= datetime.now(ZoneInfo("UTC")),
-                    SRS.interval >= 15,
-                    SRS.interval <= 21,
-                )
-                .order_by(SRS.interval.desc())
-                .all()
-            )
+            query = self._due_query().filter(SRS.interval >= 15, SRS.interval <= 21).order_by(SRS.interval.desc())
 
         elif strategy_name == "struggling_focus":
             # Focus on cards with low success rate
             self.logger.info("SRSFilterService: Applying 'struggling_focus' strategy (success rate < 70%)")
-            cards = (
-                SRS.query.filter(
-                    SRS.next_review_at.isnot(None),
-                    SRS.next_review_at <= datetime.now(ZoneInfo("UTC")),
-                    SRS.review_count > 2,
-                    (SRS.successful_reps * 100 / SRS.review_count) < 70,
-                )
-                .order_by((SRS.successful_reps * 100 / SRS.review_count))
-                .all()
-            )
+            query = self._due_query().filter(SRS.review_count > 2, success_rate < 70).order_by(success_rate)
 
         elif strategy_name == "new_mix":
             # Mix of new and due cards
             self.logger.info("SRSFilterService: Applying 'new_mix' strategy (mix of new and due cards)")
-            new_cards = SRS.query.filter(SRS.review_count == 0).limit(5).all()
+            new_limit = min(5, limit) if limit else 5
+            new_cards = SRS.query.filter(SRS.review_count == 0).limit(new_limit).all()
             self.logger.info(f"SRSFilterService: Found {len(new_cards)} new cards")
 
-            due_cards = (
-                SRS.query.filter(SRS.next_review_at.isnot(None), SRS.next_review_at <= datetime.now(ZoneInfo("UTC")), SRS.review_count > 0)
-                .limit(10)
-                .all()
-            )
+            due_limit = min(10, limit - len(new_cards)) if limit else 10
+            due_cards = self._due_query().filter(SRS.review_count > 0).limit(due_limit).all() if due_limit > 0 else []
             self.logger.info(f"SRSFilterService: Found {len(due_cards)} due cards")
 
             cards = new_cards + due_cards
+            self.logger.info(f"SRSFilterService: Strategy '{strategy_name}' returned {len(cards)} cards")
+            return cards
 
         else:
             self.logger.error(f"SRSFilterService: Unknown review strategy: {strategy_name}")
@@ -328,8 +318,9 @@ class SRSFilterService(QueryService):
         # Apply limit if specified
         if limit:
             self.logger.info(f"SRSFilterService: Limiting result to {limit} cards")
-            cards = cards[:limit]
+            query = query.limit(limit)
 
+        cards = query.all()
         self.logger.info(f"SRSFilterService: Strategy '{strategy_name}' returned {len(cards)} cards")
         return cards
 
@@ -344,11 +335,10 @@ class SRSFilterService(QueryService):
             List of SRS items due for review
         """
         self.logger.info(f"SRSFilterService: Getting due cards with limit: {limit}")
-        due_items = self.get_due_items()
-        self.logger.info(f"SRSFilterService: Found {len(due_items)} due items")
-
-        if limit is not None:
-            self.logger.info(f"SRSFilterService: Limiting to {limit} items")
-            return due_items[:limit]
+        if limit is None:
+            return self.get_due_items()
 
+        self.logger.info(f"SRSFilterService: Limiting to {limit} items")
+        due_items = self._due_query().limit(limit).all()
+        self.logger.info(f"SRSFilterService: Found {len(due_items)} due items")
         return due_items
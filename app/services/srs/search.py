@@ -0,0 +1,181 @@
+"""Full-text search service for SRS cards backed by SQLite FTS5."""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event, func, literal_column, or_, text
+from sqlalchemy.orm import Query
+from sqlalchemy.sql import column, table
+
+from app.models.base import db
+from app.models.pages.srs import SRS, SRS_FTS_TABLE, create_srs_fts_index
+from app.services.search import SearchService
+from app.services.search.index import SNIPPET_CLOSE_MARKER, SNIPPET_OPEN_MARKER, highlight_snippet
+
+# bm25 column weights: matches in the question count double.
+QUESTION_WEIGHT = 2.0
+ANSWER_WEIGHT = 1.0
+
+SNIPPET_ELLIPSIS = "…"
+SNIPPET_TOKENS = 12
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Engines on which the FTS table has been confirmed to exist. Cleared whenever the
+# srs table is created or dropped so a recreated schema is re-checked.
+_fts_engines: Dict[str, bool] = {}
+
+
+@event.listens_for(SRS.__table__, "after_create")
+@event.listens_for(SRS.__table__, "after_drop")
+def _reset_fts_state(target, connection, **kw):
+    _fts_engines.clear()
+
+
+class SRSSearchService(SearchService):
+    """Ranked full-text search over SRS question/answer text.
+
+    Uses an FTS5 external-content index with bm25 ranking, prefix matching and
+    snippet highlighting. Databases without FTS5 fall back to ILIKE matching.
+    """
+
+    def __init__(self):
+        """Initialize the SRS search service."""
+        super().__init__(SRS, ["question", "answer"])
+
+    @staticmethod
+    def build_match_query(term: str) -> str:
+        """
+        Convert free text into a safe FTS5 MATCH expression with prefix matching.
+
+        Each word is quoted (so FTS operators typed by the user are treated as text)
+        and suffixed with ``*``; all words must match.
+
+        Args:
+            term: Raw search text
+
+        Returns:
+            FTS5 query string, or an empty string if the term contains no words
+        """
+        tokens = _TOKEN_RE.findall(term or "")
+        return " ".join(f'"{token}"*' for token in tokens)
+
+    def is_fts_available(self) -> bool:
+        """
+        Check whether the FTS index exists on the current database.
+
+        Returns:
+            True if ranked full-text search can be used
+        """
+        engine = db.engine
+        if engine.dialect.name != "sqlite":
+            return False
+
+        key = str(engine.url)
+        if key not in _fts_engines:
+            exists = db.session.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": SRS_FTS_TABLE}
+            ).first()
+            _fts_engines[key] = exists is not None
+            self.logger.info(f"SRSSearchService: FTS index {'available' if exists else 'unavailable'} on {engine.url}")
+        return _fts_engines[key]
+
+    def _ranked_matches(self, match_query: str):
+        """Build a subquery of (srs_id, rank, snippet) rows for a MATCH expression."""
+        fts = table(SRS_FTS_TABLE, column("rowid"))
+        fts_ref = literal_column(SRS_FTS_TABLE)
+        return (
+            db.select(
+                fts.c.rowid.label("srs_id"),
+                func.bm25(fts_ref, QUESTION_WEIGHT, ANSWER_WEIGHT).label("rank"),
+                func.snippet(fts_ref, -1, SNIPPET_OPEN_MARKER, SNIPPET_CLOSE_MARKER, SNIPPET_ELLIPSIS, SNIPPET_TOKENS).label("snippet"),
+            )
+            .where(fts_ref.op("MATCH")(match_query))
+            .subquery("srs_matches")
+        )
+
+    def apply_search(self, query: Query, term: str, order_by_rank: bool = True) -> Tuple[Query, bool]:
+        """
+        Restrict an SRS query to cards matching the search term.
+
+        Args:
+            query: Base SRS query
+            term: Raw search text
+            order_by_rank: Order results by bm25 relevance when FTS is used
+
+        Returns:
+            Tuple of (filtered query, whether FTS ranking was applied)
+        """
+        match_query = self.build_match_query(term)
+        if not match_query or not self.is_fts_available():
+            pattern = f"%{term}%"
+            return query.filter(or_(SRS.question.ilike(pattern), SRS.answer.ilike(pattern))), False
+
+        matches = self._ranked_matches(match_query)
+        query = query.join(matches, SRS.id == matches.c.srs_id)
+        if order_by_rank:
+            query = query.order_by(matches.c.rank)
+        return query, True
+
+    def search(
+        self, term: str, filters: Optional[Dict[str, Any]] = None, limit: Optional[int] = None, offset: int = 0
+    ) -> List[SRS]:
+        """
+        Search SRS cards, best matches first.
+
+        Matched cards carry ``search_rank`` (bm25, lower is better) and
+        ``search_snippet`` (HTML-escaped excerpt with ``<mark>`` highlights)
+        attributes when FTS is used.
+
+        Args:
+            term: Raw search text
+            filters: Optional exact-match filters {column: value}
+            limit: Optional maximum number of cards to return
+            offset: Number of ranked results to skip
+
+        Returns:
+            List of matching SRS items
+        """
+        if not term or not self.build_match_query(term) or not self.is_fts_available():
+            items = super().search(term, filters)
+            return items[offset : offset + limit] if limit else items[offset:]
+
+        self.logger.info(f"SRSSearchService: Full-text search for {term!r}")
+        matches = self._ranked_matches(self.build_match_query(term))
+        query = (
+            db.session.query(SRS, matches.c.rank, matches.c.snippet)
+            .join(matches, SRS.id == matches.c.srs_id)
+            .order_by(matches.c.rank)
+        )
+
+        for col, val in (filters or {}).items():
+            if hasattr(SRS, col) and val is not None:
+                query = query.filter(getattr(SRS, col) == val)
+
+        if offset:
+            query = query.offset(offset)
+        if limit:
+            query = query.limit(limit)
+
+        items = []
+        for item, rank, snippet in query.all():
+            item.search_rank = rank
+            item.search_snippet = highlight_snippet(snippet)
+            items.append(item)
+
+        self.logger.info(f"SRSSearchService: Found {len(items)} cards matching {term!r}")
+        return items
+
+    def rebuild_index(self) -> bool:
+        """
+        Rebuild the FTS index from the srs table.
+
+        Returns:
+            True if the index was rebuilt, False if FTS is unavailable
+        """
+        _fts_engines.clear()
+        available = create_srs_fts_index(db.session.connection(), rebuild=False)
+        if available:
+            db.session.execute(text(f"INSERT INTO {SRS_FTS_TABLE}({SRS_FTS_TABLE}) VALUES ('rebuild')"))
+        db.session.commit()
+        return available
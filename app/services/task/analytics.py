@@ -1,11 +1,31 @@
 # app/services/task/analytics.py
 
 from datetime import datetime, timedelta
-from sqlalchemy import func
-from app.models.pages.task import Task
+from sqlalchemy import case, func, literal, select, union_all
+from app.models.pages.task import OPEN_STATUSES, Task, TaskPriority, TaskStatus
 from app.models.base import db
+from app.services.analytics import (
+    DAY,
+    DEFAULT_LABEL_FORMATS,
+    EngagementSegmentation,
+    bucket_key,
+    bucket_starts,
+    segment_counts,
+)
+from app.services.analytics_cache import cached_analytics
 from app.services.service_base import ServiceBase
 
+STATUS_SEGMENTS = {
+    "Completed": TaskStatus.COMPLETED.value,
+    "In Progress": TaskStatus.IN_PROGRESS.value,
+    "Pending": TaskStatus.PENDING.value,
+    "Deferred": TaskStatus.DEFERRED.value,
+    "Cancelled": TaskStatus.CANCELLED.value,
+}
+PRIORITIES = tuple(priority.value for priority in TaskPriority)
+# Key of the group collecting events before the requested window; sorts before every day
+_BASELINE_KEY = ""
+
 
 class TaskAnalyticsService(ServiceBase):
     """Service for task analytics and statistics."""
@@ -18,132 +38,134 @@ class TaskAnalyticsService(ServiceBase):
         """Get the total number of tasks."""
         return Task.query.count()
 
+    @cached_analytics(["tasks"])
+    def get_task_counts(self):
+        """
+        Count tasks by status, priority and due date in one query.
+
+        Returns:
+            Dictionary with a count per status and priority value plus
+            total, overdue (open and past due) and due_today counts
+        """
+        today = datetime.now().date()
+        return EngagementSegmentation(Task).counts(
+            {
+                **{status: Task.status == status for status in STATUS_SEGMENTS.values()},
+                **{priority: Task.priority == priority for priority in PRIORITIES},
+                "overdue": db.and_(Task.status.in_(OPEN_STATUSES), Task.due_date < today),
+                "due_today": Task.due_date == today,
+            }
+        )
+
     def get_dashboard_statistics(self):
         """Get statistics for the tasks dashboard."""
-        total_tasks = self.get_total_tasks()
-
+        counts = self.get_task_counts()
         return {
-            "total_tasks": total_tasks,
-            "completed_tasks": db.session.query(Task).filter(Task.status == "completed").count(),
-            "in_progress_tasks": db.session.query(Task).filter(Task.status == "in_progress").count(),
-            "pending_tasks": db.session.query(Task).filter(Task.status == "pending").count(),
-            "overdue_tasks": db.session.query(Task).filter(Task.due_date < datetime.now().date(),
-                                                           Task.status != "completed").count(),
-            "due_today": db.session.query(Task).filter(Task.due_date == datetime.now().date()).count(),
+            "total_tasks": counts["total"],
+            "completed_tasks": counts["completed"],
+            "in_progress_tasks": counts["in_progress"],
+            "pending_tasks": counts["pending"],
+            "overdue_tasks": counts["overdue"],
+            "due_today": counts["due_today"],
         }
 
     def get_top_tasks(self, limit=5):
-        """Get top tasks by priority."""
+        """Get open tasks by priority (urgent first), then due date."""
         return (
             db.session.query(Task)
-            .filter(Task.status != "completed")
+            .filter(Task.status.in_(OPEN_STATUSES))
             .order_by(
-                Task.priority.desc(),
+                Task.priority_rank().desc(),
                 Task.due_date.asc()
             )
             .limit(limit)
             .all()
         )
 
+    @cached_analytics(["tasks"])
     def get_engagement_segments(self):
-        """Get task segments by status."""
-        total_tasks = self.get_total_tasks()
-
-        completed_count = db.session.query(Task).filter(Task.status == "completed").count()
-        in_progress_count = db.session.query(Task).filter(Task.status == "in_progress").count()
-        pending_count = db.session.query(Task).filter(Task.status == "pending").count()
+        """Get task segments by status, including unknown and unset statuses."""
+        return segment_counts(Task, Task.status, STATUS_SEGMENTS)
+
+    @cached_analytics(["tasks"])
+    def get_daily_series(self, start, end):
+        """
+        Tasks created, completed and overdue per day, from one grouped query.
+
+        Creation, completion and overdue start/end are unioned into a single
+        stream of daily events: a task becomes overdue the day after its due
+        date and stops being overdue the day it is completed. Events before
+        ``start`` are folded into one baseline group so the overdue running
+        total is correct from the first day.
+
+        Args:
+            start: First day of the window (date)
+            end: Last day of the window (date, inclusive)
+
+        Returns:
+            Dictionary with "keys", "labels", "new_tasks" and "completed_tasks"
+            (per day) and "overdue_tasks" (open and past due at the end of each day)
+        """
+        due_plus_one = func.date(Task.due_date, "+1 day")
+        went_overdue = db.or_(Task.completed_at.is_(None), func.date(Task.completed_at) >= due_plus_one)
+        events = union_all(
+            select(func.date(Task.created_at).label("day"), literal(1).label("created"), literal(0).label("completed"),
+                   literal(0).label("overdue")).where(Task.created_at.isnot(None)),
+            select(func.date(Task.completed_at), literal(0), literal(1), literal(0)).where(Task.completed_at.isnot(None)),
+            select(due_plus_one, literal(0), literal(0), literal(1)).where(
+                Task.due_date.isnot(None), Task.status != TaskStatus.CANCELLED.value, went_overdue
+            ),
+            select(func.date(Task.completed_at), literal(0), literal(0), literal(-1)).where(
+                Task.due_date.isnot(None), Task.completed_at.isnot(None), func.date(Task.completed_at) >= due_plus_one
+            ),
+        ).subquery()
+
+        first, last = start.isoformat(), end.isoformat()
+        key = case((events.c.day < first, _BASELINE_KEY), else_=events.c.day).label("day")
+        rows = {
+            row.day: row
+            for row in db.session.query(
+                key,
+                func.sum(events.c.created).label("created"),
+                func.sum(events.c.completed).label("completed"),
+                func.sum(func.sum(events.c.overdue)).over(order_by=key).label("overdue"),
+            )
+            .filter(events.c.day <= last)
+            .group_by(key)
+            .all()
+        }
 
-        return [
-            {
-                "name": "Completed",
-                "count": completed_count,
-                "percentage": self._calculate_percentage(completed_count, total_tasks),
-            },
-            {
-                "name": "In Progress",
-                "count": in_progress_count,
-                "percentage": self._calculate_percentage(in_progress_count, total_tasks),
-            },
-            {
-                "name": "Pending",
-                "count": pending_count,
-                "percentage": self._calculate_percentage(pending_count, total_tasks),
-            },
-        ]
+        baseline = rows.get(_BASELINE_KEY)
+        overdue = baseline.overdue if baseline else 0
+        series = {"keys": [], "labels": [], "new_tasks": [], "completed_tasks": [], "overdue_tasks": []}
+        first_day = datetime.combine(start, datetime.min.time())
+        for day in bucket_starts(first_day, datetime.combine(end, datetime.min.time()) + timedelta(days=1), DAY):
+            day_key = bucket_key(day, DAY)
+            row = rows.get(day_key)
+            if row is not None:
+                overdue = row.overdue
+            series["keys"].append(day_key)
+            series["labels"].append(day.strftime(DEFAULT_LABEL_FORMATS[DAY]))
+            series["new_tasks"].append(row.created if row is not None else 0)
+            series["completed_tasks"].append(row.completed if row is not None else 0)
+            series["overdue_tasks"].append(overdue)
+        return series
 
     def prepare_completion_data(self, days_back=7):
-        """Prepare completion data for the chart."""
-        days = []
-        completed_tasks = []
-        new_tasks = []
-
+        """Prepare created/completed/overdue data for the chart over the last ``days_back`` days."""
         today = datetime.now().date()
-
-        for i in range(days_back):
-            day = today - timedelta(days=i)
-            day_name = day.strftime("%a %d")
-
-            # Start and end of day
-            start_date = datetime.combine(day, datetime.min.time())
-            end_date = datetime.combine(day, datetime.max.time())
-
-            # Completed tasks in this day
-            completed_in_day = Task.query.filter(
-                Task.updated_at >= start_date,
-                Task.updated_at <= end_date,
-                Task.status == "completed"
-            ).count()
-
-            # New tasks in this day
-            new_in_day = Task.query.filter(
-                Task.created_at >= start_date,
-                Task.created_at <= end_date
-            ).count()
-
-            days.append(day_name)
-            completed_tasks.append(completed_in_day)
-            new_tasks.append(new_in_day)
-
-        # Reverse lists to display chronologically
-        days.reverse()
-        completed_tasks.reverse()
-        new_tasks.reverse()
-
-        return {"labels": days, "completed_tasks": completed_tasks, "new_tasks": new_tasks}
+        return self.get_daily_series(today - timedelta(days=max(days_back, 1) - 1), today)
 
     def get_statistics(self):
         """Get comprehensive statistics for the statistics page."""
-        total_tasks = self.get_total_tasks()
-
-        # Tasks by status
-        completed_tasks = db.session.query(Task).filter(Task.status == "completed").count()
-        in_progress_tasks = db.session.query(Task).filter(Task.status == "in_progress").count()
-        pending_tasks = db.session.query(Task).filter(Task.status == "pending").count()
-
-        # Tasks by priority
-        high_priority = db.session.query(Task).filter(Task.priority == "high").count()
-        medium_priority = db.session.query(Task).filter(Task.priority == "medium").count()
-        low_priority = db.session.query(Task).filter(Task.priority == "low").count()
-
-        # Overdue tasks
-        overdue_tasks = db.session.query(Task).filter(
-            Task.due_date < datetime.now().date(),
-            Task.status != "completed"
-        ).count()
-
+        counts = self.get_task_counts()
         return {
-            "total_tasks": total_tasks,
-            "completed_tasks": completed_tasks,
-            "in_progress_tasks": in_progress_tasks,
-            "pending_tasks": pending_tasks,
-            "high_priority": high_priority,
-            "medium_priority": medium_priority,
-            "low_priority": low_priority,
-            "overdue_tasks": overdue_tasks,
-        }
-
-    def _calculate_percentage(self, count, total):
-        """Calculate percentage with safety check for division by zero."""
-        if total == 0:
-            return 0
-        return round((count / total) * 100)
\ No newline at end of file
+            "total_tasks": counts["total"],
+            "completed_tasks": counts["completed"],
+            "in_progress_tasks": counts["in_progress"],
+            "pending_tasks": counts["pending"],
+            "high_priority": counts["high"],
+            "medium_priority": counts["medium"],
+            "low_priority": counts["low"],
+            "overdue_tasks": counts["overdue"],
+        }
\ No newline at end of file
@@ -1,50 +1,67 @@
 # app/services/task/core.py
 from datetime import datetime, timedelta
-from app.services.service_base import BaseFeatureService
-from app.models.pages.task import Task
+from app.services.analytics_cache import cached_analytics
+from app.services.service_base import BaseFeatureService, ServiceRegistry
+from app.services.task.analytics import TaskAnalyticsService
+from app.models.pages.task import OPEN_STATUSES, Task, TaskPriority, TaskStatus
 
 
 class TaskService(BaseFeatureService):
     def __init__(self):
         super().__init__(Task)
+        self.analytics = ServiceRegistry.get(TaskAnalyticsService)
 
+    @cached_analytics(["tasks"])
     def get_dashboard_statistics(self):
         """Get task dashboard statistics."""
-        stats = super().get_dashboard_statistics()
-        stats.update({
-            "total_tasks": Task.query.count(),
-            "completed_tasks": self.count_completed_tasks(),
-            "in_progress_tasks": self.count_in_progress_tasks(),
-            "pending_tasks": self.count_pending_tasks()
-        })
-        return stats
+        counts = self.analytics.get_task_counts()
+        return {
+            "total_count": counts["total"],
+            "total_tasks": counts["total"],
+            "completed_tasks": counts["completed"],
+            "in_progress_tasks": counts["in_progress"],
+            "pending_tasks": counts["pending"]
+        }
 
     def count_completed_tasks(self):
         """Count completed tasks."""
-        return Task.query.filter(Task.status == "completed").count()
+        return self.analytics.get_task_counts()["completed"]
 
     def count_in_progress_tasks(self):
         """Count in-progress tasks."""
-        return Task.query.filter(Task.status == "in_progress").count()
+        return self.analytics.get_task_counts()["in_progress"]
 
     def count_pending_tasks(self):
         """Count pending tasks."""
-        return Task.query.filter(Task.status == "pending").count()
+        return self.analytics.get_task_counts()["pending"]
 
+    @cached_analytics(["tasks"])
     def get_statistics(self):
         """Get task statistics."""
+        counts = self.analytics.get_task_counts()
         return {
-            "total_tasks": Task.query.count(),
-            "completed_tasks": self.count_completed_tasks(),
-            "in_progress_tasks": self.count_in_progress_tasks(),
-            "pending_tasks": self.count_pending_tasks(),
-            "overdue_tasks": self.count_overdue_tasks()
+            "total_tasks": counts["total"],
+            "completed_tasks": counts["completed"],
+            "in_progress_tasks": counts["in_progress"],
+            "pending_tasks": counts["pending"],
+            "overdue_tasks": counts["overdue"]
         }
 
     def count_overdue_tasks(self):
         """Count overdue tasks."""
-        return Task.query.filter(Task.due_date < datetime.now().date(),
-                                 Task.status != "completed").count()
+        return self.analytics.get_task_counts()["overdue"]
+
+    def get_dashboard_data(self):
+        """Get the created/completed/overdue series for the dashboard chart."""
+        return {"completion_data": self.analytics.prepare_completion_data()}
+
+    def get_daily_series(self, start, end):
+        """Get tasks created, completed and overdue per day between two dates (inclusive)."""
+        return self.analytics.get_daily_series(start, end)
+
+    def get_status_breakdown(self):
+        """Get task segments by status."""
+        return self.analytics.get_engagement_segments()
 
     def get_filtered_tasks(self, filters):
         """Get filtered tasks based on criteria."""
@@ -52,11 +69,11 @@ class TaskService(BaseFeatureService):
 
         status = filters.get("status")
         if status:
-            query = query.filter(Task.status == status)
+            query = query.filter(Task.status == str(TaskStatus.coerce(status) or status))
 
         priority = filters.get("priority")
         if priority:
-            query = query.filter(Task.priority == priority)
+            query = query.filter(Task.priority == str(TaskPriority.coerce(priority) or priority))
 
         due_date = filters.get("due_date")
         if due_date == "today":
@@ -66,20 +83,19 @@ class TaskService(BaseFeatureService):
             end_of_week = today + timedelta(days=(6 - today.weekday()))
             query = query.filter(Task.due_date.between(today, end_of_week))
         elif due_date == "overdue":
-            query = query.filter(Task.due_date < datetime.now().date(),
-                                 Task.status != "completed")
+            query = query.filter(Task.status.in_(OPEN_STATUSES), Task.due_date < datetime.now().date())
 
         return query.order_by(Task.due_date.asc()).all()
 
     def get_top_tasks(self, limit=5):
-        """Get top tasks (most recent)."""
-        return Task.query.order_by(Task.created_at.desc()).limit(limit).all()
+        """Get open tasks by priority (urgent first), then due date."""
+        return self.analytics.get_top_tasks(limit)
 
     def get_upcoming_tasks(self, limit=5):
-        """Get upcoming tasks."""
+        """Get open tasks due from today on, soonest (then most urgent) first."""
         return (
-            Task.query.filter(Task.due_date >= datetime.now().date())
-            .order_by(Task.due_date.asc())
+            Task.query.filter(Task.status.in_(OPEN_STATUSES), Task.due_date >= datetime.now().date())
+            .order_by(Task.due_date.asc(), Task.priority_rank().desc())
             .limit(limit)
             .all()
         )
\ No newline at end of file
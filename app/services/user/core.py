@@ -1,111 +1,147 @@
 # app/services/user/core.py
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+
+from app.models.base import db
+from app.models.pages.note import Note
+from app.models.pages.opportunity import Opportunity
+from app.services.analytics import EngagementSegmentation
+from app.services.analytics_cache import cached_analytics
 from app.services.service_base import BaseFeatureService
 from app.models.pages.user import User
 
+# Activity levels as a share of the most active user's note count
+HIGH_ACTIVITY_SHARE = 0.7
+MEDIUM_ACTIVITY_SHARE = 0.3
+PERIOD_DAYS = {"month": 30, "quarter": 90, "year": 365}
+# Users without a note this recent count as inactive
+INACTIVE_AFTER = timedelta(days=14)
+NEW_USER_WINDOW = timedelta(days=30)
+USER_TABLES = ["users", "notes"]
+
 
 class UserService(BaseFeatureService):
     def __init__(self):
         super().__init__(User)
 
+    @cached_analytics(USER_TABLES)
+    def get_activity_counts(self):
+        """
+        Count users by role, sign-up date and note activity in one query.
+
+        Returns:
+            Dictionary with total, admin, regular, new_this_month and
+            inactive (no notes within INACTIVE_AFTER) counts
+        """
+        now = datetime.now()
+        segmentation = EngagementSegmentation(User)
+        recently_active = segmentation.has(Note.user_id, Note.created_at >= now - INACTIVE_AFTER)
+        return segmentation.counts({
+            "admin": User.is_admin.is_(True),
+            "regular": User.is_admin.is_(False),
+            "new_this_month": User.created_at >= now - NEW_USER_WINDOW,
+            "inactive": ~recently_active,
+        })
+
+    @cached_analytics(USER_TABLES)
     def get_dashboard_statistics(self):
         """Get user dashboard statistics."""
-        stats = super().get_dashboard_statistics()
-        stats.update({
-            "total_users": User.query.count(),
-            "admin_count": self.count_admin_users(),
-            "regular_count": self.count_regular_users(),
-            "new_users_month": self.count_new_users_month()
-        })
-        return stats
+        counts = self.get_activity_counts()
+        return {
+            "total_count": counts["total"],
+            "total_users": counts["total"],
+            "admin_count": counts["admin"],
+            "regular_count": counts["regular"],
+            "new_users_month": counts["new_this_month"]
+        }
 
     def count_admin_users(self):
         """Count users with admin privileges."""
-        return User.query.filter_by(is_admin=True).count()
+        return self.get_activity_counts()["admin"]
 
     def count_regular_users(self):
         """Count regular users."""
-        return User.query.filter_by(is_admin=False).count()
+        return self.get_activity_counts()["regular"]
 
     def count_new_users_month(self):
         """Count new users in the last 30 days."""
-        from datetime import datetime, timedelta
-        return User.query.filter(User.created_at >= (datetime.now() - timedelta(days=30))).count()
+        return self.get_activity_counts()["new_this_month"]
 
+    @cached_analytics(USER_TABLES)
     def get_statistics(self):
         """Get user statistics."""
+        counts = self.get_activity_counts()
         return {
-            "total_users": User.query.count(),
-            "admin_users": self.count_admin_users(),
-            "regular_users": self.count_regular_users(),
-            "inactive_users": self.count_inactive_users()
+            "total_users": counts["total"],
+            "admin_users": counts["admin"],
+            "regular_users": counts["regular"],
+            "inactive_users": counts["inactive"]
         }
 
     def count_inactive_users(self):
-        """Count users with no activity."""
-        from datetime import datetime, timedelta
-        from app.models.pages.note import Note
-
-        two_weeks_ago = datetime.now() - timedelta(days=14)
-        active_user_ids = User.query.join(Note).filter(Note.created_at >= two_weeks_ago).with_entities(
-            User.id).distinct().all()
-        active_user_ids = [user_id for (user_id,) in active_user_ids]
-        return User.query.filter(~User.id.in_(active_user_ids)).count() if active_user_ids else User.query.count()
+        """Count users without a note in the last two weeks."""
+        return self.get_activity_counts()["inactive"]
 
     def get_filtered_users(self, filters):
-        """Get filtered users based on criteria."""
-        from datetime import datetime, timedelta
-        from app.models.pages.note import Note
-        from app.models.base import db
-
-        query = User.query
+        """
+        Get filtered users based on criteria, with their note and opportunity counts.
+
+        Counts come from grouped subqueries joined onto the user query, and the
+        activity level is relative to the most active matching user, so any
+        filter combination costs at most two queries.
+
+        Args:
+            filters: Dictionary with optional "is_admin" ("true"/"false"),
+                "period" ("month", "quarter" or "year") and "activity"
+                ("high", "medium" or "low")
+
+        Returns:
+            Users, newest first, with notes_count and opportunities_count set
+        """
+        notes = (
+            db.session.query(Note.user_id.label("user_id"), func.count(Note.id).label("total"))
+            .group_by(Note.user_id)
+            .subquery()
+        )
+        opportunities = (
+            db.session.query(Opportunity.created_by_id.label("user_id"), func.count(Opportunity.id).label("total"))
+            .group_by(Opportunity.created_by_id)
+            .subquery()
+        )
+        notes_count = func.coalesce(notes.c.total, 0)
+        opportunities_count = func.coalesce(opportunities.c.total, 0)
+
+        query = (
+            db.session.query(User, notes_count, opportunities_count)
+            .outerjoin(notes, notes.c.user_id == User.id)
+            .outerjoin(opportunities, opportunities.c.user_id == User.id)
+        )
         is_admin = filters.get("is_admin")
         period = filters.get("period")
         activity = filters.get("activity")
 
         if is_admin:
-            is_admin_bool = is_admin.lower() == "true"
-            query = query.filter_by(is_admin=is_admin_bool)
-
-        if period:
-            if period == "month":
-                query = query.filter(User.created_at >= (datetime.now() - timedelta(days=30)))
-            elif period == "quarter":
-                query = query.filter(User.created_at >= (datetime.now() - timedelta(days=90)))
-            elif period == "year":
-                query = query.filter(User.created_at >= (datetime.now() - timedelta(days=365)))
-
-        filtered_users = query.order_by(User.created_at.desc()).all()
+            query = query.filter(User.is_admin == (is_admin.lower() == "true"))
 
-        if activity:
-            user_notes = {}
-            for user in filtered_users:
-                note_count = Note.query.filter_by(user_id=user.id).count()
-                user_notes[user.id] = note_count
-
-            all_note_counts = sorted(user_notes.values())
-
-            if all_note_counts:
-                max_notes = max(all_note_counts)
-                high_threshold = max_notes * 0.7
-                medium_threshold = max_notes * 0.3
+        if period in PERIOD_DAYS:
+            query = query.filter(User.created_at >= datetime.now() - timedelta(days=PERIOD_DAYS[period]))
 
+        if activity in ("high", "medium", "low"):
+            max_notes = query.with_entities(func.max(notes_count)).scalar()
+            if max_notes is not None:
+                high_threshold = max_notes * HIGH_ACTIVITY_SHARE
+                medium_threshold = max_notes * MEDIUM_ACTIVITY_SHARE
                 if activity == "high":
-                    filtered_users = [user for user in filtered_users if user_notes.get(user.id, 0) >= high_threshold]
+                    query = query.filter(notes_count >= high_threshold)
                 elif activity == "medium":
-                    filtered_users = [user for user in filtered_users if
-                                      medium_threshold <= user_notes.get(user.id, 0) < high_threshold]
-                elif activity == "low":
-                    filtered_users = [user for user in filtered_users if user_notes.get(user.id, 0) < medium_threshold]
-
-        # Attach counts as attributes
-        from app.models.pages.opportunity import Opportunity
-        for user in filtered_users:
-            user.notes_count = Note.query.filter_by(user_id=user.id).count()
-            user.opportunities_count = (
-                    db.session.query(db.func.count(Opportunity.id))
-                    .filter(Opportunity.created_by_id == user.id)
-                    .scalar()
-                    or 0
-            )
-
+                    query = query.filter(notes_count >= medium_threshold, notes_count < high_threshold)
+                else:
+                    query = query.filter(notes_count < medium_threshold)
+
+        filtered_users = []
+        for user, user_notes, user_opportunities in query.order_by(User.created_at.desc()).all():
+            user.notes_count = user_notes
+            user.opportunities_count = user_opportunities
+            filtered_users.append(user)
         return filtered_users
\ No newline at end of file
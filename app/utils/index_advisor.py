@@ -0,0 +1,198 @@
+# app/utils/index_advisor.py
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import event, select
+
+from app.models.base import db
+from app.utils.app_logging import get_logger
+
+logger = get_logger()
+
+# "SCAN tasks" / "SCAN tasks AS t" / "SCAN t" - but not "SCAN tasks USING INDEX ..."
+_SCAN_RE = re.compile(r"^SCAN (?P<table>\w+)(?: AS (?P<alias>\w+))?(?P<rest>.*)$")
+
+Query = Tuple[str, Any]
+
+
+@dataclass
+class ScanFinding:
+    """A full table scan seen while replaying one or more queries."""
+
+    table: str
+    statements: List[str] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+def capture_queries(engine, path: str) -> None:
+    """
+    Append every SELECT executed on the engine to a JSON-lines file.
+
+    The file is the input for ``flask index-advisor --capture``.
+
+    Args:
+        engine: SQLAlchemy engine to listen on
+        path: File to append {"statement", "parameters"} records to
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if executemany or not statement.lstrip().upper().startswith("SELECT"):
+            return
+        with open(path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps({"statement": statement, "parameters": parameters}, default=str) + "\n")
+
+    logger.info(f"Capturing SELECT statements to {path}")
+
+
+def load_captured_queries(path: str) -> List[Query]:
+    """
+    Read queries recorded by :func:`capture_queries`, dropping duplicates.
+
+    Args:
+        path: JSON-lines capture file
+
+    Returns:
+        List of (statement, parameters) tuples in first-seen order
+    """
+    queries: Dict[str, Any] = {}
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            queries.setdefault(record["statement"], record.get("parameters") or ())
+    return list(queries.items())
+
+
+def hot_queries() -> List[Query]:
+    """
+    Compile the application's known hot-path queries for the current dialect.
+
+    Returns:
+        List of (statement, parameters) tuples
+    """
+    from app.models.pages.note import Note
+    from app.models.pages.srs import SRS, ReviewHistory
+    from app.models.pages.task import Task
+    from app.models.relationship import Relationship
+
+    statements = [
+        select(SRS).where(SRS.next_review_at <= db.func.now()).order_by(SRS.next_review_at),
+        select(SRS).where(SRS.notable_type == "Company", SRS.next_review_at <= db.func.now()).order_by(SRS.next_review_at),
+        select(ReviewHistory).where(ReviewHistory.srs_item_id == 1).order_by(ReviewHistory.created_at.desc()),
+        select(Note).where(Note.notable_type == "Company", Note.notable_id == 1).order_by(Note.created_at.desc()),
+        select(Task).where(Task.status == "pending").order_by(Task.due_date),
+        select(Task).where(Task.status.in_(["pending", "in_progress", "deferred"]), Task.due_date < db.func.now()),
+        select(Relationship).where(Relationship.entity1_type == "user", Relationship.entity1_id == 1),
+        select(Relationship).where(Relationship.entity2_type == "company", Relationship.entity2_id == 1),
+    ]
+
+    queries = []
+    for statement in statements:
+        # Expand IN lists into plain placeholders; EXPLAIN can't parse the
+        # POSTCOMPILE markers SQLAlchemy otherwise leaves in the SQL
+        compiled = statement.compile(dialect=db.engine.dialect, compile_kwargs={"render_postcompile": True})
+        positions = getattr(compiled, "positiontup", None)
+        params = tuple(compiled.params[name] for name in positions) if positions else compiled.params
+        queries.append((str(compiled), params))
+    return queries
+
+
+def find_table_scans(plan_details: Iterable[str], tables: Iterable[str]) -> List[str]:
+    """
+    Pick out full scans of real tables from EXPLAIN QUERY PLAN detail lines.
+
+    Index scans, covering-index scans, virtual tables, subqueries and tables
+    unknown to the application's metadata are ignored.
+
+    Args:
+        plan_details: The ``detail`` column of each plan row
+        tables: Names of the tables to report on
+
+    Returns:
+        Names of the tables that are scanned without an index
+    """
+    known = set(tables)
+    scanned = []
+    for detail in plan_details:
+        match = _SCAN_RE.match(detail.strip())
+        if not match or "USING" in match.group("rest") or "VIRTUAL TABLE" in match.group("rest"):
+            continue
+        if match.group("table") in known:
+            scanned.append(match.group("table"))
+    return scanned
+
+
+def analyse_queries(connection, queries: Iterable[Query]) -> Tuple[Dict[str, ScanFinding], List[Tuple[str, str]]]:
+    """
+    Replay queries through EXPLAIN QUERY PLAN and collect the table scans.
+
+    Args:
+        connection: SQLAlchemy connection to a SQLite database
+        queries: (statement, parameters) tuples
+
+    Returns:
+        Findings keyed by table name, and (statement, error) for each query
+        that could not be explained
+    """
+    tables = db.metadata.tables.keys()
+    findings: Dict[str, ScanFinding] = {}
+    failures: List[Tuple[str, str]] = []
+
+    for statement, params in queries:
+        if isinstance(params, list):
+            params = tuple(params)
+        try:
+            rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", params or ()).fetchall()
+        except Exception as e:
+            logger.warning(f"Could not explain query: {e}")
+            failures.append((statement, str(e).splitlines()[0]))
+            continue
+
+        for table_name in find_table_scans((row[-1] for row in rows), tables):
+            findings.setdefault(table_name, ScanFinding(table_name)).statements.append(statement)
+
+    return findings, failures
+
+
+@click.command("index-advisor")
+@click.option("--capture", "capture_path", type=click.Path(exists=True, dir_okay=False), help="JSON-lines file written with CAPTURE_QUERIES_PATH set.")
+@click.option("--verbose", "-v", is_flag=True, help="Print the offending statements.")
+@with_appcontext
+def index_advisor_command(capture_path: Optional[str], verbose: bool) -> None:
+    """Report queries that fall back to full table scans, failing if any can't be explained."""
+    if db.engine.dialect.name != "sqlite":
+        raise click.ClickException("The index advisor relies on SQLite's EXPLAIN QUERY PLAN")
+
+    queries = load_captured_queries(capture_path) if capture_path else hot_queries()
+    click.echo(f"Analysing {len(queries)} queries against {current_app.config['SQLALCHEMY_DATABASE_URI']}")
+
+    with db.engine.connect() as connection:
+        findings, failures = analyse_queries(connection, queries)
+
+    if not findings:
+        click.echo("No full table scans found.")
+
+    for finding in sorted(findings.values(), key=lambda f: f.count, reverse=True):
+        click.echo(f"SCAN {finding.table}: {finding.count} quer{'y' if finding.count == 1 else 'ies'}")
+        if verbose:
+            for statement in finding.statements:
+                click.echo("    " + " ".join(statement.split()))
+
+    for statement, error in failures:
+        click.echo(f"FAILED {error}", err=True)
+        if verbose:
+            click.echo("    " + " ".join(statement.split()), err=True)
+    if failures:
+        raise click.ClickException(f"Could not explain {len(failures)} of {len(queries)} queries")
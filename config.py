@@ -64,6 +64,29 @@ class Config:
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Append executed SELECTs to this file for `flask index-advisor --capture`
+    CAPTURE_QUERIES_PATH = os.environ.get("CAPTURE_QUERIES_PATH")
+
+    # In-memory cache for @cached_analytics service methods
+    ANALYTICS_CACHE_ENABLED = os.environ.get("ANALYTICS_CACHE_ENABLED", "True").lower() in ("true", "1", "t")
+    ANALYTICS_CACHE_TTL = int(os.environ.get("ANALYTICS_CACHE_TTL", 300))
+    ANALYTICS_CACHE_MAX_ENTRIES = int(os.environ.get("ANALYTICS_CACHE_MAX_ENTRIES", 512))
+
+    # Background refresh of dashboard statistics (see app/services/precompute.py)
+    DASHBOARD_PRECOMPUTE_ENABLED = os.environ.get("DASHBOARD_PRECOMPUTE_ENABLED", "True").lower() in ("true", "1", "t")
+    DASHBOARD_PRECOMPUTE_INTERVAL = int(os.environ.get("DASHBOARD_PRECOMPUTE_INTERVAL", 300))
+    DASHBOARD_PRECOMPUTE_DEBOUNCE = float(os.environ.get("DASHBOARD_PRECOMPUTE_DEBOUNCE", 2.0))
+    DASHBOARD_PRECOMPUTE_WORKERS = int(os.environ.get("DASHBOARD_PRECOMPUTE_WORKERS", 2))
+
+    # Concurrent per-entity searches behind /api/search (see app/services/search/federated.py)
+    SEARCH_FEDERATION_WORKERS = int(os.environ.get("SEARCH_FEDERATION_WORKERS", 4))
+    SEARCH_FEDERATION_TIMEOUT = float(os.environ.get("SEARCH_FEDERATION_TIMEOUT", 2.0))
+
+    # Cache of repeated search results (see app/services/search/cache.py)
+    SEARCH_CACHE_ENABLED = os.environ.get("SEARCH_CACHE_ENABLED", "True").lower() in ("true", "1", "t")
+    SEARCH_CACHE_TTL = int(os.environ.get("SEARCH_CACHE_TTL", 60))
+    SEARCH_CACHE_MAX_BYTES = int(os.environ.get("SEARCH_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+
     # Application settings
     APP_NAME = "Flask CRM"
     ITEMS_PER_PAGE = 15
@@ -0,0 +1,37 @@
+"""Add indexes for hot query paths
+
+Revision ID: 3f9c2a71d4b8
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9c2a71d4b8'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns) - mirrors the __table_args__ declared on the models
+INDEXES = (
+    ('ix_srs_next_review_at', 'srs', ['next_review_at']),
+    ('ix_srs_notable_type_next_review_at', 'srs', ['notable_type', 'next_review_at']),
+    ('ix_review_history_srs_item_id_created_at', 'review_history', ['srs_item_id', 'created_at']),
+    ('ix_notes_notable_type_notable_id_created_at', 'notes', ['notable_type', 'notable_id', 'created_at']),
+    ('ix_tasks_status_due_date', 'tasks', ['status', 'due_date']),
+    ('ix_relationships_entity2_type_entity2_id', 'relationships', ['entity2_type', 'entity2_id']),
+)
+
+
+def upgrade():
+    # Databases built with db.create_all() may already have these indexes
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
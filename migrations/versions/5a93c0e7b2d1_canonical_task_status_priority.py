@@ -0,0 +1,75 @@
+"""Store canonical task status and priority values
+
+Revision ID: 5a93c0e7b2d1
+Revises: e2b7d14f8a63
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a93c0e7b2d1'
+down_revision = 'e2b7d14f8a63'
+branch_labels = None
+depends_on = None
+
+
+# Legacy spellings mapped to canonical values - mirrors app.models.pages.task
+STATUS_ALIASES = {
+    '': 'pending',
+    'not_started': 'pending',
+    'todo': 'pending',
+    'done': 'completed',
+    'canceled': 'cancelled',
+    'on_hold': 'deferred',
+}
+PRIORITY_ALIASES = {'': 'medium', 'normal': 'medium'}
+
+# Labels written before the values were normalized, for downgrade
+STATUS_LABELS = {
+    'pending': 'Pending',
+    'in_progress': 'In Progress',
+    'completed': 'Completed',
+    'deferred': 'Deferred',
+    'cancelled': 'Cancelled',
+}
+PRIORITY_LABELS = {'low': 'Low', 'medium': 'Medium', 'high': 'High', 'urgent': 'Urgent'}
+
+
+def canonical(column, aliases):
+    """SQL lowercasing a label into snake_case and resolving aliases, e.g. 'In Progress' -> 'in_progress'."""
+    key = f"lower(replace(replace(trim({column}), ' ', '_'), '-', '_'))"
+    whens = ' '.join(f"WHEN '{alias}' THEN '{value}'" for alias, value in aliases.items())
+    return f"CASE {key} {whens} ELSE {key} END"
+
+
+def relabel(column, labels):
+    whens = ' '.join(f"WHEN '{value}' THEN '{label}'" for value, label in labels.items())
+    return f"CASE {column} {whens} ELSE {column} END"
+
+
+def upgrade():
+    op.execute(f"UPDATE tasks SET status = COALESCE({canonical('status', STATUS_ALIASES)}, 'pending')")
+    op.execute(f"UPDATE tasks SET priority = COALESCE({canonical('priority', PRIORITY_ALIASES)}, 'medium')")
+    # Aliases such as 'done' only became 'completed' here
+    op.execute(
+        "UPDATE tasks SET completed_at = COALESCE(updated_at, created_at) "
+        "WHERE status = 'completed' AND completed_at IS NULL"
+    )
+    # Every row now has a value, matching the model's NOT NULL columns
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.alter_column('status', existing_type=sa.String(length=20), nullable=False)
+        batch_op.alter_column('priority', existing_type=sa.String(length=20), nullable=False)
+    # Served by the (status, due_date) index from 3f9c2a71d4b8; created here too
+    # for databases that never ran it
+    op.create_index('ix_tasks_status_due_date', 'tasks', ['status', 'due_date'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    with op.batch_alter_table('tasks') as batch_op:
+        batch_op.alter_column('status', existing_type=sa.String(length=20), nullable=True)
+        batch_op.alter_column('priority', existing_type=sa.String(length=20), nullable=True)
+    op.execute(f"UPDATE tasks SET status = {relabel('status', STATUS_LABELS)}")
+    op.execute(f"UPDATE tasks SET priority = {relabel('priority', PRIORITY_LABELS)}")
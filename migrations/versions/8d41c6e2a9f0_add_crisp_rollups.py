@@ -0,0 +1,67 @@
+"""Add CRISP rollup table
+
+Revision ID: 8d41c6e2a9f0
+Revises: 3f9c2a71d4b8
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d41c6e2a9f0'
+down_revision = '3f9c2a71d4b8'
+branch_labels = None
+depends_on = None
+
+
+TOTAL = ("COALESCE(c.total_score, CASE WHEN c.self_orientation = 0 THEN (c.credibility + c.reliability + c.intimacy) * 1.0 "
+         "ELSE (c.credibility + c.reliability + c.intimacy) * 1.0 / c.self_orientation END)")
+COMPONENTS = f"{TOTAL} AS total, c.credibility, c.reliability, c.intimacy, c.self_orientation"
+
+BACKFILL = f"""
+INSERT INTO crisp_rollups (scope_type, scope_id, count, sum_total, min_total, max_total, sum_credibility,
+                           sum_reliability, sum_intimacy, sum_self_orientation, created_at, updated_at)
+SELECT scope_type, scope_id, COUNT(*), SUM(total), MIN(total), MAX(total), SUM(credibility),
+       SUM(reliability), SUM(intimacy), SUM(self_orientation), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+FROM (
+    SELECT 'all' AS scope_type, 0 AS scope_id, {COMPONENTS} FROM crisp c
+    UNION ALL
+    SELECT 'relationship', c.relationship_id, {COMPONENTS} FROM crisp c
+    UNION ALL
+    SELECT r.entity1_type, r.entity1_id, {COMPONENTS} FROM crisp c JOIN relationships r ON r.id = c.relationship_id
+    UNION ALL
+    SELECT r.entity2_type, r.entity2_id, {COMPONENTS} FROM crisp c JOIN relationships r ON r.id = c.relationship_id
+    WHERE NOT (r.entity1_type = r.entity2_type AND r.entity1_id = r.entity2_id)
+)
+GROUP BY scope_type, scope_id
+"""
+
+
+def upgrade():
+    op.create_table(
+        'crisp_rollups',
+        sa.Column('scope_type', sa.String(length=50), nullable=False),
+        sa.Column('scope_id', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('sum_total', sa.Float(), nullable=False),
+        sa.Column('min_total', sa.Float(), nullable=True),
+        sa.Column('max_total', sa.Float(), nullable=True),
+        sa.Column('sum_credibility', sa.Integer(), nullable=False),
+        sa.Column('sum_reliability', sa.Integer(), nullable=False),
+        sa.Column('sum_intimacy', sa.Integer(), nullable=False),
+        sa.Column('sum_self_orientation', sa.Integer(), nullable=False),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('scope_type', 'scope_id', name='uq_crisp_rollups_scope'),
+        if_not_exists=True,
+    )
+    op.execute("DELETE FROM crisp_rollups")
+    op.execute(BACKFILL)
+
+
+def downgrade():
+    op.drop_table('crisp_rollups')
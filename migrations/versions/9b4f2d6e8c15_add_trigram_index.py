@@ -0,0 +1,44 @@
+"""Add trigram index tables for fuzzy search
+
+Revision ID: 9b4f2d6e8c15
+Revises: 5a93c0e7b2d1
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b4f2d6e8c15'
+down_revision = '5a93c0e7b2d1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Populated at startup, or with `flask rebuild-trigram-index`
+    op.create_table(
+        'trigram_postings',
+        sa.Column('entity_code', sa.Integer(), nullable=False),
+        sa.Column('trigram', sa.String(length=3), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('entity_code', 'trigram', 'entity_id'),
+        sqlite_with_rowid=False,
+        if_not_exists=True,
+    )
+    op.create_table(
+        'trigram_documents',
+        sa.Column('entity_code', sa.Integer(), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('trigram_count', sa.Integer(), nullable=False),
+        sa.Column('trigrams', sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint('entity_code', 'entity_id'),
+        sqlite_with_rowid=False,
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_table('trigram_documents', if_exists=True)
+    op.drop_table('trigram_postings', if_exists=True)
@@ -0,0 +1,43 @@
+"""Compute CRISP total_score in the database
+
+Revision ID: c7e5a0b3f912
+Revises: 8d41c6e2a9f0
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e5a0b3f912'
+down_revision = '8d41c6e2a9f0'
+branch_labels = None
+depends_on = None
+
+
+def total(row):
+    summed = f"({row}.credibility + {row}.reliability + {row}.intimacy) * 1.0"
+    return f"CASE WHEN {row}.self_orientation = 0 THEN {summed} ELSE {summed} / {row}.self_orientation END"
+
+
+def upgrade():
+    op.execute(f"UPDATE crisp SET total_score = {total('crisp')}")
+    op.create_index('ix_crisp_total_score', 'crisp', ['total_score'], unique=False, if_not_exists=True)
+
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS crisp_total_ai AFTER INSERT ON crisp BEGIN "
+            f"UPDATE crisp SET total_score = {total('new')} WHERE id = new.id; END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS crisp_total_au "
+            "AFTER UPDATE OF credibility, reliability, intimacy, self_orientation, total_score ON crisp BEGIN "
+            f"UPDATE crisp SET total_score = {total('new')} WHERE id = new.id; END"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS crisp_total_au")
+        op.execute("DROP TRIGGER IF EXISTS crisp_total_ai")
+    op.drop_index('ix_crisp_total_score', table_name='crisp', if_exists=True)
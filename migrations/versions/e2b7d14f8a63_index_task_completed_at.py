@@ -0,0 +1,30 @@
+"""Index tasks.completed_at and backfill it from status
+
+Revision ID: e2b7d14f8a63
+Revises: c7e5a0b3f912
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b7d14f8a63'
+down_revision = 'c7e5a0b3f912'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Tasks completed through generic updates never had completed_at set; the
+    # last update is the best available estimate of when that happened
+    op.execute(
+        "UPDATE tasks SET completed_at = COALESCE(updated_at, created_at) "
+        "WHERE lower(status) = 'completed' AND completed_at IS NULL"
+    )
+    op.execute("UPDATE tasks SET completed_at = NULL WHERE lower(status) != 'completed' AND completed_at IS NOT NULL")
+    op.create_index('ix_tasks_completed_at', 'tasks', ['completed_at'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_tasks_completed_at', table_name='tasks', if_exists=True)
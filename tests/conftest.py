@@ -95,6 +95,37 @@ def db(app):
     _db.drop_all()
 
 
+@pytest.fixture(scope="session")
+def memory_app():
+    """App bound to its own in-memory SQLite database, for tests that must not touch crm.db."""
+    from app.app import create_app
+    from config import Config
+
+    class MemoryConfig(Config):
+        TESTING = True
+        SECRET_KEY = "test_secret_key"
+        SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+        WTF_CSRF_ENABLED = False
+        SERVER_NAME = None
+
+    return create_app(MemoryConfig)
+
+
+@pytest.fixture(scope="function")
+def memory_db(memory_app):
+    """Empty tables in the in-memory app, dropped along with any cached results after each test."""
+    from app.services.analytics_cache import analytics_cache
+    from app.services.search.cache import search_cache
+
+    with memory_app.app_context():
+        _db.create_all()
+        yield _db
+        _db.session.remove()
+        _db.drop_all()
+        analytics_cache.clear()
+        search_cache.clear()
+
+
 @pytest.fixture
 def client(app):
     """Return a test client for the app."""
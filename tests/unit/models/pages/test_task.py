@@ -9,4 +9,29 @@ def test_module_imports():
     assert True, "Module imported successfully"
 
 
-# TODO: Add more specific tests
+def test_status_and_priority_coerce_labels_and_aliases():
+    assert TaskStatus.coerce("In Progress") is TaskStatus.IN_PROGRESS
+    assert TaskStatus.coerce("Not Started") is TaskStatus.PENDING
+    assert TaskStatus.coerce("in-progress") is TaskStatus.IN_PROGRESS
+    assert TaskPriority.coerce("HIGH") is TaskPriority.HIGH
+    assert TaskStatus.coerce("bogus") is None
+    assert str(TaskStatus.COMPLETED) == "completed"
+
+
+def test_priority_rank_is_ordinal():
+    assert [priority.rank for priority in TaskPriority] == [1, 2, 3, 4]
+    assert TaskPriority.URGENT.rank > TaskPriority.HIGH.rank > TaskPriority.LOW.rank
+
+
+def test_on_hold_is_an_alias_for_deferred():
+    assert TaskStatus.coerce("On Hold") is TaskStatus.DEFERRED
+    assert TaskStatus.IN_PROGRESS.label == "In Progress"
+
+
+def test_task_form_choices_are_canonical_values():
+    """The form posts the stored values, which the model accepts unchanged."""
+    from app.forms.task import TaskForm
+
+    assert [value for value, _ in TaskForm.status.kwargs["choices"]] == [status.value for status in TaskStatus]
+    assert [value for value, _ in TaskForm.priority.kwargs["choices"]] == [priority.value for priority in TaskPriority]
+    assert TaskStatus.coerce(TaskForm.status.kwargs["default"]) is TaskStatus.PENDING
@@ -50,3 +50,68 @@ def test_user_attributes():
     # Test authentication-related functionality
     assert hasattr(user, "is_authenticated")
     assert hasattr(user, "get_id")
+
+
+def _user_graph(db, count):
+    """Users related to each other and to companies in both directions, plus links to unlisted types."""
+    from app.models import Company, Relationship
+    from app.models.pages.user import User
+
+    users = [User(username=f"user{index}", name=f"User {index}", email=f"user{index}@example.com", password_hash="x") for index in range(count)]
+    companies = [Company(name="Acme"), Company(name="Initech")]
+    db.session.add_all([*users, *companies])
+    db.session.flush()
+    links = []
+    for index, user in enumerate(users):
+        other = users[(index + 1) % count]
+        links += [
+            ("company", companies[index % 2].id, "user", user.id, "client"),
+            ("user", user.id, "company", companies[(index + 1) % 2].id, "works_at"),
+            ("user", user.id, "user", other.id, "manager"),
+            ("user", user.id, "contact", 1, "knows"),
+        ]
+    db.session.add_all(
+        Relationship(entity1_type=t1, entity1_id=i1, entity2_type=t2, entity2_id=i2, relationship_type=kind) for t1, i1, t2, i2, kind in links
+    )
+    db.session.commit()
+    db.session.expunge_all()
+    return User.query.order_by(User.id).all()
+
+
+def _count_queries(db, callback):
+    from sqlalchemy import event
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", count)
+    try:
+        callback()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", count)
+    return len(statements)
+
+
+def test_to_dict_many_matches_to_dict(memory_db):
+    """Serializing a page at once gives the same dicts as one user at a time, outgoing relationships first."""
+    from app.models.pages.user import User
+
+    users = _user_graph(memory_db, 3)
+    expected = [user.to_dict() for user in users]
+    memory_db.session.expunge_all()
+
+    assert User.to_dict_many(User.query.order_by(User.id).all()) == expected
+    assert expected[0]["related_users"] == "User 1 (manager), User 2 (manager)"
+    assert expected[0]["related_companies"] == "Initech (works_at), Acme (client)"
+    assert len(expected[0]["relationships"]) == 3
+
+
+@pytest.mark.parametrize("count", [2, 8])
+def test_to_dict_many_query_count_is_constant(memory_db, count):
+    """One relationships query plus one name query per related type, however many users are serialized."""
+    from app.models.pages.user import User
+
+    users = _user_graph(memory_db, count)
+    assert _count_queries(memory_db, lambda: User.to_dict_many(users)) == 3
@@ -0,0 +1,73 @@
+# Tests for the CrispRollup maintenance in app.models.pages.crisp
+import pytest
+
+from app.models import Crisp, CrispRollup, Relationship
+from app.models.pages.crisp import rebuild_crisp_rollups
+
+COLUMNS = ("count", "sum_total", "min_total", "max_total", "sum_credibility", "sum_reliability", "sum_intimacy", "sum_self_orientation")
+
+
+def _rollups(db):
+    table = CrispRollup.__table__
+    rows = db.session.execute(db.select(table.c.scope_type, table.c.scope_id, *(table.c[name] for name in COLUMNS))).all()
+    return {(row[0], row[1]): tuple(pytest.approx(value) if isinstance(value, float) else value for value in row[2:]) for row in rows}
+
+
+def _assert_matches_rebuild(db):
+    """The incrementally maintained rows equal a from-scratch recompute."""
+    maintained = _rollups(db)
+    rebuild_crisp_rollups(db.session.connection())
+    assert maintained == _rollups(db)
+    db.session.rollback()
+
+
+@pytest.fixture
+def relationships(memory_db):
+    """Two contacts sharing a user, plus a self-relationship counted once per scope."""
+    pairs = [("user", 1, "contact", 1), ("user", 1, "contact", 2), ("contact", 3, "contact", 3)]
+    relationships = [Relationship(entity1_type=t1, entity1_id=i1, entity2_type=t2, entity2_id=i2) for t1, i1, t2, i2 in pairs]
+    memory_db.session.add_all(relationships)
+    memory_db.session.commit()
+    return relationships
+
+
+def _score(relationship, credibility, self_orientation=2):
+    return Crisp(relationship_id=relationship.id, credibility=credibility, reliability=5, intimacy=4, self_orientation=self_orientation)
+
+
+def test_rollups_follow_inserts_edits_moves_and_deletes(memory_db, relationships):
+    first, second, own = relationships
+    scores = [_score(first, 9), _score(first, 2, 0), _score(second, 7), _score(own, 5)]
+    memory_db.session.add_all(scores)
+    memory_db.session.commit()
+    _assert_matches_rebuild(memory_db)
+    assert CrispRollup.lookup("user", 1).count == 3
+    assert CrispRollup.lookup("contact", 3).count == 1
+
+    # Editing the current minimum and maximum needs a recompute, not a running update
+    scores[0].credibility = 1
+    scores[1].self_orientation = 10
+    memory_db.session.commit()
+    _assert_matches_rebuild(memory_db)
+
+    # Moving a score takes it out of the old relationship's scopes and into the new one's
+    scores[2].relationship_id = own.id
+    memory_db.session.commit()
+    _assert_matches_rebuild(memory_db)
+    assert CrispRollup.lookup("relationship", second.id) is None
+    assert CrispRollup.lookup("contact", 2) is None
+
+    memory_db.session.delete(scores[3])
+    memory_db.session.delete(scores[0])
+    memory_db.session.commit()
+    _assert_matches_rebuild(memory_db)
+    assert CrispRollup.lookup("all").count == 2
+
+
+def test_deleting_every_score_empties_the_rollups(memory_db, relationships):
+    score = _score(relationships[0], 6)
+    memory_db.session.add(score)
+    memory_db.session.commit()
+    memory_db.session.delete(score)
+    memory_db.session.commit()
+    assert _rollups(memory_db) == {}
@@ -0,0 +1,49 @@
+# Tests for the CRISP total_score triggers in app.models.pages.crisp
+import pytest
+from sqlalchemy import text
+
+from app.models import Crisp, Relationship
+from app.services.crisp.core import CrispService
+
+
+@pytest.fixture
+def relationship_id(memory_db):
+    relationship = Relationship(entity1_type="user", entity1_id=1, entity2_type="contact", entity2_id=1)
+    memory_db.session.add(relationship)
+    memory_db.session.commit()
+    return relationship.id
+
+
+def _stored_totals(db):
+    return db.session.execute(text("SELECT credibility, reliability, intimacy, self_orientation, total_score FROM crisp ORDER BY id")).all()
+
+
+@pytest.mark.parametrize("components, expected", [((8, 6, 4, 3), 6.0), ((8, 6, 4, 0), 18.0), ((1, 1, 1, 4), 0.75)])
+def test_raw_inserts_get_a_total(memory_db, relationship_id, components, expected):
+    """Rows written without the ORM still get total_score, including self_orientation 0."""
+    memory_db.session.execute(
+        text("INSERT INTO crisp (relationship_id, credibility, reliability, intimacy, self_orientation) VALUES (:rel, :c, :r, :i, :s)"),
+        dict(zip(("rel", "c", "r", "i", "s"), (relationship_id, *components))),
+    )
+    memory_db.session.commit()
+    assert _stored_totals(memory_db)[0].total_score == pytest.approx(expected)
+
+
+def test_raw_updates_recompute_the_total(memory_db, relationship_id):
+    memory_db.session.execute(
+        text("INSERT INTO crisp (relationship_id, credibility, reliability, intimacy, self_orientation) VALUES (:rel, 4, 4, 4, 2)"),
+        {"rel": relationship_id},
+    )
+    memory_db.session.execute(text("UPDATE crisp SET self_orientation = 0"))
+    assert _stored_totals(memory_db)[0].total_score == pytest.approx(12.0)
+    memory_db.session.execute(text("UPDATE crisp SET total_score = 99"))
+    assert _stored_totals(memory_db)[0].total_score == pytest.approx(12.0)
+
+
+def test_create_score_stores_the_total(memory_app, memory_db, relationship_id):
+    form = {"relationship_id": str(relationship_id), "credibility": "9", "reliability": "7", "intimacy": "5", "self_orientation": "0"}
+    with memory_app.test_request_context():
+        assert CrispService().create_score(form)[0] is True
+    memory_db.session.expire_all()
+    assert _stored_totals(memory_db)[0].total_score == pytest.approx(21.0)
+    assert Crisp.query.one().total_score == pytest.approx(21.0)
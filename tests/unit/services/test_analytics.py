@@ -0,0 +1,87 @@
+# Tests for app.services.analytics
+from datetime import datetime
+
+import pytest
+
+from app.models.pages.contact import Contact
+from app.models.pages.note import Note
+from app.models.pages.user import User
+from app.services.analytics import (
+    MISSING_SEGMENT,
+    UNKNOWN_SEGMENT,
+    EngagementSegmentation,
+    bucket_key,
+    bucket_starts,
+    month_range,
+    percentage,
+    segment_counts,
+)
+
+
+def test_bucket_starts_cover_partial_buckets():
+    """The first bucket is truncated to its start; weeks begin on Monday."""
+    start, end = datetime(2024, 1, 3, 15, 30), datetime(2024, 1, 17)
+    assert bucket_starts(start, end, "week") == [datetime(2024, 1, 1), datetime(2024, 1, 8), datetime(2024, 1, 15)]
+    assert len(bucket_starts(start, end, "day")) == 14
+    assert bucket_starts(start, end, "month") == [datetime(2024, 1, 1)]
+
+
+def test_bucket_keys_match_sql_format():
+    """Keys use the same format as the strftime/date expressions."""
+    moment = datetime(2024, 12, 31, 23, 59)
+    assert bucket_key(moment, "day") == "2024-12-31"
+    assert bucket_key(moment, "week") == "2024-12-30"
+    assert bucket_key(moment, "month") == "2024-12"
+    with pytest.raises(ValueError):
+        bucket_key(moment, "year")
+
+
+def test_month_range_crosses_year_boundary():
+    """Six months back from February starts in September of the previous year."""
+    assert month_range(6, now=datetime(2024, 2, 14)) == (datetime(2023, 9, 1), datetime(2024, 3, 1))
+    assert month_range(1, now=datetime(2024, 12, 5)) == (datetime(2024, 12, 1), datetime(2025, 1, 1))
+
+
+def test_percentage_rounds_and_handles_empty_totals():
+    assert percentage(1, 3) == 33
+    assert percentage(2, 3) == 67
+    assert percentage(5, 0) == 0
+
+
+def test_engagement_has_builds_correlated_not_exists():
+    """A foreign key column becomes a correlated EXISTS; negating it gives the NOT EXISTS anti-join."""
+    condition = str(~EngagementSegmentation(User).has(Note.__table__.c.user_id))
+    assert "NOT (EXISTS" in condition and "notes.user_id = users.id" in condition
+
+
+@pytest.fixture
+def skill_levels(memory_db):
+    """Seven contacts: covered, unknown and NULL skill levels, one of them flagged by role."""
+    levels = ["Beginner", "Advanced", "Expert", "Guru", "guru", None, None]
+    memory_db.session.add_all(
+        Contact(first_name=f"C{index}", last_name="Test", email=f"c{index}@example.com", skill_level=level,
+                role="lead" if index in (1, 3, 5) else None)
+        for index, level in enumerate(levels)
+    )
+    memory_db.session.commit()
+
+
+def test_segment_counts_reports_unknown_and_missing_values(skill_levels):
+    """Values outside every bucket count as Unknown and NULLs as Not Set; each percentage is rounded on its own."""
+    buckets = {"Beginner": "Beginner", "Advanced": ("Advanced", "Expert"), "Intermediate": "Intermediate"}
+    assert segment_counts(Contact, Contact.skill_level, buckets) == [
+        {"name": "Beginner", "count": 1, "percentage": 14},
+        {"name": "Advanced", "count": 2, "percentage": 29},
+        {"name": "Intermediate", "count": 0, "percentage": 0},
+        {"name": UNKNOWN_SEGMENT, "count": 2, "percentage": 29},
+        {"name": MISSING_SEGMENT, "count": 2, "percentage": 29},
+    ]
+
+
+def test_segment_counts_percentages_are_of_the_filtered_rows(skill_levels):
+    counts = segment_counts(Contact, Contact.skill_level, {"Advanced": ("Advanced", "Expert")}, Contact.role == "lead")
+    assert [(segment["count"], segment["percentage"]) for segment in counts] == [(1, 33), (1, 33), (1, 33)]
+
+
+def test_segment_counts_of_no_rows(memory_db):
+    assert [segment["percentage"] for segment in segment_counts(Contact, Contact.skill_level, {"Beginner": "Beginner"})] == [0, 0, 0]
@@ -0,0 +1,66 @@
+# Tests for app.services.analytics_cache
+from app.services.analytics_cache import AnalyticsCache
+
+
+def test_lru_eviction_keeps_recently_used_entries():
+    """The least recently read entry is evicted once the cache is full."""
+    cache = AnalyticsCache(max_entries=2)
+    cache.set("a", 1, ["companies"], 60)
+    cache.set("b", 2, ["contacts"], 60)
+    assert cache.get("a") == (True, 1)
+    cache.set("c", 3, ["tasks"], 60)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidation_drops_only_dependent_entries():
+    """Writing a table invalidates the entries that read it and nothing else."""
+    cache = AnalyticsCache()
+    cache.set("companies", 1, ["companies", "opportunities"], 60)
+    cache.set("tasks", 2, ["tasks"], 60)
+    assert cache.invalidate_tables({"opportunities"}) == 1
+    assert cache.get("companies")[0] is False
+    assert cache.get("tasks") == (True, 2)
+
+
+def test_expired_entries_count_as_misses():
+    """Entries past their TTL are dropped on lookup; metrics are tracked per function."""
+    cache = AnalyticsCache()
+    cache.set("stats", {"total": 1}, ["srs"], 0)
+    assert cache.get("stats", "SRSAnalyticsService.get_stats") == (False, None)
+    stats = cache.stats()
+    assert stats["expirations"] == 1 and stats["entries"] == 0
+    assert stats["functions"]["SRSAnalyticsService.get_stats"] == {"hits": 0, "misses": 1}
+
+
+def test_byte_limit_evicts_least_recently_used_entries():
+    """Entries are evicted by total size once max_bytes is exceeded; oversized values aren't stored."""
+    cache = AnalyticsCache(max_entries=None, max_bytes=100)
+    cache.set("a", 1, ["contacts"], 60, size=40)
+    cache.set("b", 2, ["contacts"], 60, size=40)
+    assert cache.get("a") == (True, 1)
+    cache.set("c", 3, ["contacts"], 60, size=40)
+    assert cache.get("b") == (False, None)
+    assert cache.stats()["bytes"] == 80
+    cache.set("d", 4, ["contacts"], 60, size=101)
+    assert cache.get("d") == (False, None)
+    assert cache.stats()["oversized"] == 1
+    assert cache.invalidate_tables({"contacts"}) == 2
+    assert cache.stats()["bytes"] == 0
+
+
+def test_results_computed_across_a_write_are_not_stored():
+    """A write between reading the generation and storing the result means the result may be stale."""
+    cache = AnalyticsCache()
+    generation = cache.generation(["companies", "contacts"])
+    cache.invalidate_tables({"contacts"})
+    cache.set("stale", 1, ["companies", "contacts"], 60, generation=generation)
+    assert cache.get("stale") == (False, None)
+    assert cache.stats()["stale"] == 1
+
+    generation = cache.generation(["companies", "contacts"])
+    cache.invalidate_tables({"tasks"})
+    cache.clear()
+    cache.set("fresh", 2, ["companies", "contacts"], 60, generation=generation)
+    assert cache.get("fresh") == (True, 2)
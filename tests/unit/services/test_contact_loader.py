@@ -0,0 +1,126 @@
+# Tests for app.services.contact.loader
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app.models import Contact, Opportunity, Relationship, User
+from app.services.contact.loader import ContactGraphLoader
+
+
+def _key(entity):
+    return type(entity).__name__, entity.id
+
+
+def _contact_graph(contacts):
+    return {
+        contact.id: {
+            "managers": [_key(e) for e in contact.managers],
+            "direct_reports": [_key(e) for e in contact.direct_reports],
+            "opportunities": [o.id for o in contact.opportunities],
+            "opportunity_relationships": [rel.id for rel in contact.opportunity_relationships],
+        }
+        for contact in contacts
+    }
+
+
+def _opportunity_graph(opportunities):
+    return {
+        opportunity.id: {
+            "contacts": sorted(c.id for c in opportunity.contacts),
+            "contact_relationships": sorted(rel.id for rel in opportunity.contact_relationships),
+        }
+        for opportunity in opportunities
+    }
+
+
+@contextmanager
+def _count_queries(db):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", count)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", count)
+
+
+@pytest.fixture
+def graph(memory_db):
+    """Managers that are users and contacts, a reporting chain and opportunity links in both directions."""
+    db = memory_db
+    user = User(username="boss", name="Boss", email="boss@example.com", password_hash="x")
+    contacts = [Contact(first_name=f"C{index}", last_name="Test", email=f"c{index}@example.com") for index in range(4)]
+    opportunities = [Opportunity(name=f"Deal {index}") for index in range(3)]
+    db.session.add_all([user, *contacts, *opportunities])
+    db.session.flush()
+
+    c0, c1, c2, c3 = contacts
+    o0, o1, o2 = opportunities
+    links = [
+        ("user", user.id, "contact", c0.id, "manager"),
+        ("contact", c1.id, "contact", c0.id, "manager"),
+        ("contact", c0.id, "contact", c2.id, "manager"),
+        ("contact", c0.id, "user", user.id, "manager"),
+        ("contact", c0.id, "opportunity", o1.id, "linked"),
+        ("opportunity", o0.id, "contact", c0.id, "linked"),
+        ("contact", c2.id, "opportunity", o0.id, "linked"),
+        ("contact", c1.id, "company", 1, "works_at"),
+    ]
+    db.session.add_all(
+        Relationship(entity1_type=t1, entity1_id=i1, entity2_type=t2, entity2_id=i2, relationship_type=kind) for t1, i1, t2, i2, kind in links
+    )
+    db.session.commit()
+    db.session.expunge_all()
+    return db
+
+
+def test_primed_contacts_match_unprimed(graph):
+    expected = _contact_graph(Contact.query.order_by(Contact.id).all())
+    graph.session.expunge_all()
+
+    contacts = ContactGraphLoader.prime(Contact.query.order_by(Contact.id).all())
+    assert _contact_graph(contacts) == expected
+    assert expected[1]["managers"] == [("User", 1), ("Contact", 2)]
+
+
+def test_primed_opportunities_match_unprimed(graph):
+    expected = _opportunity_graph(Opportunity.query.order_by(Opportunity.id).all())
+    graph.session.expunge_all()
+
+    opportunities = ContactGraphLoader.prime_opportunities(Opportunity.query.order_by(Opportunity.id).all())
+    assert _opportunity_graph(opportunities) == expected
+    assert expected[1]["contacts"] == [1, 3]
+
+
+def test_priming_takes_a_fixed_number_of_queries(graph):
+    """One relationships query plus one IN query per related type, however many contacts there are.
+
+    Contacts: relationships, users and opportunities (the contacts are already loaded).
+    Opportunities: relationships and contacts.
+    """
+    contacts = Contact.query.all()
+    opportunities = Opportunity.query.all()
+    with _count_queries(graph) as statements:
+        ContactGraphLoader.prime_list(contacts)
+        ContactGraphLoader.prime_list(opportunities)
+        _contact_graph(contacts)
+        _opportunity_graph(opportunities)
+    assert len(statements) == 3 + 2
+
+
+def test_setters_drop_primed_values(graph):
+    contact = ContactGraphLoader.prime([Contact.query.get(1)])[0]
+    assert [_key(e) for e in contact.managers] == [("User", 1), ("Contact", 2)]
+
+    contact.managers = [{"type": "contact", "id": 4}]
+    contact.direct_reports = []
+    contact.opportunities = [{"id": 3}]
+    graph.session.flush()
+
+    assert [_key(e) for e in contact.managers] == [("Contact", 4)]
+    assert contact.direct_reports == []
+    assert [o.id for o in contact.opportunities] == [3]
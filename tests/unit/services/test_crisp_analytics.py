@@ -0,0 +1,144 @@
+# Tests for app.services.crisp.analytics
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.models import Crisp, Relationship, User
+from app.services.crisp.analytics import CrispAnalyticsService
+
+STARTED = datetime(2025, 1, 1, 9, 0)
+
+
+def _scores(db, count, same_time=False):
+    relationship = Relationship(entity1_type="user", entity1_id=1, entity2_type="contact", entity2_id=1)
+    db.session.add(relationship)
+    db.session.flush()
+    scores = [
+        Crisp(relationship_id=relationship.id, credibility=index % 10 + 1, reliability=5, intimacy=5, self_orientation=index % 3 + 1,
+              created_at=STARTED if same_time else STARTED + timedelta(days=index))
+        for index in range(count)
+    ]
+    db.session.add_all(scores)
+    db.session.commit()
+    return relationship, scores
+
+
+def test_cursor_round_trip():
+    score = SimpleNamespace(id=42, created_at=datetime(2025, 3, 4, 5, 6, 7, 890))
+    assert CrispAnalyticsService.decode_cursor(CrispAnalyticsService.encode_cursor(score)) == (score.created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "garbage", "2025-01-01T00:00:00_x", "not-a-date_3", None])
+def test_malformed_cursor_decodes_to_none(cursor):
+    assert CrispAnalyticsService.decode_cursor(cursor) is None
+
+
+def test_pages_visit_every_score_once_newest_first(memory_db):
+    """Scores sharing a timestamp are split across pages by id without gaps or repeats."""
+    _, scores = _scores(memory_db, 7, same_time=True)
+    service = CrispAnalyticsService()
+    seen, cursor = [], None
+    while True:
+        page, cursor = service.get_scores_page(after=cursor, limit=3)
+        seen.extend(score.id for score in page)
+        if cursor is None:
+            break
+    assert seen == sorted((score.id for score in scores), reverse=True)
+
+
+def test_empty_page_has_no_cursor(memory_db):
+    _scores(memory_db, 2)
+    assert CrispAnalyticsService().get_scores_page(limit=0) == ([], None)
+
+
+def test_history_is_averaged_per_ntile_bucket(memory_db):
+    """Ten assessments charted as four points average buckets of 3, 3, 2 and 2 in date order."""
+    relationship, scores = _scores(memory_db, 10)
+    history = CrispAnalyticsService().get_score_history(relationship.id, 4)
+
+    buckets = [scores[0:3], scores[3:6], scores[6:8], scores[8:10]]
+    assert [point["created_at"] for point in history] == [bucket[0].created_at for bucket in buckets]
+    for point, bucket in zip(history, buckets):
+        assert point["total_score"] == pytest.approx(sum(score.total_score for score in bucket) / len(bucket))
+        assert point["credibility"] == pytest.approx(sum(score.credibility for score in bucket) / len(bucket))
+
+
+def test_short_history_is_returned_unsampled(memory_db):
+    relationship, scores = _scores(memory_db, 3)
+    history = CrispAnalyticsService().get_score_history(relationship.id, 4)
+    assert [point["total_score"] for point in history] == [score.total_score for score in scores]
+
+
+@pytest.mark.parametrize("limit", [-1, 0])
+def test_scores_api_clamps_non_positive_limits(memory_app, memory_db, limit):
+    user = User(username="crisp", name="Crisp", email="crisp@example.com", password_hash="x")
+    memory_db.session.add(user)
+    memory_db.session.commit()
+    _scores(memory_db, 2)
+
+    client = memory_app.test_client()
+    with client.session_transaction() as session:
+        session["_user_id"] = str(user.id)
+    response = client.get(f"/api/crisp/scores?limit={limit}")
+    assert response.status_code == 200
+    assert len(response.get_json()["data"]["items"]) == 1
+
+
+def _python_histogram(totals, bins):
+    """Equal-width buckets computed in Python; the maximum falls in the last bucket."""
+    low, high = min(totals), max(totals)
+    width = (high - low) / bins or 1.0
+    counts = [0] * bins
+    for total in totals:
+        counts[bins - 1 if total >= high else int((total - low) / width)] += 1
+    return counts
+
+
+# (credibility, reliability, intimacy, self_orientation): totals 3, 5, 7, 9, 11, 13, 15 (all on bucket
+# edges for 6 bins), 6.0 and 4.5
+DISTRIBUTION_SCORES = [(1, 1, 1, 0), (1, 2, 2, 0), (3, 2, 2, 0), (3, 3, 3, 0), (5, 3, 3, 0), (5, 4, 4, 0), (5, 5, 5, 0),
+                       (6, 6, 6, 3), (3, 3, 3, 2)]
+
+
+@pytest.mark.parametrize("bins", [1, 3, 6, 7, 12])
+def test_distribution_matches_python_histogram(memory_db, bins):
+    relationship = Relationship(entity1_type="user", entity1_id=1, entity2_type="contact", entity2_id=1)
+    memory_db.session.add(relationship)
+    memory_db.session.flush()
+    scores = [Crisp(relationship_id=relationship.id, credibility=c, reliability=r, intimacy=i, self_orientation=s)
+              for c, r, i, s in DISTRIBUTION_SCORES]
+    memory_db.session.add_all(scores)
+    memory_db.session.commit()
+
+    distribution = CrispAnalyticsService().get_score_distribution(bins)
+    totals = [score.total_score for score in scores]
+    assert (distribution["min"], distribution["max"], distribution["total"]) == (3.0, 15.0, len(scores))
+    assert [bucket["count"] for bucket in distribution["bins"]] == _python_histogram(totals, bins)
+    assert distribution["bins"][-1]["upper"] == pytest.approx(15.0)
+
+
+def test_distribution_of_identical_scores_is_one_bucket(memory_db):
+    _scores(memory_db, 1)
+    distribution = CrispAnalyticsService().get_score_distribution(4)
+    assert [bucket["count"] for bucket in distribution["bins"]] == [1, 0, 0, 0]
+
+
+def test_distribution_of_no_scores_is_empty(memory_db):
+    assert CrispAnalyticsService().get_score_distribution(4) == {"min": None, "max": None, "total": 0, "bins": []}
+
+
+@pytest.mark.parametrize("bins, status", [(0, 400), (101, 400), (5, 200)])
+def test_distribution_api_validates_bins(memory_app, memory_db, bins, status):
+    user = User(username="crisp", name="Crisp", email="crisp@example.com", password_hash="x")
+    memory_db.session.add(user)
+    memory_db.session.commit()
+    _scores(memory_db, 4)
+
+    client = memory_app.test_client()
+    with client.session_transaction() as session:
+        session["_user_id"] = str(user.id)
+    response = client.get(f"/api/crisp/distribution?bins={bins}")
+    assert response.status_code == status
+    if status == 200:
+        assert sum(bucket["count"] for bucket in response.get_json()["data"]["bins"]) == 4
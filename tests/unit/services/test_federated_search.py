@@ -0,0 +1,30 @@
+# Tests for app.services.search.federated
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.search.federated import FederatedSearchService
+
+
+def test_hit_scores_higher_for_better_ranks():
+    """bm25 ranks are negative, best first; hit scores flip them so higher is better."""
+    company = SimpleNamespace(id=7, name="Acme", description="Rockets", search_rank=-2.5, search_snippet="<mark>Acme</mark>")
+    assert FederatedSearchService._hit("companies", company) == {
+        "type": "companies",
+        "id": 7,
+        "title": "Acme",
+        "snippet": "<mark>Acme</mark>",
+        "score": 2.5,
+    }
+
+
+def test_hit_falls_back_to_body_without_title_or_rank():
+    note = SimpleNamespace(id=3, content="Met the platform team")
+    hit = FederatedSearchService._hit("notes", note)
+    assert hit["title"] == "Met the platform team"
+    assert hit["snippet"] is None and hit["score"] == 0.0
+
+
+def test_unknown_types_are_rejected():
+    with pytest.raises(ValueError, match="bogus"):
+        FederatedSearchService().search("kube", ["companies", "bogus"])
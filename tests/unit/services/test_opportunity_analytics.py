@@ -0,0 +1,85 @@
+# Tests for app.services.opportunity.analytics
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import extract, func
+
+from app.models import Opportunity
+from app.services.opportunity.analytics import PIPELINE_STAGES, OpportunityAnalyticsService
+
+
+def _per_stage_queries(db):
+    """The separate COUNT and SUM queries the single conditional-aggregate query replaced."""
+    service = OpportunityAnalyticsService()
+    now = datetime.now()
+    active = Opportunity.query.filter_by(status="active")
+    stats = {
+        "total": Opportunity.query.count(),
+        "active": active.count(),
+        "won": Opportunity.query.filter_by(status="won").count(),
+        "lost": Opportunity.query.filter_by(status="lost").count(),
+        "total_value": db.session.query(func.sum(Opportunity.value)).filter_by(status="active").scalar() or 0,
+        "avg_deal_size": service.calculate_avg_deal_size(),
+        "win_rate": service.calculate_win_rate(),
+        "stale_count": service.calculate_stale_opportunities(),
+        "closing_soon": active.filter(Opportunity.close_date <= now + timedelta(days=30)).count(),
+        "won_this_month": Opportunity.query.filter(
+            Opportunity.status == "won",
+            extract("month", Opportunity.close_date) == now.month,
+            extract("year", Opportunity.close_date) == now.year,
+        ).count(),
+        "hot_opportunities_count": Opportunity.query.filter_by(priority="high").count(),
+    }
+    stages = [
+        {
+            "name": stage.title(),
+            "stage": stage,
+            "count": Opportunity.query.filter_by(stage=stage, status="active").count(),
+            "value": db.session.query(func.sum(Opportunity.value)).filter_by(stage=stage, status="active").scalar() or 0,
+            "percentage": service.calculate_stage_percentage(stage),
+        }
+        for stage in PIPELINE_STAGES
+    ]
+    return stats, stages
+
+
+@pytest.fixture
+def opportunities(memory_db):
+    """Opportunities in every status and stage, including unknown ones and NULLs in each aggregated column."""
+    rng = random.Random(37)
+    now = datetime.now()
+    dates = [None, now - timedelta(days=40), now - timedelta(days=15), now - timedelta(days=2), now + timedelta(days=10),
+             now + timedelta(days=45), now.replace(day=1, hour=12)]
+    opportunities = [
+        Opportunity(
+            name=f"Deal {index}",
+            status=rng.choice(["active", "active", "won", "lost", "on_hold", None]),
+            stage=rng.choice([*PIPELINE_STAGES, "discovery", None]),
+            value=rng.choice([None, 0.0, 1500.0, 2500.5, 10000.0]),
+            priority=rng.choice(["high", "medium", None]),
+            close_date=rng.choice(dates),
+            last_activity_date=rng.choice(dates),
+        )
+        for index in range(80)
+    ]
+    memory_db.session.add_all(opportunities)
+    memory_db.session.commit()
+    return opportunities
+
+
+def test_pipeline_summary_matches_per_stage_queries(memory_db, opportunities):
+    summary = OpportunityAnalyticsService().get_pipeline_summary()
+    stats, stages = _per_stage_queries(memory_db)
+
+    for key, expected in stats.items():
+        assert summary["stats"][key] == pytest.approx(expected), key
+    assert summary["stages"] == [dict(stage, value=pytest.approx(stage["value"])) for stage in stages]
+    assert all(stage["count"] for stage in stages)
+    assert stats["stale_count"] and stats["won_this_month"]
+
+
+def test_pipeline_summary_of_no_opportunities(memory_db):
+    summary = OpportunityAnalyticsService().get_pipeline_summary()
+    assert summary["stats"]["total"] == summary["stats"]["total_value"] == summary["stats"]["avg_deal_size"] == 0
+    assert [(stage["count"], stage["value"], stage["percentage"]) for stage in summary["stages"]] == [(0, 0, 0)] * len(PIPELINE_STAGES)
@@ -0,0 +1,55 @@
+# Tests for app.services.opportunity.forecast
+from datetime import datetime
+
+import numpy as np
+
+from app.models import Opportunity
+from app.services.opportunity.forecast import (
+    STALE_AFTER_DAYS,
+    STALE_HALF_LIFE_DAYS,
+    OpportunityForecastService,
+    simulate_bookings,
+    staleness_factor,
+)
+
+
+def test_simulation_respects_certain_outcomes():
+    """Deals that can't be won never book; near-certain deals almost always do."""
+    values = np.array([100.0, 50.0, 25.0])
+    bookings = simulate_bookings(values, np.array([0.0, 1.0, 0.0]), np.array([0, 0, 1]), 3, 1000, np.random.default_rng(1))
+    assert bookings.shape == (3, 1000)
+    assert np.mean(bookings[0] == 50.0) > 0.99
+    assert not bookings[1:].any()
+
+
+def test_simulation_mean_matches_expected_value():
+    """The simulated mean converges on the probability-weighted pipeline."""
+    rng = np.random.default_rng(7)
+    values = rng.uniform(1_000, 10_000, 500)
+    probabilities = rng.uniform(0.1, 0.9, 500)
+    months = rng.integers(0, 2, 500)
+    bookings = simulate_bookings(values, probabilities, months, 2, 5000, rng)
+    expected = np.bincount(months, weights=values * probabilities, minlength=2)
+    assert np.allclose(bookings.mean(axis=1), expected, rtol=0.01)
+
+
+def test_staleness_factor_halves_per_half_life():
+    """Recent activity keeps full weight; each half-life past the grace period halves it."""
+    idle = np.array([0.0, STALE_AFTER_DAYS, STALE_AFTER_DAYS + STALE_HALF_LIFE_DAYS, np.nan])
+    assert np.allclose(staleness_factor(idle), [1.0, 1.0, 0.5, 1.0])
+
+
+def test_forecast_is_cached_until_an_opportunity_is_written(memory_db):
+    """Repeat forecasts come from the analytics cache; writing an opportunity recomputes it."""
+    service = OpportunityForecastService()
+    memory_db.session.add(Opportunity(name="Deal", status="active", stage="closing", value=1000.0, close_date=datetime.now()))
+    memory_db.session.commit()
+
+    first = service.prepare_forecast_data(months=2, iterations=100, seed=3)
+    first["forecast"][0] = -1
+    assert service.prepare_forecast_data(months=2, iterations=100, seed=3)["pipeline"] == [1000.0, 0.0]
+    assert service.prepare_forecast_data(months=2, iterations=100, seed=3)["forecast"][0] != -1
+
+    memory_db.session.add(Opportunity(name="Deal 2", status="active", stage="closing", value=500.0, close_date=datetime.now()))
+    memory_db.session.commit()
+    assert service.prepare_forecast_data(months=2, iterations=100, seed=3)["pipeline"] == [1500.0, 0.0]
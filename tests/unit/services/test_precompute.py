@@ -0,0 +1,42 @@
+# Tests for app/services/precompute.py
+from app.services.precompute import MAX_DEBOUNCE_DELAY, DashboardScheduler, PrecomputeJob, job_name, register_dashboard_jobs
+
+
+def make_job(**kwargs):
+    return PrecomputeJob("Service.get_stats", lambda: None, frozenset({"tasks"}), interval=300, **kwargs)
+
+
+def test_job_due_on_first_run_and_after_interval():
+    assert make_job().is_due(now=0.0, debounce=2.0)
+    assert not make_job(last_run=100.0).is_due(now=200.0, debounce=2.0)
+    assert make_job(last_run=100.0).is_due(now=400.0, debounce=2.0)
+    assert not make_job(last_run=100.0, running=True).is_due(now=400.0, debounce=2.0)
+
+
+def test_writes_are_debounced_but_not_starved():
+    job = make_job(last_run=100.0, dirty_since=110.0, last_write=111.0)
+    assert not job.is_due(now=112.0, debounce=2.0)
+    assert job.is_due(now=113.5, debounce=2.0)
+
+    busy = make_job(last_run=100.0, dirty_since=110.0, last_write=110.0 + MAX_DEBOUNCE_DELAY)
+    assert busy.is_due(now=110.0 + MAX_DEBOUNCE_DELAY, debounce=2.0)
+
+
+def test_job_name_includes_arguments():
+    class CompanyService:
+        pass
+
+    assert job_name(CompanyService, "get_dashboard_statistics") == "CompanyService.get_dashboard_statistics"
+    assert job_name(CompanyService, "prepare_growth_data", (6,)) == "CompanyService.prepare_growth_data(6)"
+
+
+def test_dashboard_jobs_include_engagement_segmentation():
+    """Segment charts and the segmentation counts behind the statistics pages are precomputed, with their tables."""
+    scheduler = DashboardScheduler()
+    register_dashboard_jobs(scheduler)
+    jobs = scheduler.status()
+    assert {"CompanyService.get_engagement_segments", "ContactAnalyticsService.get_engagement_counts",
+            "UserService.get_activity_counts", "TaskService.get_status_breakdown"} <= set(jobs)
+    assert jobs["UserService.get_activity_counts"]["tables"] == ["notes", "users"]
+    assert "opportunities" in jobs["CompanyService.get_engagement_segments"]["tables"]
+    assert jobs["TaskService.get_status_breakdown"]["tables"] == ["tasks"]
@@ -0,0 +1,31 @@
+# Tests for app.services.relationship.graph
+from app.services.relationship.graph import CSRGraph, edge_cost, trust_score
+
+EDGES = [
+    (1, ("user", 1), ("contact", 1), "knows", 0.5),
+    (2, ("contact", 1), ("contact", 2), "reports_to", 0.25),
+    (3, ("user", 2), ("contact", 2), "knows", 1.0),
+]
+
+
+def test_csr_adjacency_is_undirected():
+    """Every edge is reachable from both of its endpoints."""
+    graph = CSRGraph(EDGES)
+    assert graph.edge_count == 3
+    assert sorted(graph.adjacent(("contact", 2))) == [(("contact", 1), 2, 0.25), (("user", 2), 3, 1.0)]
+    assert list(graph.adjacent(("company", 9))) == []
+
+
+def test_csr_edges_round_trip():
+    """The edge list can be recovered from the arrays for compaction."""
+    def normalise(edges):
+        return sorted((edge_id, frozenset((a, b)), rel_type, cost) for edge_id, a, b, rel_type, cost in edges)
+
+    assert normalise(CSRGraph(EDGES).edges()) == normalise(EDGES)
+
+
+def test_edge_cost_prefers_trusted_relationships():
+    """Higher CRISP scores make cheaper edges; unscored edges sit in between."""
+    strong = edge_cost(trust_score(10, 10, 10, 1))
+    weak = edge_cost(trust_score(1, 1, 1, 10))
+    assert strong < edge_cost(None) < weak
@@ -0,0 +1,80 @@
+# Tests for app.services.relationship.query
+import pytest
+from sqlalchemy import event
+
+from app.models import Company, Contact, Relationship, User
+from app.services.relationship.query import RelationshipQueryService
+
+ENTITY_MODELS = {"user": User, "contact": Contact, "company": Company}
+
+
+def _graph(db, count):
+    """A contact related to ``count`` contacts, users and companies, in both directions."""
+    contact = Contact(first_name="Hub", last_name="Contact", email="hub@example.com")
+    others = {
+        "contact": [Contact(first_name=f"C{index}", last_name="Test", email=f"c{index}@example.com") for index in range(count)],
+        "user": [User(username=f"user{index}", name=f"User {index}", email=f"user{index}@example.com", password_hash="x") for index in range(count)],
+        "company": [Company(name=f"Company {index}") for index in range(count)],
+    }
+    db.session.add_all([contact, *(entity for entities in others.values() for entity in entities)])
+    db.session.flush()
+    relationships = []
+    for entity_type, entities in others.items():
+        for index, entity in enumerate(entities):
+            if index % 2:
+                relationships.append(Relationship(entity1_type="contact", entity1_id=contact.id, entity2_type=entity_type, entity2_id=entity.id,
+                                                  relationship_type="knows"))
+            else:
+                relationships.append(Relationship(entity1_type=entity_type, entity1_id=entity.id, entity2_type="contact", entity2_id=contact.id,
+                                                  relationship_type="manager"))
+    relationships.append(Relationship(entity1_type="contact", entity1_id=contact.id, entity2_type="opportunity", entity2_id=1))
+    relationships.append(Relationship(entity1_type="contact", entity1_id=contact.id, entity2_type="user", entity2_id=999))
+    db.session.add_all(relationships)
+    db.session.commit()
+    contact_id = contact.id
+    db.session.expunge_all()
+    return contact_id
+
+
+def _one_by_one(entity_id, related_type=None):
+    """The per-relationship lookups the batched query replaced."""
+    result = []
+    for rel in Relationship.query.order_by(Relationship.id).all():
+        if rel.entity1_type == "contact" and rel.entity1_id == entity_id:
+            other_type, other_id = rel.entity2_type, rel.entity2_id
+        elif rel.entity2_type == "contact" and rel.entity2_id == entity_id:
+            other_type, other_id = rel.entity1_type, rel.entity1_id
+        else:
+            continue
+        if other_type not in ENTITY_MODELS or (related_type and other_type != related_type):
+            continue
+        entity = ENTITY_MODELS[other_type].query.get(other_id)
+        if entity:
+            result.append({"id": rel.id, "entity_type": other_type, "entity_id": other_id,
+                           "entity_name": getattr(entity, "name", str(entity)), "relationship_type": rel.relationship_type})
+    return result
+
+
+@pytest.mark.parametrize("related_type", [None, "user", "company"])
+def test_batched_lookup_matches_one_by_one(memory_db, related_type):
+    entity_id = _graph(memory_db, 3)
+    result = RelationshipQueryService().get_relationships_for_entity("contact", entity_id, ENTITY_MODELS, related_type=related_type)
+    assert result == _one_by_one(entity_id, related_type)
+    assert len(result) == (9 if related_type is None else 3)
+
+
+@pytest.mark.parametrize("count", [2, 10])
+def test_batched_lookup_query_count_is_constant(memory_db, count):
+    """One relationships query plus one IN query per related type."""
+    entity_id = _graph(memory_db, count)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(memory_db.engine, "before_cursor_execute", record)
+    try:
+        RelationshipQueryService().get_relationships_for_entity("contact", entity_id, ENTITY_MODELS)
+    finally:
+        event.remove(memory_db.engine, "before_cursor_execute", record)
+    assert len(statements) == 1 + 3
@@ -0,0 +1,25 @@
+# Tests for app.services.search.cache
+from app.services.search.cache import cached_search, normalize_term, search_cache
+
+
+def test_terms_differing_in_whitespace_normalize_alike():
+    assert normalize_term("  Acme \t Corp ") == "Acme Corp"
+    assert normalize_term(None) == ""
+
+
+def test_results_racing_a_commit_are_not_cached(memory_app):
+    """A commit invalidating the tables while the search runs keeps its result out of the cache."""
+    calls = []
+
+    def compute(term):
+        calls.append(term)
+        if len(calls) == 1:
+            search_cache.invalidate_tables({"companies"})
+        return [len(calls)]
+
+    with memory_app.app_context():
+        search_cache.clear()
+        assert cached_search("race", "acme", {}, ["companies"], compute) == [1]
+        assert cached_search("race", "acme", {}, ["companies"], compute) == [2]
+        assert cached_search("race", "acme", {}, ["companies"], compute) == [2]
+        search_cache.clear()
@@ -0,0 +1,123 @@
+# Tests for app.services.search.index
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+
+from app.models import Company, Note, User
+from app.services.search.index import (
+    ENTITIES_BY_NAME,
+    ENTITY_SLOTS,
+    SEARCH_INDEX_TABLE,
+    SEARCHABLE_ENTITIES,
+    build_match_query,
+    highlight_snippet,
+)
+
+
+def test_build_match_query_quotes_terms():
+    """Search text becomes quoted prefix terms so FTS operators cannot be injected."""
+    assert build_match_query('kube OR "cloud') == '"kube"* "OR"* "cloud"*'
+    assert build_match_query("%%") == ""
+
+
+def test_entity_codes_fit_rowid_slots():
+    """Every entity needs a distinct code below ENTITY_SLOTS for rowids to be unambiguous."""
+    codes = [entity.code for entity in SEARCHABLE_ENTITIES]
+    assert len(set(codes)) == len(codes)
+    assert all(0 <= code < ENTITY_SLOTS for code in codes)
+
+
+def test_document_joins_title_and_body_fields():
+    """Documents skip empty fields and key the row by entity id and code."""
+    contacts = ENTITIES_BY_NAME["contacts"]
+    contact = SimpleNamespace(id=3, first_name="Ada", last_name="Lovelace", email="ada@example.com", role=None,
+                              primary_skill_area="Cloud", expertise_areas="")
+    assert contacts.document(contact) == {
+        "rowid": 3 * ENTITY_SLOTS + contacts.code,
+        "title": "Ada Lovelace",
+        "body": "ada@example.com Cloud",
+    }
+
+
+@pytest.mark.parametrize("query, expected", [("", 20), ("&limit=-1", 1), ("&limit=0", 1), ("&limit=1000", 25), ("&limit=5&offset=-3", 5)])
+def test_entity_search_limit_is_clamped(memory_app, memory_db, query, expected):
+    """Entity searches default to DEFAULT_LIMIT hits and never go unbounded."""
+    user = User(username="searcher", name="Searcher", email="searcher@example.com", password_hash="x")
+    memory_db.session.add_all([user, *(Company(name=f"Acme {index}") for index in range(25))])
+    memory_db.session.commit()
+
+    client = memory_app.test_client()
+    with client.session_transaction() as session:
+        session["_user_id"] = str(user.id)
+    response = client.get(f"/api/search/companies?q=acme{query}")
+    assert response.status_code == 200
+    assert len(response.get_json()["data"]) == expected
+
+
+def _login(app, db):
+    user = User(username="searcher", name="Searcher", email="searcher@example.com", password_hash="x")
+    db.session.add(user)
+    db.session.commit()
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["_user_id"] = str(user.id)
+    return client
+
+
+def test_startup_fills_an_index_added_to_an_existing_database(tmp_path):
+    """A database that predates the index gets it populated by create_app(), without a manual rebuild."""
+    from app.app import create_app
+    from app.models.base import db
+    from config import Config
+
+    class FileConfig(Config):
+        TESTING = True
+        SECRET_KEY = "test_secret_key"
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'crm.db'}"
+        WTF_CSRF_ENABLED = False
+        SERVER_NAME = None
+
+    old_app = create_app(FileConfig)
+    with old_app.app_context():
+        db.session.add(Company(name="Initech"))
+        db.session.execute(text(f"DROP TABLE {SEARCH_INDEX_TABLE}"))
+        db.session.commit()
+        db.engine.dispose()
+
+    app = create_app(FileConfig)
+    with app.app_context():
+        client = _login(app, db)
+        assert [hit["title"] for hit in client.get("/api/search/all?q=initech").get_json()["data"]] == ["Initech"]
+        assert [company["name"] for company in client.get("/api/search/companies?q=initech").get_json()["data"]] == ["Initech"]
+        federated = client.get("/api/search/?q=initech").get_json()["data"]
+        assert [hit["title"] for hit in federated["results"]] == ["Initech"]
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_entity_searches_fall_back_to_ilike_on_an_empty_index(memory_app, memory_db):
+    """Rows the index never saw are still found, unranked, while the index is empty."""
+    client = _login(memory_app, memory_db)
+    memory_db.session.add(Company(name="Initech"))
+    memory_db.session.commit()
+    memory_db.session.execute(text(f"DELETE FROM {SEARCH_INDEX_TABLE}"))
+    memory_db.session.commit()
+
+    assert [company["name"] for company in client.get("/api/search/companies?q=initech").get_json()["data"]] == ["Initech"]
+    federated = client.get("/api/search/?q=initech").get_json()["data"]
+    assert [(hit["title"], hit["score"]) for hit in federated["results"]] == [("Initech", 0.0)]
+    assert federated["sources"]["companies"]["status"] == "ok"
+
+
+def test_snippets_escape_indexed_markup(memory_app, memory_db):
+    """Only the highlight markers become HTML; markup in the indexed text is escaped."""
+    client = _login(memory_app, memory_db)
+    memory_db.session.add(Note(content='<img src=x onerror="alert(1)"> acme & co <b>notes</b>', notable_type="company", notable_id=1,
+                               user_id=User.query.one().id))
+    memory_db.session.commit()
+
+    expected = '&lt;img src=x onerror=&quot;alert(1)&quot;&gt; <mark>acme</mark> &amp; co &lt;b&gt;notes&lt;/b&gt;'
+    assert [hit["snippet"] for hit in client.get("/api/search/all?q=acme").get_json()["data"]] == [expected]
+    assert [note["search_snippet"] for note in client.get("/api/search/notes?q=acme").get_json()["data"]] == [expected]
+    assert highlight_snippet(None) is None
@@ -0,0 +1,88 @@
+# Tests for app.services.srs.filters
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from app.models.pages.srs import SRS
+from app.services.srs.filters import SRSFilterService
+
+# (notable_type, days overdue (negative: not due yet), interval, ease_factor, review_count, successful_reps)
+CARDS = [
+    ("company", 60, 16.0, 1.3, 5, 1),
+    ("company", 50, 2.0, 2.5, 4, 4),
+    ("company", 40, 18.0, 1.6, 6, 2),
+    ("company", 30, 20.0, 2.0, 3, 3),
+    ("company", 20, 1.0, 1.5, 0, 0),
+    ("company", 10, 15.0, 1.4, 8, 5),
+    ("contact", 55, 21.0, 1.7, 4, 1),
+    ("contact", 5, 3.0, 2.8, 0, 0),
+    ("opportunity", 45, 17.0, 1.2, 3, 2),
+    ("opportunity", 35, 0.0, 2.5, 0, 0),
+    ("opportunity", 25, 19.0, 2.2, 7, 3),
+    ("opportunity", 15, 4.0, 1.55, 9, 8),
+    ("company", -5, 16.5, 1.1, 5, 0),
+    ("contact", -10, 0.0, 2.5, 0, 0),
+]
+
+
+@pytest.fixture
+def cards(memory_db):
+    now = datetime.now(ZoneInfo("UTC"))
+    cards = [
+        SRS(question=f"Q{index}", answer=f"A{index}", notable_type=notable_type, notable_id=index,
+            next_review_at=now - timedelta(days=overdue), interval=interval, ease_factor=ease, review_count=reviews,
+            successful_reps=successes)
+        for index, (notable_type, overdue, interval, ease, reviews, successes) in enumerate(CARDS)
+    ]
+    memory_db.session.add_all(cards)
+    memory_db.session.commit()
+    for card, (_, overdue, *_rest) in zip(cards, CARDS):
+        card.overdue = overdue
+    return cards
+
+
+def _due(cards):
+    return [card for card in cards if card.overdue > 0]
+
+
+def _success_rate(card):
+    return card.successful_reps * 100 // card.review_count
+
+
+# The ordering each strategy had when it was filtered and sorted in Python
+REFERENCE_ORDER = {
+    "priority_first": lambda cards: sorted(_due(cards), key=lambda card: -card.overdue),
+    "hard_cards_first": lambda cards: sorted((card for card in _due(cards) if card.ease_factor <= 1.7), key=lambda card: card.ease_factor),
+    "mastery_boost": lambda cards: sorted((card for card in _due(cards) if 15 <= card.interval <= 21), key=lambda card: -card.interval),
+    "struggling_focus": lambda cards: sorted(
+        (card for card in _due(cards) if card.review_count > 2 and _success_rate(card) < 70), key=_success_rate
+    ),
+    # Unordered, as before: the old unlimited queries, sliced afterwards
+    "new_mix": lambda cards: SRS.query.filter(SRS.review_count == 0).all()[:5]
+    + SRSFilterService()._due_query().filter(SRS.review_count > 0).all()[:10],
+}
+
+
+def test_due_mix_interleaves_categories_by_overdue_rank(cards):
+    """A third of each category's due cards (at least one), most overdue first, round-robin across categories."""
+    by_name = {card.question: card for card in cards}
+    result = SRSFilterService().get_review_strategy("due_mix")
+    # company: 6 due -> 2, contact: 2 due -> 1, opportunity: 4 due -> 1
+    assert [card.question for card in result] == ["Q0", "Q6", "Q8", "Q1"]
+    assert [by_name[card.question].notable_type for card in result] == ["company", "contact", "opportunity", "company"]
+    assert [card.question for card in SRSFilterService().get_review_strategy("due_mix", limit=3)] == ["Q0", "Q6", "Q8"]
+
+
+@pytest.mark.parametrize("strategy", sorted(REFERENCE_ORDER))
+@pytest.mark.parametrize("limit", [None, 1, 3, 100])
+def test_strategies_keep_the_python_order_within_the_limit(cards, strategy, limit):
+    expected = [card.id for card in REFERENCE_ORDER[strategy](cards)][:limit]
+    result = SRSFilterService().get_review_strategy(strategy, limit=limit)
+    assert [card.id for card in result] == expected
+    assert limit is None or len(result) <= limit
+
+
+def test_unknown_strategy_is_rejected(cards):
+    with pytest.raises(ValueError):
+        SRSFilterService().get_review_strategy("alphabetical")
@@ -0,0 +1,32 @@
+# Tests for app.services.srs.search
+import pytest
+from app.services.srs.search import SRSSearchService
+
+
+@pytest.mark.parametrize(
+    "term, expected",
+    [
+        ("kube", '"kube"*'),
+        ("cloud security", '"cloud"* "security"*'),
+        ('foo" OR bar*', '"foo"* "OR"* "bar"*'),
+        ("%%", ""),
+        ("", ""),
+    ],
+)
+def test_build_match_query(term, expected):
+    """Search text becomes quoted prefix terms so FTS operators cannot be injected."""
+    assert SRSSearchService.build_match_query(term) == expected
+
+
+def test_snippets_escape_card_markup(memory_db):
+    """Card text is HTML-escaped around the <mark> highlights."""
+    from app.models.pages.srs import SRS
+
+    memory_db.session.add(SRS(question="What does <script>alert('k8s')</script> do?", answer="Runs kubernetes & more",
+                              notable_type="company", notable_id=1))
+    memory_db.session.commit()
+
+    (card,) = SRSSearchService().search("kubernetes")
+    assert card.search_snippet == "Runs <mark>kubernetes</mark> &amp; more"
+    (card,) = SRSSearchService().search("script")
+    assert card.search_snippet == "What does &lt;<mark>script</mark>&gt;alert(&#x27;k8s&#x27;)&lt;/<mark>script</mark>&gt; do?"
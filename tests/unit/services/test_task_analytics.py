@@ -0,0 +1,78 @@
+# Tests for app.services.task.analytics
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.models import Task, User
+from app.models.pages.task import TaskStatus
+from app.services.task.analytics import TaskAnalyticsService
+
+START = date(2025, 3, 1)
+END = date(2025, 3, 26)
+
+
+def _brute_force_series(tasks, start, end):
+    """Count each day directly from the tasks, one day at a time."""
+    series = {"new_tasks": [], "completed_tasks": [], "overdue_tasks": []}
+    day = start
+    while day <= end:
+        series["new_tasks"].append(sum(task.created_at.date() == day for task in tasks))
+        series["completed_tasks"].append(sum(task.completed_at is not None and task.completed_at.date() == day for task in tasks))
+        series["overdue_tasks"].append(
+            sum(
+                task.due_date is not None
+                and task.status != TaskStatus.CANCELLED.value
+                and task.due_date.date() < day
+                and (task.completed_at is None or task.completed_at.date() > day)
+                for task in tasks
+            )
+        )
+        day += timedelta(days=1)
+    return series
+
+
+@pytest.fixture
+def tasks(memory_db):
+    """Random tasks created, due and completed before, inside and after the window."""
+    rng = random.Random(44)
+    origin = datetime.combine(START, datetime.min.time()) - timedelta(days=15)
+    tasks = []
+    for index in range(300):
+        created_at = origin + timedelta(days=rng.randint(0, 50), hours=rng.randint(0, 23))
+        status = rng.choice(list(TaskStatus)).value
+        due_date = created_at + timedelta(days=rng.randint(-2, 20), hours=rng.randint(0, 23)) if rng.random() < 0.8 else None
+        completed_at = created_at + timedelta(days=rng.randint(0, 25), hours=rng.randint(0, 23)) if status == TaskStatus.COMPLETED else None
+        tasks.append(
+            Task(title=f"Task {index}", status=status, created_at=created_at, due_date=due_date, completed_at=completed_at,
+                 notable_type="user", notable_id=1)
+        )
+    memory_db.session.add_all(tasks)
+    memory_db.session.commit()
+    return tasks
+
+
+def test_daily_series_matches_brute_force_counts(tasks):
+    series = TaskAnalyticsService().get_daily_series(START, END)
+    assert len(series["keys"]) == (END - START).days + 1 == 26
+    expected = _brute_force_series(tasks, START, END)
+    assert all(sum(counts) > 0 for counts in expected.values())
+    for name, counts in expected.items():
+        assert series[name] == counts, name
+
+
+@pytest.mark.parametrize(
+    "query, status, days", [("days=100000000", 200, 366), ("days=-5", 200, 1), ("end=0001-01-02&days=30", 400, None)]
+)
+def test_series_api_clamps_the_window(memory_app, memory_db, query, status, days):
+    user = User(username="planner", name="Planner", email="planner@example.com", password_hash="x")
+    memory_db.session.add(user)
+    memory_db.session.commit()
+
+    client = memory_app.test_client()
+    with client.session_transaction() as session:
+        session["_user_id"] = str(user.id)
+    response = client.get(f"/api/tasks/dashboard/series?{query}")
+    assert response.status_code == status
+    if days is not None:
+        assert len(response.get_json()["keys"]) == days
@@ -0,0 +1,22 @@
+# Tests for app.services.search.trigram
+import pytest
+
+from app.services.search.trigram import TrigramSearchService, trigrams
+
+
+def test_trigrams_pad_each_word():
+    """Words are lowercased and padded so word starts and short words produce trigrams."""
+    assert trigrams("Cat!") == {"  c", " ca", "cat", "at "}
+    assert trigrams("a b") == {"  a", " a ", "  b", " b "}
+    assert trigrams("  ...  ") == frozenset()
+
+
+def test_misspelling_shares_most_trigrams():
+    correct, typo = trigrams("Lovelace"), trigrams("Lovlace")
+    assert len(correct & typo) / len(typo) >= 0.6
+
+
+@pytest.mark.parametrize("kwargs", [{"types": ["invoices"]}, {"threshold": 1.5}, {"threshold": -0.1}])
+def test_invalid_arguments_are_rejected(kwargs):
+    with pytest.raises(ValueError):
+        TrigramSearchService().search("acme", **kwargs)
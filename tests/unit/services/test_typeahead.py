@@ -0,0 +1,42 @@
+# Tests for app.services.search.typeahead
+from app.services.search.typeahead import SOURCES_BY_NAME, PrefixIndex, normalize
+
+
+def contact(first_name, last_name, email):
+    return {"first_name": first_name, "last_name": last_name, "email": email}
+
+
+def make_index():
+    index = PrefixIndex(SOURCES_BY_NAME["contacts"])
+    index.load([(1, contact("Ada", "Lovelace", "ada@example.com")), (2, contact("Grace", "Hopper", "grace@navy.mil"))])
+    return index
+
+
+def test_normalize_casefolds_and_collapses_whitespace():
+    assert normalize("  Ada   LOVELACE ") == "ada lovelace"
+    assert normalize(None) == ""
+
+
+def test_lookup_matches_name_email_and_later_words():
+    index = make_index()
+    assert [entry["id"] for _, _, entry in index.lookup("ada", 10)] == [1]
+    assert [entry["id"] for _, _, entry in index.lookup("grace@", 10)] == [2]
+    assert [entry["label"] for _, _, entry in index.lookup("hop", 10)] == ["Grace Hopper"]
+    assert index.lookup("x", 10) == []
+
+
+def test_primary_matches_rank_above_later_words():
+    index = make_index()
+    index.upsert(3, contact("Hopkins", "Ada", "h@example.com"))
+    assert [(tier, entry["id"]) for tier, _, entry in index.lookup("ho", 10)] == [(0, 3), (1, 2)]
+    assert len(index.lookup("ho", 1)) == 1
+
+
+def test_upsert_replaces_and_remove_drops_keys():
+    index = make_index()
+    index.upsert(1, contact("Augusta", "King", "ada@example.com"))
+    assert index.lookup("lovelace", 10) == []
+    assert [entry["label"] for _, _, entry in index.lookup("king", 10)] == ["Augusta King"]
+
+    index.remove(1)
+    assert index.lookup("aug", 10) == [] and len(index) == 1
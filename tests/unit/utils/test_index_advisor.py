@@ -0,0 +1,39 @@
+# Tests for app.utils.index_advisor
+import pytest
+from app.utils.index_advisor import analyse_queries, find_table_scans, hot_queries
+
+TABLES = ["tasks", "srs", "notes"]
+
+
+@pytest.mark.parametrize(
+    "details, expected",
+    [
+        (["SCAN tasks"], ["tasks"]),
+        (["SCAN tasks AS t", "USE TEMP B-TREE FOR ORDER BY"], ["tasks"]),
+        (["SEARCH tasks USING INDEX ix_tasks_status_due_date (status=?)"], []),
+        (["SCAN srs USING INDEX ix_srs_next_review_at"], []),
+        (["SCAN notes USING COVERING INDEX ix_notes_notable_type_notable_id_created_at"], []),
+        (["SCAN srs_fts VIRTUAL TABLE INDEX 0:M2"], []),
+        (["SCAN CONSTANT ROW", "SCAN unknown_table"], []),
+    ],
+)
+def test_find_table_scans(details, expected):
+    """Only unindexed scans of known tables are reported."""
+    assert find_table_scans(details, TABLES) == expected
+
+
+def test_hot_queries_are_all_explained(memory_db):
+    """IN lists are expanded so every hot query reaches the planner, and none of them scans tasks."""
+    queries = hot_queries()
+    assert not any("POSTCOMPILE" in statement for statement, _ in queries)
+    with memory_db.engine.connect() as connection:
+        findings, failures = analyse_queries(connection, queries)
+    assert failures == []
+    assert "tasks" not in findings
+
+
+def test_unexplainable_queries_are_reported(memory_db):
+    with memory_db.engine.connect() as connection:
+        findings, failures = analyse_queries(connection, [("SELECT * FROM tasks WHERE status IN (__[POSTCOMPILE_status])", ())])
+    assert findings == {}
+    assert [statement for statement, _ in failures] == ["SELECT * FROM tasks WHERE status IN (__[POSTCOMPILE_status])"]